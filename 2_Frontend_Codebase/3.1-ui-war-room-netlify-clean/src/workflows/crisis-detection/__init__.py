@@ -7,10 +7,16 @@ from .agents.crisis_detection import CrisisDetectionAgent
 from .agents.monitoring import MentionlyticsAgent
 from .agents.alert_routing import AlertRoutingAgent
 from .workflow import CrisisDetectionWorkflow
+from .service import CrisisDetectionService
+from .scheduler import MultiCampaignScheduler
+from .pipeline import StagedPipeline
 
 __all__ = [
     "CrisisDetectionAgent",
     "MentionlyticsAgent", 
     "AlertRoutingAgent",
-    "CrisisDetectionWorkflow"
+    "CrisisDetectionWorkflow",
+    "CrisisDetectionService",
+    "MultiCampaignScheduler",
+    "StagedPipeline"
 ]
\ No newline at end of file
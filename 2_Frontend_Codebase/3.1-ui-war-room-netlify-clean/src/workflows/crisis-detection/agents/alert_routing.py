@@ -9,7 +9,6 @@ from enum import Enum
 import logging
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
 from .crisis_detection import CrisisAnalysis
@@ -58,16 +57,15 @@ class AlertRoute(BaseModel):
 class AlertRoutingAgent:
     """Intelligent alert routing based on context and recipient profiles"""
     
-    def __init__(self, openai_api_key: str):
-        self.llm = ChatOpenAI(
-            model="gpt-4",
-            temperature=0.3,
-            openai_api_key=openai_api_key
-        )
+    def __init__(self, openai_api_key: str, llm_gateway: Optional["LLMGateway"] = None):
+        # Imported here because utils.state imports this module
+        from ..utils.llm_gateway import LLMGateway
+        self.llm_gateway = llm_gateway or LLMGateway(openai_api_key)
+        
         self.recipient_profiles: Dict[str, RecipientProfile] = {}
         self.routing_history: List[Dict] = []
         self._load_recipient_profiles()
-        
+    
     def _load_recipient_profiles(self):
         """Load recipient profiles from database"""
         # In production, load from database
@@ -140,48 +138,65 @@ class AlertRoutingAgent:
             current_time=current_time
         )
         
-        # Create routing plan for each recipient
-        routing_plan = []
-        for recipient in recipients:
-            # Select channels based on priority and preferences
-            channels = await self._select_channels(
-                recipient=recipient,
-                priority=priority,
-                current_time=current_time
-            )
-            
-            # Personalize message for recipient
-            message = await self._personalize_message(
+        # Create routing plan for each recipient; messages are personalized
+        # concurrently, within the gateway's concurrency cap
+        routing_plan = list(await asyncio.gather(*(
+            self._route_recipient(
                 recipient=recipient,
                 crisis_analysis=crisis_analysis,
                 mention_summary=mention_summary,
-                priority=priority
-            )
-            
-            # Create escalation plan if needed
-            escalation_plan = None
-            if priority in [AlertPriority.CRITICAL, AlertPriority.HIGH]:
-                escalation_plan = self._create_escalation_plan(
-                    recipient=recipient,
-                    priority=priority
-                )
-            
-            route = AlertRoute(
-                recipient=recipient,
-                channels=channels,
-                message=message,
                 priority=priority,
-                expected_response_time=self._get_expected_response_time(priority),
-                escalation_plan=escalation_plan
+                current_time=current_time
             )
-            
-            routing_plan.append(route)
+            for recipient in recipients
+        )))
         
         # Store routing decision for learning
         self._store_routing_decision(routing_plan, crisis_analysis)
         
         return routing_plan
     
+    async def _route_recipient(
+        self,
+        recipient: RecipientProfile,
+        crisis_analysis: CrisisAnalysis,
+        mention_summary: str,
+        priority: AlertPriority,
+        current_time: datetime
+    ) -> AlertRoute:
+        """Build the route for one recipient"""
+        # Select channels based on priority and preferences
+        channels = await self._select_channels(
+            recipient=recipient,
+            priority=priority,
+            current_time=current_time
+        )
+        
+        # Personalize message for recipient
+        message = await self._personalize_message(
+            recipient=recipient,
+            crisis_analysis=crisis_analysis,
+            mention_summary=mention_summary,
+            priority=priority
+        )
+        
+        # Create escalation plan if needed
+        escalation_plan = None
+        if priority in [AlertPriority.CRITICAL, AlertPriority.HIGH]:
+            escalation_plan = self._create_escalation_plan(
+                recipient=recipient,
+                priority=priority
+            )
+        
+        return AlertRoute(
+            recipient=recipient,
+            channels=channels,
+            message=message,
+            priority=priority,
+            expected_response_time=self._get_expected_response_time(priority),
+            escalation_plan=escalation_plan
+        )
+    
     def _determine_priority(self, crisis_analysis: CrisisAnalysis) -> AlertPriority:
         """Determine alert priority from crisis analysis"""
         if crisis_analysis.severity >= 8:
@@ -239,16 +254,19 @@ class AlertRoutingAgent:
             })
         
         # Get LLM recommendation
-        chain = prompt | self.llm
-        
-        result = await chain.ainvoke({
-            "team_members": team_info,
-            "threat_type": crisis_analysis.threat_type,
-            "severity": crisis_analysis.severity,
-            "priority": priority.value,
-            "affected_topics": crisis_analysis.affected_topics,
-            "current_time": current_time.strftime("%H:%M %Z")
-        })
+        result = await self.llm_gateway.invoke(
+            prompt,
+            {
+                "team_members": team_info,
+                "threat_type": crisis_analysis.threat_type,
+                "severity": crisis_analysis.severity,
+                "priority": priority.value,
+                "affected_topics": crisis_analysis.affected_topics,
+                "current_time": current_time.strftime("%H:%M %Z")
+            },
+            caller="alert_routing.select_recipients",
+            temperature=0.3
+        )
         
         # Parse recipient IDs from response
         selected_ids = self._parse_recipient_ids(result.content)
@@ -293,7 +311,7 @@ class AlertRoutingAgent:
             if recipient.slack_id and recipient.channel_preferences["slack"]["enabled"]:
                 channels.append("slack")
             channels.append("email")  # Always include email
-            
+        
         elif priority == AlertPriority.HIGH:
             # Use fast channels for high priority
             if recipient.phone and recipient.channel_preferences["sms"]["enabled"]:
@@ -301,13 +319,13 @@ class AlertRoutingAgent:
             if recipient.slack_id and recipient.channel_preferences["slack"]["enabled"]:
                 channels.append("slack")
             channels.append("email")
-            
+        
         elif priority == AlertPriority.MEDIUM:
             # Use preferred channels for medium priority
             if is_working_hours and recipient.slack_id:
                 channels.append("slack")
             channels.append("email")
-            
+        
         else:  # LOW priority
             # Email only for low priority
             channels.append("email")
@@ -357,18 +375,21 @@ class AlertRoutingAgent:
             Recommended Actions: {recommended_actions}""")
         ])
         
-        chain = prompt | self.llm
-        
-        result = await chain.ainvoke({
-            "role": recipient.role,
-            "expertise": ", ".join(recipient.expertise_areas),
-            "priority": priority.value.upper(),
-            "threat_type": crisis_analysis.threat_type,
-            "severity": crisis_analysis.severity,
-            "affected_topics": ", ".join(crisis_analysis.affected_topics),
-            "mention_summary": mention_summary[:200],
-            "recommended_actions": "\n".join(crisis_analysis.recommended_actions[:3])
-        })
+        result = await self.llm_gateway.invoke(
+            prompt,
+            {
+                "role": recipient.role,
+                "expertise": ", ".join(recipient.expertise_areas),
+                "priority": priority.value.upper(),
+                "threat_type": crisis_analysis.threat_type,
+                "severity": crisis_analysis.severity,
+                "affected_topics": ", ".join(crisis_analysis.affected_topics),
+                "mention_summary": mention_summary[:200],
+                "recommended_actions": "\n".join(crisis_analysis.recommended_actions[:3])
+            },
+            caller="alert_routing.personalize",
+            temperature=0.3
+        )
         
         return result.content
     
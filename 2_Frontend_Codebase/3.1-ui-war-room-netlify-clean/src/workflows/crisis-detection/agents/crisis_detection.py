@@ -3,16 +3,17 @@ Crisis Detection Agent - Core intelligence for identifying and analyzing potenti
 """
 
 import asyncio
-from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import logging
 
+import numpy as np
+
 from langchain.agents import AgentExecutor
-from langchain.memory import ConversationSummaryBufferMemory
 from langchain.tools import Tool
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from langchain.callbacks import AsyncCallbackHandler
+from langchain_core.callbacks import AsyncCallbackHandler
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,151 @@ class CrisisMention(BaseModel):
     engagement_count: int = 0
     published_at: datetime
     keywords: List[str] = []
+    is_update: bool = False  # Re-delivered with changed content or metrics
+
+
+class MentionBatch:
+    """
+    Columnar batch of mentions for the internal hot path
+    
+    Numeric fields live in NumPy columns and text fields in plain lists, so
+    scoring a batch needs no per-mention attribute lookups or dict copies.
+    Ingestion still parses mentions into CrisisMention models; triage builds
+    one batch over them with from_mentions, which keeps the models for
+    materializing rows. from_records serves tool inputs that arrive as dicts.
+    """
+    
+    __slots__ = (
+        "mention_ids", "contents", "sources", "authors", "urls", "keywords",
+        "sentiment", "reach", "engagement", "published_ts", "is_update",
+        "_mentions"
+    )
+    
+    def __init__(
+        self,
+        mention_ids: List[str],
+        contents: List[str],
+        sources: List[str],
+        authors: List[Optional[str]],
+        urls: List[Optional[str]],
+        keywords: List[List[str]],
+        sentiment: np.ndarray,
+        reach: np.ndarray,
+        engagement: np.ndarray,
+        published_ts: np.ndarray,
+        is_update: np.ndarray,
+        mentions: Optional[List[CrisisMention]] = None
+    ):
+        self.mention_ids = mention_ids
+        self.contents = contents
+        self.sources = sources
+        self.authors = authors
+        self.urls = urls
+        self.keywords = keywords
+        self.sentiment = sentiment
+        self.reach = reach
+        self.engagement = engagement
+        self.published_ts = published_ts
+        self.is_update = is_update
+        
+        # Models the batch was built from, returned as-is at the edges
+        self._mentions = mentions
+    
+    @classmethod
+    def from_mentions(cls, mentions: List[CrisisMention]) -> "MentionBatch":
+        """Build a batch over existing models without copying them"""
+        n = len(mentions)
+        return cls(
+            mention_ids=[m.mention_id for m in mentions],
+            contents=[m.content for m in mentions],
+            sources=[m.source for m in mentions],
+            authors=[m.author for m in mentions],
+            urls=[m.url for m in mentions],
+            keywords=[m.keywords for m in mentions],
+            sentiment=np.fromiter((m.sentiment_score for m in mentions), np.float64, n),
+            reach=np.fromiter((m.reach_count for m in mentions), np.int64, n),
+            engagement=np.fromiter((m.engagement_count for m in mentions), np.int64, n),
+            published_ts=np.fromiter((m.published_at.timestamp() for m in mentions), np.float64, n),
+            is_update=np.fromiter((m.is_update for m in mentions), np.bool_, n),
+            mentions=list(mentions)
+        )
+    
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "MentionBatch":
+        """Build a batch from dicts shaped like CrisisMention, skipping validation"""
+        n = len(records)
+        now = datetime.now()
+        
+        def timestamp(value) -> float:
+            if isinstance(value, datetime):
+                return value.timestamp()
+            return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+        
+        return cls(
+            mention_ids=[r.get('mention_id', '') for r in records],
+            contents=[r.get('content', '') for r in records],
+            sources=[r.get('source', 'unknown') for r in records],
+            authors=[r.get('author') for r in records],
+            urls=[r.get('url') for r in records],
+            keywords=[r.get('keywords', []) for r in records],
+            sentiment=np.clip(
+                np.fromiter((r.get('sentiment_score', 0) for r in records), np.float64, n),
+                -1.0, 1.0
+            ),
+            reach=np.fromiter((r.get('reach_count', 0) for r in records), np.int64, n),
+            engagement=np.fromiter((r.get('engagement_count', 0) for r in records), np.int64, n),
+            published_ts=np.fromiter(
+                (timestamp(r.get('published_at') or now) for r in records),
+                np.float64, n
+            ),
+            is_update=np.fromiter((r.get('is_update', False) for r in records), np.bool_, n)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.mention_ids)
+    
+    def take(self, indices: np.ndarray) -> "MentionBatch":
+        """Select a sub-batch by row indices"""
+        indices = np.asarray(indices, dtype=np.int64)
+        return MentionBatch(
+            mention_ids=[self.mention_ids[i] for i in indices],
+            contents=[self.contents[i] for i in indices],
+            sources=[self.sources[i] for i in indices],
+            authors=[self.authors[i] for i in indices],
+            urls=[self.urls[i] for i in indices],
+            keywords=[self.keywords[i] for i in indices],
+            sentiment=self.sentiment[indices],
+            reach=self.reach[indices],
+            engagement=self.engagement[indices],
+            published_ts=self.published_ts[indices],
+            is_update=self.is_update[indices],
+            mentions=[self._mentions[i] for i in indices] if self._mentions is not None else None
+        )
+    
+    def mention(self, index: int) -> CrisisMention:
+        """Materialize one row as a CrisisMention"""
+        if self._mentions is not None:
+            return self._mentions[index]
+        
+        return CrisisMention.model_construct(
+            mention_id=self.mention_ids[index],
+            content=self.contents[index],
+            source=self.sources[index],
+            author=self.authors[index],
+            url=self.urls[index],
+            sentiment_score=float(self.sentiment[index]),
+            reach_count=int(self.reach[index]),
+            engagement_count=int(self.engagement[index]),
+            published_at=datetime.fromtimestamp(self.published_ts[index]),
+            keywords=self.keywords[index],
+            is_update=bool(self.is_update[index])
+        )
+    
+    def to_mentions(self) -> List[CrisisMention]:
+        """Materialize the batch as CrisisMention models"""
+        if self._mentions is not None:
+            return list(self._mentions)
+        return [self.mention(i) for i in range(len(self))]
 
 
 class CrisisAnalysis(BaseModel):
@@ -46,22 +192,56 @@ class CrisisAnalysis(BaseModel):
 class CrisisDetectionAgent:
     """Intelligent crisis detection with context awareness and learning"""
     
-    def __init__(self, openai_api_key: str, memory_max_tokens: int = 2000):
-        self.llm = ChatOpenAI(
-            model="gpt-4",
-            temperature=0.2,
-            openai_api_key=openai_api_key
-        )
-        
-        self.memory = ConversationSummaryBufferMemory(
-            llm=self.llm,
-            max_token_limit=memory_max_tokens,
-            return_messages=True,
-            memory_key="crisis_history"
-        )
+    def __init__(
+        self,
+        openai_api_key: str,
+        history_store: Optional["RetrievalStore"] = None,
+        velocity_window_seconds: int = 3600,
+        analysis_cache: Optional["AnalysisCache"] = None,
+        prompt_token_budget: int = 3000,
+        max_narratives_per_run: int = 5,
+        min_narrative_size: int = 2,
+        pattern_store: Optional["CrisisPatternStore"] = None,
+        max_prompt_patterns: int = 5,
+        llm_gateway: Optional["LLMGateway"] = None
+    ):
+        # Model calls go through the gateway shared with the other agents;
+        # imported here as utils imports this module
+        from ..utils.llm_gateway import LLMGateway
+        self.llm_gateway = llm_gateway or LLMGateway(openai_api_key)
+        
+        # Past analyses, searched locally for historical context without
+        # an LLM call; imported here as utils imports this module
+        from ..utils.retrieval_store import RetrievalStore
+        self.history = history_store or RetrievalStore()
+        
+        # Streaming velocity and sentiment aggregates per campaign, kept
+        # across scans
+        self.velocity_window_seconds = velocity_window_seconds
+        self.windows: Dict[str, "MentionWindowAggregator"] = {}
+        
+        # Analyses of recently seen mention sets, reused instead of a new
+        # LLM call
+        self.analysis_cache = analysis_cache
+        
+        # Mentions are packed into the prompt by priority within a fixed
+        # token budget; imported here as utils imports this module
+        from ..utils.prompt_packer import PromptPacker
+        self.prompt_packer = PromptPacker(token_budget=prompt_token_budget)
+        
+        # Narratives per campaign, kept across scans; each active narrative
+        # is analyzed separately, concurrently up to the gateway's cap
+        self.narratives: Dict[str, "NarrativeClusterer"] = {}
+        self.max_narratives_per_run = max_narratives_per_run
+        self.min_narrative_size = min_narrative_size
+        
+        # Learned patterns persist and stay bounded; only the ones matching
+        # the analyzed mentions go into a prompt
+        from ..utils.pattern_store import CrisisPatternStore
+        self.pattern_store = pattern_store or CrisisPatternStore()
+        self.max_prompt_patterns = max_prompt_patterns
         
         self.tools = self._create_tools()
-        self.crisis_patterns = []
         self._load_crisis_patterns()
         
     def _create_tools(self) -> List[Tool]:
@@ -101,8 +281,15 @@ class CrisisDetectionAgent:
     ) -> CrisisAnalysis:
         """Analyze mentions for potential crisis indicators"""
         
+        # Back-to-back scans often send (nearly) the same mentions
+        if self.analysis_cache is not None:
+            cached = self.analysis_cache.get(mentions, campaign_context)
+            if cached is not None:
+                logger.info(f"Reusing cached crisis analysis for {len(mentions)} mentions")
+                return CrisisAnalysis(**cached)
+        
         # Get historical context
-        historical_context = await self._get_historical_context(mentions)
+        historical_context = await self._get_historical_context(mentions, campaign_context)
         
         # Build analysis prompt
         prompt = ChatPromptTemplate.from_messages([
@@ -134,80 +321,281 @@ class CrisisDetectionAgent:
         mentions_text = self._format_mentions(mentions)
         
         # Run analysis
-        chain = prompt | self.llm
-        
-        result = await chain.ainvoke({
-            "history": historical_context,
-            "patterns": self.crisis_patterns,
-            "mentions": mentions_text,
-            "campaign_context": campaign_context or {}
-        })
+        result = await self.llm_gateway.invoke(
+            prompt,
+            {
+                "history": historical_context,
+                "patterns": self._match_crisis_patterns(mentions),
+                "mentions": mentions_text,
+                "campaign_context": campaign_context or {}
+            },
+            caller="crisis_detection.analyze",
+            temperature=0.2
+        )
         
         # Parse and validate analysis
         analysis = self._parse_analysis(result.content)
         
-        # Store in memory for future context
-        await self.memory.save_context(
-            {"mentions": mentions_text, "campaign_context": str(campaign_context)},
-            {"analysis": str(analysis.dict())}
-        )
+        # Store in history for future context
+        self._record_history(mentions, campaign_context, analysis)
         
         # Update patterns if this is a new crisis type
         if analysis.severity >= 7:
             await self._update_crisis_patterns(mentions, analysis)
         
+        if self.analysis_cache is not None:
+            self.analysis_cache.put(mentions, campaign_context, analysis.dict())
+        
         return analysis
     
-    async def _analyze_sentiment_context(self, mentions: List[Dict]) -> Dict:
-        """Contextual sentiment analysis with campaign awareness"""
-        positive_count = sum(1 for m in mentions if m.get('sentiment_score', 0) > 0.3)
-        negative_count = sum(1 for m in mentions if m.get('sentiment_score', 0) < -0.3)
-        neutral_count = len(mentions) - positive_count - negative_count
+    async def analyze_narratives(
+        self,
+        mentions: List[CrisisMention],
+        campaign_context: Optional[Dict] = None
+    ) -> Tuple[CrisisAnalysis, List[Dict]]:
+        """
+        Cluster mentions into narratives and analyze each one concurrently
+        
+        The largest narratives by reach get their own analysis; small and
+        overflow narratives are analyzed together as one remainder group.
+        
+        Returns:
+            The combined analysis and a summary of each analyzed narrative
+        """
+        campaign_id = (campaign_context or {}).get("campaign_id", "default")
+        clusterer = self.get_narratives(campaign_id)
+        groups = clusterer.assign(mentions)
+        
+        ranked = sorted(
+            groups.items(),
+            key=lambda item: sum(m.reach_count for m in item[1]),
+            reverse=True
+        )
+        
+        selected = []
+        remainder = []
+        for narrative_id, group in ranked:
+            if (
+                len(group) >= self.min_narrative_size
+                and len(selected) < self.max_narratives_per_run
+            ):
+                narrative = clusterer.get(narrative_id)
+                selected.append({
+                    "narrative_id": narrative_id,
+                    "label": narrative.label if narrative else narrative_id,
+                    "mentions": group
+                })
+            else:
+                remainder.extend(group)
+        
+        if remainder:
+            selected.append({"narrative_id": None, "label": "other mentions", "mentions": remainder})
+        
+        results = await asyncio.gather(
+            *(self.analyze_mentions(group["mentions"], campaign_context) for group in selected),
+            return_exceptions=True
+        )
+        
+        analyzed = []
+        for group, result in zip(selected, results):
+            if isinstance(result, Exception):
+                logger.error(f"Analysis of narrative '{group['label']}' failed: {result}")
+                continue
+            analyzed.append((group, result))
+        
+        if not analyzed:
+            raise next(r for r in results if isinstance(r, Exception))
         
-        # Calculate weighted sentiment based on reach
-        weighted_sentiment = sum(
-            m.get('sentiment_score', 0) * m.get('reach_count', 1) 
-            for m in mentions
-        ) / sum(m.get('reach_count', 1) for m in mentions)
+        summaries = [
+            {
+                "narrative_id": group["narrative_id"],
+                "label": group["label"],
+                "mention_count": len(group["mentions"]),
+                "total_reach": sum(m.reach_count for m in group["mentions"]),
+                "severity": analysis.severity,
+                "threat_type": analysis.threat_type
+            }
+            for group, analysis in analyzed
+        ]
+        
+        logger.info(
+            f"Analyzed {len(analyzed)} narratives from {len(mentions)} mentions "
+            f"({len(groups)} clusters)"
+        )
+        
+        return self._combine_analyses(analyzed), summaries
+    
+    def _combine_analyses(self, analyzed: List[Tuple[Dict, CrisisAnalysis]]) -> CrisisAnalysis:
+        """Merge per-narrative analyses, led by the most severe narrative"""
+        if len(analyzed) == 1:
+            return analyzed[0][1]
+        
+        lead = max(analyzed, key=lambda item: (item[1].severity, item[1].confidence))[1]
+        
+        def merged(values: List[str]) -> List[str]:
+            return list(dict.fromkeys(values))
+        
+        return CrisisAnalysis(
+            severity=lead.severity,
+            confidence=lead.confidence,
+            threat_type=lead.threat_type,
+            affected_topics=merged([t for _, a in analyzed for t in a.affected_topics]),
+            recommended_actions=merged([r for _, a in analyzed for r in a.recommended_actions]),
+            escalation_required=any(a.escalation_required for _, a in analyzed),
+            reasoning="\n\n".join(
+                f"[{group['label']} - {len(group['mentions'])} mentions, "
+                f"severity {analysis.severity}/10]\n{analysis.reasoning}"
+                for group, analysis in sorted(analyzed, key=lambda item: -item[1].severity)
+            )
+        )
+    
+    async def triage_mentions(
+        self,
+        mentions: Union[List[CrisisMention], MentionBatch],
+        campaign_id: str = "default"
+    ) -> Dict:
+        """Score mentions with the deterministic tools, without calling the LLM"""
+        batch = mentions if isinstance(mentions, MentionBatch) else MentionBatch.from_mentions(mentions)
+        
+        sentiment, velocity = await asyncio.gather(
+            self._analyze_sentiment_context(batch, campaign_id),
+            self._check_mention_velocity(batch, campaign_id)
+        )
+        influencers = self._identify_batch_influencers(batch)
         
-        # Check for sentiment shift patterns
-        sentiment_trend = await self._calculate_sentiment_trend(mentions)
+        has_verified_accounts = any(i['verified'] for i in influencers)
+        score = await self._assess_threat_level({
+            'sentiment': sentiment,
+            'velocity': velocity,
+            'has_verified_accounts': has_verified_accounts,
+            'has_influencers': bool(influencers)
+        })
         
         return {
-            'positive_ratio': positive_count / len(mentions) if mentions else 0,
-            'negative_ratio': negative_count / len(mentions) if mentions else 0,
-            'weighted_sentiment': weighted_sentiment,
-            'sentiment_trend': sentiment_trend,
-            'total_reach': sum(m.get('reach_count', 0) for m in mentions)
+            'score': score,
+            'sentiment': sentiment,
+            'velocity': velocity,
+            'influencers': influencers,
+            'has_verified_accounts': has_verified_accounts
         }
     
-    async def _check_mention_velocity(self, mentions: List[Dict]) -> Dict:
-        """Analyze mention velocity and viral potential"""
-        if not mentions:
-            return {'velocity': 0, 'acceleration': 0, 'viral_risk': 'low'}
+    async def triage_analysis(self, triage: Dict, escalate: bool = False) -> CrisisAnalysis:
+        """Build an analysis from triage scores alone, for batches the LLM can skip"""
+        severity = max(1, min(triage['score'], 10))
+        threat_type = "deterministic_escalation" if escalate else "no_crisis_detected"
+        
+        recommended_actions = await self._generate_response_strategy({
+            'severity': severity,
+            'threat_type': threat_type
+        })
         
-        # Sort mentions by time
-        sorted_mentions = sorted(
-            mentions, 
-            key=lambda x: x.get('published_at', datetime.now())
+        sentiment = triage['sentiment']
+        velocity = triage['velocity']
+        
+        return CrisisAnalysis(
+            severity=severity,
+            confidence=0.6,
+            threat_type=threat_type,
+            affected_topics=[],
+            recommended_actions=recommended_actions,
+            escalation_required=severity >= 7,
+            reasoning=(
+                f"Deterministic triage score {triage['score']}/10 "
+                f"(weighted sentiment {sentiment.get('weighted_sentiment', 0):.2f}, "
+                f"trend {sentiment.get('sentiment_trend', 'stable')}, "
+                f"velocity {velocity.get('velocity', 0):.1f}/h, "
+                f"viral risk {velocity.get('viral_risk', 'low')}, "
+                f"{len(triage['influencers'])} influencers); LLM analysis skipped"
+            )
+        )
+    
+    def _new_window(self) -> "MentionWindowAggregator":
+        """Create an empty velocity and sentiment aggregator"""
+        # Imported here because utils.state imports this module
+        from ..utils.sliding_window import MentionWindowAggregator
+        return MentionWindowAggregator()
+    
+    def get_narratives(self, campaign_id: str = "default") -> "NarrativeClusterer":
+        """Get the narrative clusterer for a campaign"""
+        clusterer = self.narratives.get(campaign_id)
+        if clusterer is None:
+            # Imported here because utils.state imports this module
+            from ..utils.narrative_clusters import NarrativeClusterer
+            clusterer = NarrativeClusterer()
+            self.narratives[campaign_id] = clusterer
+        return clusterer
+    
+    def get_window(self, campaign_id: str = "default") -> "MentionWindowAggregator":
+        """Get the streaming aggregator for a campaign"""
+        window = self.windows.get(campaign_id)
+        if window is None:
+            window = self._new_window()
+            self.windows[campaign_id] = window
+        return window
+    
+    def record_mentions(
+        self,
+        mentions: Union[List[CrisisMention], MentionBatch],
+        campaign_id: str = "default"
+    ) -> int:
+        """Fold newly seen mentions into the campaign's aggregates"""
+        window = self.get_window(campaign_id)
+        if isinstance(mentions, MentionBatch):
+            return window.add_batch(mentions)
+        return window.add_mentions(mentions)
+    
+    def _resolve_window(
+        self,
+        mentions: Union[List[Dict], MentionBatch],
+        campaign_id: Optional[str]
+    ) -> "MentionWindowAggregator":
+        """Campaign aggregates when available, else aggregates of the given mentions"""
+        if campaign_id is not None and campaign_id in self.windows:
+            return self.windows[campaign_id]
+        
+        # Dict input is converted to columns once; mentions without a
+        # timestamp cannot be bucketed
+        if not isinstance(mentions, MentionBatch):
+            mentions = MentionBatch.from_records([m for m in mentions if m.get('published_at')])
+        
+        window = self._new_window()
+        window.add_batch(mentions)
+        return window
+    
+    async def _analyze_sentiment_context(
+        self,
+        mentions: Union[List[Dict], MentionBatch],
+        campaign_id: Optional[str] = None
+    ) -> Dict:
+        """Contextual sentiment analysis with campaign awareness"""
+        stats = self._resolve_window(mentions, campaign_id).window_stats(
+            self.velocity_window_seconds
         )
         
-        # Calculate mentions per hour
-        time_span = (
-            sorted_mentions[-1].get('published_at', datetime.now()) - 
-            sorted_mentions[0].get('published_at', datetime.now())
-        ).total_seconds() / 3600
+        return {
+            'positive_ratio': stats['positive_ratio'],
+            'negative_ratio': stats['negative_ratio'],
+            'weighted_sentiment': stats['weighted_sentiment'],
+            'sentiment_trend': stats['sentiment_trend'],
+            'total_reach': stats['total_reach']
+        }
+    
+    async def _check_mention_velocity(
+        self,
+        mentions: Union[List[Dict], MentionBatch],
+        campaign_id: Optional[str] = None
+    ) -> Dict:
+        """Analyze mention velocity and viral potential"""
+        # Updates to already-counted mentions are never folded into the window
+        stats = self._resolve_window(mentions, campaign_id).window_stats(
+            self.velocity_window_seconds
+        )
         
-        if time_span == 0:
-            time_span = 1
-            
-        velocity = len(mentions) / time_span
+        if not stats['mention_count']:
+            return {'velocity': 0, 'acceleration': 0, 'viral_risk': 'low'}
         
-        # Calculate acceleration (change in velocity)
-        mid_point = len(sorted_mentions) // 2
-        first_half_velocity = mid_point / (time_span / 2) if time_span > 0 else 0
-        second_half_velocity = (len(mentions) - mid_point) / (time_span / 2) if time_span > 0 else 0
-        acceleration = second_half_velocity - first_half_velocity
+        velocity = stats['velocity']
+        acceleration = stats['acceleration']
         
         # Determine viral risk
         viral_risk = 'low'
@@ -222,7 +610,7 @@ class CrisisDetectionAgent:
             'velocity': velocity,
             'acceleration': acceleration,
             'viral_risk': viral_risk,
-            'time_span_hours': time_span
+            'time_span_hours': self.velocity_window_seconds / 3600
         }
     
     async def _assess_threat_level(self, analysis_data: Dict) -> int:
@@ -261,24 +649,48 @@ class CrisisDetectionAgent:
         
         return min(threat_score, 10)
     
-    async def _identify_key_influencers(self, mentions: List[Dict]) -> List[Dict]:
+    async def _identify_key_influencers(
+        self,
+        mentions: Union[List[Dict], MentionBatch]
+    ) -> List[Dict]:
         """Identify influential accounts in the mention stream"""
-        influencers = []
-        
-        for mention in mentions:
-            if mention.get('author') and mention.get('reach_count', 0) > 5000:
-                influencers.append({
-                    'author': mention['author'],
-                    'reach': mention.get('reach_count', 0),
-                    'verified': mention.get('is_verified', False),
-                    'source': mention.get('source'),
-                    'sentiment': mention.get('sentiment_score', 0)
-                })
+        if isinstance(mentions, MentionBatch):
+            return self._identify_batch_influencers(mentions)
+        
+        batch = MentionBatch.from_records(mentions)
+        return [
+            self._influencer(batch, i, mentions[i].get('is_verified', False))
+            for i in self._top_influencer_rows(batch)
+        ]
+    
+    def _identify_batch_influencers(self, batch: MentionBatch, limit: int = 10) -> List[Dict]:
+        """Identify influential accounts from the reach column of a batch"""
+        return [self._influencer(batch, i) for i in self._top_influencer_rows(batch, limit)]
+    
+    def _top_influencer_rows(self, batch: MentionBatch, limit: int = 10) -> np.ndarray:
+        """Rows of the highest-reach attributed mentions, highest reach first"""
+        # Reach filters on the column; only the survivors' authors are checked
+        candidates = np.flatnonzero(batch.reach > 5000)
+        has_author = np.fromiter(
+            (bool(batch.authors[i]) for i in candidates), np.bool_, len(candidates)
+        )
+        candidates = candidates[has_author]
         
-        # Sort by reach
-        influencers.sort(key=lambda x: x['reach'], reverse=True)
+        # Partition out the top k, then order only those
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-batch.reach[candidates], limit - 1)[:limit]]
         
-        return influencers[:10]  # Top 10 influencers
+        return candidates[np.argsort(-batch.reach[candidates], kind="stable")]
+    
+    def _influencer(self, batch: MentionBatch, row: int, verified: bool = False) -> Dict:
+        """Influencer summary of one batch row"""
+        return {
+            'author': batch.authors[row],
+            'reach': int(batch.reach[row]),
+            'verified': verified,
+            'source': batch.sources[row],
+            'sentiment': float(batch.sentiment[row])
+        }
     
     async def _generate_response_strategy(self, analysis: Dict) -> List[str]:
         """Generate strategic response recommendations"""
@@ -316,15 +728,8 @@ class CrisisDetectionAgent:
         return strategies
     
     def _format_mentions(self, mentions: List[CrisisMention]) -> str:
-        """Format mentions for LLM analysis"""
-        formatted = []
-        for m in mentions[:20]:  # Limit to prevent token overflow
-            formatted.append(
-                f"[{m.source}] @{m.author or 'unknown'} "
-                f"(reach: {m.reach_count}, sentiment: {m.sentiment_score:.2f}): "
-                f"{m.content[:200]}..."
-            )
-        return "\n".join(formatted)
+        """Format mentions for LLM analysis within the prompt token budget"""
+        return self.prompt_packer.pack(mentions)
     
     def _parse_analysis(self, llm_output: str) -> CrisisAnalysis:
         """Parse LLM output into structured analysis"""
@@ -361,47 +766,65 @@ class CrisisDetectionAgent:
                 reasoning=f"Parse error: {str(e)}"
             )
     
-    async def _get_historical_context(self, mentions: List[CrisisMention]) -> str:
-        """Retrieve relevant historical context from memory"""
-        # Extract key topics from current mentions
+    async def _get_historical_context(
+        self,
+        mentions: List[CrisisMention],
+        campaign_context: Optional[Dict] = None
+    ) -> str:
+        """Retrieve relevant past analyses of the campaign"""
+        # Query with the keywords and the text of the widest-reaching mentions
         keywords = set()
         for m in mentions:
             keywords.update(m.keywords)
         
-        # Get relevant memories
-        query = f"Crisis involving: {', '.join(list(keywords)[:5])}"
-        memories = await self.memory.aget_relevant_documents(query)
+        top = sorted(mentions, key=lambda m: m.reach_count, reverse=True)[:10]
+        query = " ".join(list(keywords) + [m.content for m in top])
         
-        return "\n".join([m.page_content for m in memories[:3]])
-    
-    async def _calculate_sentiment_trend(self, mentions: List[Dict]) -> str:
-        """Calculate sentiment trend over time"""
-        if len(mentions) < 2:
-            return "stable"
-        
-        # Sort by time and calculate moving average
-        sorted_mentions = sorted(
-            mentions, 
-            key=lambda x: x.get('published_at', datetime.now())
+        memories = self.history.search(
+            query,
+            k=3,
+            namespace=(campaign_context or {}).get('campaign_id', 'default')
         )
         
-        first_third = sorted_mentions[:len(sorted_mentions)//3]
-        last_third = sorted_mentions[-len(sorted_mentions)//3:]
-        
-        first_sentiment = sum(m.get('sentiment_score', 0) for m in first_third) / len(first_third)
-        last_sentiment = sum(m.get('sentiment_score', 0) for m in last_third) / len(last_third)
+        return "\n".join(memory['summary'] for memory in memories)
+    
+    def _record_history(
+        self,
+        mentions: List[CrisisMention],
+        campaign_context: Optional[Dict],
+        analysis: CrisisAnalysis
+    ) -> None:
+        """Index an analysis so later analyses of similar mentions find it"""
+        top = sorted(mentions, key=lambda m: m.reach_count, reverse=True)[:20]
+        keywords = sorted({k for m in mentions for k in m.keywords})
+        
+        text = " ".join(
+            [analysis.threat_type, analysis.reasoning]
+            + analysis.affected_topics
+            + keywords
+            + [m.content[:280] for m in top]
+        )
+        summary = (
+            f"{datetime.now():%Y-%m-%d %H:%M} {analysis.threat_type} "
+            f"(severity {analysis.severity}/10, {len(mentions)} mentions): "
+            f"topics {', '.join(analysis.affected_topics) or 'none'}; "
+            f"{analysis.reasoning[:200]}"
+        )
         
-        if last_sentiment < first_sentiment - 0.2:
-            return "declining"
-        elif last_sentiment > first_sentiment + 0.2:
-            return "improving"
-        else:
-            return "stable"
+        self.history.add(
+            text,
+            summary,
+            namespace=(campaign_context or {}).get('campaign_id', 'default')
+        )
+    
+    @property
+    def crisis_patterns(self) -> List[Dict]:
+        """All known crisis patterns, built-in first"""
+        return self.pattern_store.get_patterns()
     
     def _load_crisis_patterns(self):
-        """Load known crisis patterns from database or config"""
-        # In production, load from database
-        self.crisis_patterns = [
+        """Seed the pattern store with the built-in crisis patterns"""
+        self.pattern_store.seed([
             {
                 "type": "misinformation_spread",
                 "indicators": ["fact-check", "false", "lies", "misleading"],
@@ -417,7 +840,19 @@ class CrisisDetectionAgent:
                 "indicators": ["oppose", "against", "reject", "protest"],
                 "typical_severity": 5
             }
-        ]
+        ])
+    
+    def _match_crisis_patterns(self, mentions: List[CrisisMention]) -> List[Dict]:
+        """Crisis patterns whose indicators appear in the mentions, best first"""
+        # Imported here because utils imports this module
+        from ..utils.pattern_store import indicator_terms
+        
+        terms = set()
+        for m in mentions:
+            terms.update(k.lower() for k in m.keywords)
+            terms.update(indicator_terms(m.content))
+        
+        return self.pattern_store.match(terms, k=self.max_prompt_patterns)
     
     async def _update_crisis_patterns(
         self, 
@@ -425,19 +860,9 @@ class CrisisDetectionAgent:
         analysis: CrisisAnalysis
     ):
         """Learn from new crisis patterns"""
-        # Extract common keywords from high-severity crisis
-        keywords = set()
-        for m in mentions:
-            keywords.update(m.keywords)
-        
-        new_pattern = {
-            "type": f"learned_{datetime.now().strftime('%Y%m%d')}",
-            "indicators": list(keywords)[:10],
-            "typical_severity": analysis.severity,
-            "first_seen": datetime.now().isoformat()
-        }
-        
-        self.crisis_patterns.append(new_pattern)
+        # The most common keywords of the high-severity crisis, falling back
+        # to the topics the analysis named
+        keywords = Counter(k for m in mentions for k in m.keywords)
+        indicators = [k for k, _ in keywords.most_common(10)] or analysis.affected_topics
         
-        # In production, persist to database
-        logger.info(f"Learned new crisis pattern: {new_pattern['type']}")
\ No newline at end of file
+        self.pattern_store.learn(indicators, analysis.severity)
@@ -4,7 +4,7 @@ Monitoring Agents - Connect to external monitoring services
 
 import asyncio
 import aiohttp
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import datetime, timedelta
 import logging
 import hashlib
@@ -15,6 +15,9 @@ from langchain.tools import Tool
 from pydantic import BaseModel, Field
 
 from ..utils.rate_limiter import RateLimiter
+from ..utils.http_pool import ConnectionPoolManager, get_connection_pool
+from ..utils.dedup import MentionDedupStore
+from ..utils.fetch_checkpoint import FetchCheckpointStore
 from .crisis_detection import CrisisMention
 
 logger = logging.getLogger(__name__)
@@ -26,76 +29,197 @@ class MentionlyticsConfig(BaseModel):
     api_secret: str
     base_url: str = "https://api.mentionlytics.com/v1"
     webhook_secret: Optional[str] = None
+    page_size: int = 100
+    max_pages: int = 50  # Safety cap on pages followed per scan window
+    initial_lookback_hours: int = 1  # Window for a campaign's very first scan
 
 
 class MentionlyticsAgent:
     """Agent for monitoring mentions via Mentionlytics API"""
     
-    def __init__(self, config: MentionlyticsConfig):
+    def __init__(
+        self,
+        config: MentionlyticsConfig,
+        connection_pool: Optional[ConnectionPoolManager] = None,
+        dedup_store: Optional[MentionDedupStore] = None,
+        checkpoint_store: Optional[FetchCheckpointStore] = None
+    ):
         self.config = config
+        self.connection_pool = connection_pool or get_connection_pool()
+        self.dedup_store = dedup_store or MentionDedupStore()
+        self.checkpoint_store = checkpoint_store or FetchCheckpointStore()
         self.rate_limiter = RateLimiter(
             max_requests=100,
             time_window=3600  # 100 requests per hour
         )
         self.session: Optional[aiohttp.ClientSession] = None
-        self._last_fetch_time = datetime.now() - timedelta(hours=1)
         
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        await self._get_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        # The session belongs to the shared pool, keep its connections warm
+        self.session = None
     
-    async def scan(self) -> List[CrisisMention]:
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Borrow the pooled HTTP session"""
+        self.session = await self.connection_pool.get_session()
+        return self.session
+    
+    def get_last_fetch_time(self, campaign_id: str = "default") -> datetime:
+        """Get the start of the next fetch window for a campaign"""
+        checkpoint = self.checkpoint_store.get("mentionlytics", campaign_id)
+        if checkpoint:
+            return checkpoint
+        
+        return datetime.now() - timedelta(hours=self.config.initial_lookback_hours)
+    
+    async def scan(self, campaign_id: str = "default") -> List[CrisisMention]:
         """Scan for new mentions from Mentionlytics"""
+        mentions = []
+        async for chunk in self.scan_stream(campaign_id):
+            mentions.extend(chunk)
+        return mentions
+    
+    async def scan_stream(
+        self,
+        campaign_id: str = "default"
+    ) -> AsyncIterator[List[CrisisMention]]:
+        """
+        Stream new mentions from Mentionlytics one page at a time
+        
+        Pages are followed until the since/until window is drained, so a
+        spike of more than one page of mentions is no longer truncated.
+        Pages are requested oldest first: when the max_pages cap stops a
+        scan early, the checkpoint advances to the newest mention read and
+        the next scan resumes from there.
+        """
+        since = self.get_last_fetch_time(campaign_id)
+        until = datetime.now()
+        total = 0
+        fetch = {"drained": False}
+        read_until: Optional[datetime] = None
+        
         try:
-            await self.rate_limiter.acquire()
-            
-            # Fetch mentions since last scan
-            mentions_data = await self._fetch_mentions(
-                since=self._last_fetch_time,
-                until=datetime.now()
-            )
-            
-            # Convert to CrisisMention objects
-            mentions = []
-            for data in mentions_data:
-                mention = self._parse_mention(data)
-                if mention:
-                    mentions.append(mention)
+            async for page in self._fetch_mentions(since=since, until=until, status=fetch):
+                # Convert to CrisisMention objects
+                chunk = []
+                for data in page:
+                    mention = self._parse_mention(data)
+                    if mention:
+                        chunk.append(mention)
+                
+                if chunk:
+                    newest = max(m.published_at for m in chunk)
+                    if newest.tzinfo is not None:
+                        newest = newest.astimezone().replace(tzinfo=None)
+                    read_until = max(read_until, newest) if read_until else newest
+                
+                # Skip mentions this campaign already analyzed in an
+                # overlapping window
+                chunk = self.dedup_store.filter(chunk, scope=campaign_id)
+                
+                total += len(chunk)
+                if chunk:
+                    yield chunk
             
-            # Update last fetch time
-            self._last_fetch_time = datetime.now()
+            # A truncated window was read up to its newest mention so far;
+            # the next scan resumes there (mentions sharing that timestamp
+            # are fetched again and dropped by de-duplication)
+            if fetch["drained"]:
+                self.checkpoint_store.advance("mentionlytics", campaign_id, until)
+            else:
+                resume_at = min(read_until, until) if read_until else since
+                self.checkpoint_store.advance("mentionlytics", campaign_id, resume_at)
+                logger.warning(
+                    f"Window for {campaign_id} not drained; "
+                    f"the next scan resumes at {resume_at.isoformat()}"
+                )
+            self.dedup_store.save()
             
-            logger.info(f"Fetched {len(mentions)} mentions from Mentionlytics")
-            return mentions
+            logger.info(f"Fetched {total} new or updated mentions from Mentionlytics")
             
         except Exception as e:
             logger.error(f"Error scanning Mentionlytics: {e}")
-            return []
     
     async def _fetch_mentions(
         self, 
         since: datetime,
         until: datetime,
-        keywords: Optional[List[str]] = None
-    ) -> List[Dict]:
-        """Fetch mentions from Mentionlytics API"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        keywords: Optional[List[str]] = None,
+        status: Optional[Dict[str, bool]] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Fetch mentions from Mentionlytics API, following cursors or pages
+        
+        ``status["drained"]`` is set to whether the window was read to the
+        end, or the max_pages cap stopped it first.
+        """
+        status = status if status is not None else {}
+        status["drained"] = False
+        cursor: Optional[str] = None
+        page = 1
+        
+        for _ in range(self.config.max_pages):
+            await self.rate_limiter.acquire()
+            
+            data = await self._fetch_mentions_page(
+                since=since,
+                until=until,
+                keywords=keywords,
+                cursor=cursor,
+                page=page
+            )
+            
+            mentions = data.get('mentions', [])
+            if mentions:
+                yield mentions
+            
+            # Prefer cursor pagination, fall back to page numbers
+            pagination = data.get('pagination', {})
+            next_cursor = data.get('next_cursor') or pagination.get('next_cursor')
+            has_more = data.get('has_more', pagination.get('has_more'))
+            
+            if next_cursor:
+                cursor = next_cursor
+            elif has_more is False or len(mentions) < self.config.page_size:
+                status["drained"] = True
+                return
+            else:
+                page += 1
+        
+        logger.warning(
+            f"Stopped after {self.config.max_pages} pages; "
+            f"window {since.isoformat()} - {until.isoformat()} not fully drained"
+        )
+    
+    async def _fetch_mentions_page(
+        self,
+        since: datetime,
+        until: datetime,
+        keywords: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        page: int = 1
+    ) -> Dict:
+        """Fetch a single page of mentions from Mentionlytics API"""
+        session = await self._get_session()
         
         # Build query parameters
         params = {
             'since': since.isoformat(),
             'until': until.isoformat(),
-            'limit': 100,
-            'sort': 'published_at:desc'
+            'limit': self.config.page_size,
+            'sort': 'published_at:asc'
         }
         
+        if cursor:
+            params['cursor'] = cursor
+        else:
+            params['page'] = page
+        
         if keywords:
             params['keywords'] = ','.join(keywords)
         
@@ -105,20 +229,18 @@ class MentionlyticsAgent:
         url = f"{self.config.base_url}/mentions"
         
         try:
-            async with self.session.get(
+            async with session.get(
                 url,
                 params=params,
                 headers=headers,
                 timeout=aiohttp.ClientTimeout(total=30)
             ) as response:
                 response.raise_for_status()
-                data = await response.json()
-                
-                return data.get('mentions', [])
+                return await response.json()
                 
         except aiohttp.ClientError as e:
             logger.error(f"Mentionlytics API error: {e}")
-            return []
+            raise
     
     def _get_auth_headers(self, method: str, path: str, params: Dict) -> Dict:
         """Generate authentication headers for Mentionlytics API"""
@@ -190,13 +312,12 @@ class MentionlyticsAgent:
         try:
             await self.rate_limiter.acquire()
             
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+            session = await self._get_session()
             
             headers = self._get_auth_headers('GET', f'/mentions/{mention_id}', {})
             url = f"{self.config.base_url}/mentions/{mention_id}"
             
-            async with self.session.get(
+            async with session.get(
                 url,
                 headers=headers,
                 timeout=aiohttp.ClientTimeout(total=30)
@@ -211,8 +332,7 @@ class MentionlyticsAgent:
     async def setup_webhook(self, webhook_url: str) -> bool:
         """Setup webhook for real-time mention notifications"""
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+            session = await self._get_session()
             
             data = {
                 'url': webhook_url,
@@ -223,7 +343,7 @@ class MentionlyticsAgent:
             headers = self._get_auth_headers('POST', '/webhooks', {})
             url = f"{self.config.base_url}/webhooks"
             
-            async with self.session.post(
+            async with session.post(
                 url,
                 json=data,
                 headers=headers,
@@ -261,7 +381,7 @@ class MentionlyticsAgent:
 class NewsWhipAgent:
     """Placeholder for NewsWhip integration"""
     
-    async def scan(self) -> List[CrisisMention]:
+    async def scan(self, campaign_id: str = "default") -> List[CrisisMention]:
         """Scan NewsWhip for trending stories"""
         # Placeholder - implement when NewsWhip credentials available
         return []
@@ -270,7 +390,7 @@ class NewsWhipAgent:
 class SocialMediaAgent:
     """Placeholder for direct social media monitoring"""
     
-    async def scan(self) -> List[CrisisMention]:
+    async def scan(self, campaign_id: str = "default") -> List[CrisisMention]:
         """Scan social media platforms"""
         # Placeholder - implement platform-specific monitoring
         return []
\ No newline at end of file
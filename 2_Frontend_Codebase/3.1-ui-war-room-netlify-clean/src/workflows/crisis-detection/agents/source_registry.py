@@ -0,0 +1,237 @@
+"""
+Source Registry - Concurrent fan-out across monitoring sources
+"""
+
+import asyncio
+import hashlib
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+import logging
+
+from .crisis_detection import CrisisMention
+
+logger = logging.getLogger(__name__)
+
+
+class MonitoringSource:
+    """A registered monitoring agent with its own scan deadline"""
+    
+    def __init__(self, name: str, agent: Any, timeout: float):
+        self.name = name
+        self.agent = agent
+        self.timeout = timeout
+        
+        # Tuning statistics
+        self.scans = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.total_yield = 0
+        self.last_yield = 0
+        self.total_latency = 0.0
+        self.last_latency = 0.0
+        self.last_error: Optional[str] = None
+    
+    def record_scan(
+        self,
+        latency: float,
+        mention_count: int,
+        timed_out: bool,
+        error: Optional[str]
+    ) -> None:
+        """Record the outcome of one scan"""
+        self.scans += 1
+        self.total_latency += latency
+        self.last_latency = latency
+        self.total_yield += mention_count
+        self.last_yield = mention_count
+        
+        if timed_out:
+            self.timeouts += 1
+        if error:
+            self.errors += 1
+            self.last_error = error
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get latency and yield statistics for this source"""
+        return {
+            "timeout_seconds": self.timeout,
+            "scans": self.scans,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "last_latency_ms": self.last_latency * 1000,
+            "avg_latency_ms": self.total_latency / self.scans * 1000 if self.scans else 0.0,
+            "last_yield": self.last_yield,
+            "total_yield": self.total_yield,
+            "avg_yield": self.total_yield / self.scans if self.scans else 0.0
+        }
+
+
+class SourceRegistry:
+    """
+    Runs every registered monitoring source concurrently
+    
+    Each source scans under its own deadline. Mentions that arrive before a
+    source times out are kept, so one slow source only loses its own tail
+    and never holds up the batch. The merged stream is de-duplicated across
+    sources by URL, falling back to normalized content. Within one source
+    only repeated mention IDs are dropped, so retweets and copy-pasted posts
+    still count towards volume.
+    """
+    
+    def __init__(self, default_timeout: float = 30.0):
+        """
+        Initialize source registry
+        
+        Args:
+            default_timeout: Scan deadline in seconds for sources registered
+                without their own
+        """
+        self.default_timeout = default_timeout
+        self.sources: Dict[str, MonitoringSource] = {}
+        self.cross_source_duplicates = 0
+    
+    def register(self, name: str, agent: Any, timeout: Optional[float] = None) -> None:
+        """Register a monitoring agent exposing scan() or scan_stream()"""
+        self.sources[name] = MonitoringSource(
+            name=name,
+            agent=agent,
+            timeout=timeout or self.default_timeout
+        )
+        logger.info(f"Registered monitoring source {name} (timeout {self.sources[name].timeout}s)")
+    
+    def unregister(self, name: str) -> None:
+        """Remove a monitoring source"""
+        self.sources.pop(name, None)
+    
+    async def scan_all(self, campaign_id: str = "default") -> List[CrisisMention]:
+        """Scan all sources and return the merged, de-duplicated mentions"""
+        mentions = []
+        async for chunk in self.scan_stream(campaign_id):
+            mentions.extend(chunk)
+        return mentions
+    
+    async def scan_stream(
+        self,
+        campaign_id: str = "default"
+    ) -> AsyncIterator[List[CrisisMention]]:
+        """Stream merged mention chunks as each source produces them"""
+        if not self.sources:
+            return
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        producers = [
+            asyncio.create_task(self._run_source(source, campaign_id, queue))
+            for source in self.sources.values()
+        ]
+        
+        seen_ids: Set[Tuple[str, str]] = set()
+        # merge key -> name of the source that reported it first
+        reported_by: Dict[str, str] = {}
+        remaining = len(producers)
+        
+        try:
+            while remaining:
+                item = await queue.get()
+                if item is None:
+                    remaining -= 1
+                    continue
+                
+                source_name, chunk = item
+                merged = []
+                for mention in chunk:
+                    if mention.mention_id:
+                        if (source_name, mention.mention_id) in seen_ids:
+                            continue
+                        seen_ids.add((source_name, mention.mention_id))
+                    
+                    # Content and URL only identify the same mention when it
+                    # comes from another source
+                    key = self._merge_key(mention)
+                    first_source = reported_by.setdefault(key, source_name)
+                    if first_source != source_name:
+                        self.cross_source_duplicates += 1
+                        continue
+                    merged.append(mention)
+                
+                if merged:
+                    yield merged
+        finally:
+            for producer in producers:
+                if not producer.done():
+                    producer.cancel()
+    
+    async def _run_source(
+        self,
+        source: MonitoringSource,
+        campaign_id: str,
+        queue: asyncio.Queue
+    ) -> None:
+        """Scan one source under its deadline, forwarding chunks as they arrive"""
+        start = time.monotonic()
+        counter = {"mentions": 0}
+        timed_out = False
+        error = None
+        
+        try:
+            await asyncio.wait_for(
+                self._drain_source(source, campaign_id, queue, counter),
+                timeout=source.timeout
+            )
+        except asyncio.TimeoutError:
+            timed_out = True
+            logger.warning(
+                f"Source {source.name} exceeded {source.timeout}s deadline; "
+                f"keeping {counter['mentions']} partial mentions"
+            )
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Source {source.name} failed: {e}")
+        finally:
+            source.record_scan(
+                latency=time.monotonic() - start,
+                mention_count=counter["mentions"],
+                timed_out=timed_out,
+                error=error
+            )
+            queue.put_nowait(None)
+    
+    async def _drain_source(
+        self,
+        source: MonitoringSource,
+        campaign_id: str,
+        queue: asyncio.Queue,
+        counter: Dict[str, int]
+    ) -> None:
+        """Forward every chunk a source yields to the merge queue"""
+        agent = source.agent
+        
+        if hasattr(agent, "scan_stream"):
+            async for chunk in agent.scan_stream(campaign_id):
+                counter["mentions"] += len(chunk)
+                queue.put_nowait((source.name, chunk))
+        else:
+            chunk = await agent.scan(campaign_id=campaign_id)
+            counter["mentions"] += len(chunk)
+            queue.put_nowait((source.name, chunk))
+    
+    def _merge_key(self, mention: CrisisMention) -> str:
+        """Key identifying the same mention reported by different sources"""
+        if mention.url:
+            return mention.url.split("#")[0].rstrip("/").lower()
+        
+        normalized = " ".join(mention.content.lower().split())
+        if not normalized:
+            return f"{mention.source}:{mention.mention_id}"
+        
+        return hashlib.blake2b(normalized.encode(), digest_size=12).hexdigest()
+    
+    def get_source_stats(self) -> Dict[str, Any]:
+        """Get per-source latency and yield statistics"""
+        return {
+            "sources": {
+                name: source.get_stats()
+                for name, source in self.sources.items()
+            },
+            "cross_source_duplicates": self.cross_source_duplicates
+        }
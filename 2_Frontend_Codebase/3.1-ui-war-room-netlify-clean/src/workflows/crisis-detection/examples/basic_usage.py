@@ -10,7 +10,8 @@ import os
 from datetime import datetime
 from typing import Dict, Optional
 
-from ..workflow import run_crisis_detection
+from ..workflow import CrisisDetectionWorkflow, run_crisis_detection
+from ..service import CrisisDetectionService
 from ..agents.monitoring import MentionlyticsConfig
 from ..utils.state import WorkflowState
 
@@ -212,21 +213,24 @@ async def continuous_monitoring_example():
         "alert_threshold": 4  # Alert on severity >= 4
     }
     
-    scan_count = 0
+    # Build the workflow once and keep it warm between scans
+    service = CrisisDetectionService.from_credentials(
+        openai_api_key=openai_api_key,
+        mentionlytics_api_key=mentionlytics_api_key,
+        mentionlytics_api_secret=mentionlytics_api_secret,
+        campaign_context=campaign_context,
+        scan_interval=900
+    )
+    await service.start()
+    
     alerts_sent = 0
     
     try:
         while True:
-            scan_count += 1
-            print(f"🔍 Scan #{scan_count} - {datetime.now().strftime('%H:%M:%S')}")
+            print(f"🔍 Scan #{service.runs + 1} - {datetime.now().strftime('%H:%M:%S')}")
             
             try:
-                result = await run_crisis_detection(
-                    openai_api_key=openai_api_key,
-                    mentionlytics_api_key=mentionlytics_api_key,
-                    mentionlytics_api_secret=mentionlytics_api_secret,
-                    campaign_context=campaign_context
-                )
+                result = await service.run_once()
                 
                 # Check for threats
                 if result.get('threat_detected'):
@@ -244,7 +248,9 @@ async def continuous_monitoring_example():
                 else:
                     print("✅ No threats detected")
                 
-                print(f"📊 Total scans: {scan_count}, Total alerts: {alerts_sent}")
+                stats = service.get_stats()
+                print(f"📊 Total scans: {stats['runs']}, Total alerts: {alerts_sent}")
+                print(f"⏱️  Scan latency: {stats['last_latency_ms']:.0f}ms (p95 {stats['p95_latency_ms']:.0f}ms)")
                 print()
                 
             except Exception as e:
@@ -252,64 +258,84 @@ async def continuous_monitoring_example():
             
             # Wait 15 minutes (900 seconds)
             print("⏱️  Waiting 15 minutes until next scan...")
-            await asyncio.sleep(900)
+            await asyncio.sleep(service.scan_interval)
             
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         print("\n🛑 Monitoring stopped by user")
-        print(f"📊 Final stats: {scan_count} scans completed, {alerts_sent} alerts sent")
+        print(f"📊 Final stats: {service.runs} scans completed, {alerts_sent} alerts sent")
+    finally:
+        await service.stop()
 
 
 async def webhook_integration_example():
     """
-    Example of integrating with Mentionlytics webhooks for real-time alerts
+    Example of receiving Mentionlytics webhooks for real-time alerts
+    
+    Pushed mentions are verified, micro-batched (50 mentions or 2 seconds)
+    and sent straight into the analyze stage, so alerts go out within
+    seconds instead of waiting for the next 15-minute poll.
     """
     
     print("🪝 Webhook Integration Example")
     print("=" * 30)
     
-    # This would typically be integrated with a web framework like FastAPI
-    # Here's the conceptual structure:
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    mentionlytics_api_key = os.getenv("MENTIONLYTICS_API_KEY")
+    mentionlytics_api_secret = os.getenv("MENTIONLYTICS_API_SECRET")
+    webhook_secret = os.getenv("MENTIONLYTICS_WEBHOOK_SECRET")
+    port = int(os.getenv("CRISIS_DETECTION_WEBHOOK_PORT", "8080"))
+    
+    if not all([openai_api_key, mentionlytics_api_key, mentionlytics_api_secret, webhook_secret]):
+        print("❌ Missing required configuration. Please set environment variables:")
+        print("   - OPENAI_API_KEY")
+        print("   - MENTIONLYTICS_API_KEY")
+        print("   - MENTIONLYTICS_API_SECRET")
+        print("   - MENTIONLYTICS_WEBHOOK_SECRET")
+        return
     
-    webhook_config = {
-        "endpoint": "https://your-campaign-domain.com/webhooks/mentionlytics",
-        "secret": "your_webhook_verification_secret",
-        "events": ["mention.created", "mention.updated"]
+    campaign_context = {
+        "candidate_name": "Sarah Johnson",
+        "key_issues": ["healthcare", "economy", "education"],
+        "monitor_keywords": ["Sarah Johnson", "scandal", "controversy"]
     }
     
-    print("🔧 Webhook Configuration:")
-    print(f"   Endpoint: {webhook_config['endpoint']}")
-    print(f"   Events: {', '.join(webhook_config['events'])}")
-    print()
+    workflow = CrisisDetectionWorkflow(
+        openai_api_key=openai_api_key,
+        mentionlytics_config=MentionlyticsConfig(
+            api_key=mentionlytics_api_key,
+            api_secret=mentionlytics_api_secret,
+            webhook_secret=webhook_secret
+        )
+    )
     
-    print("💡 Integration Steps:")
-    print("1. Set up webhook endpoint in your web application")
-    print("2. Configure Mentionlytics to send events to your endpoint")
-    print("3. Verify webhook signatures for security")
-    print("4. Trigger crisis detection workflow on high-priority mentions")
+    receiver = workflow.create_webhook_receiver(
+        campaign_context=campaign_context,
+        port=port,
+        max_batch_size=50,
+        max_wait_seconds=2.0
+    )
+    
+    await receiver.start()
+    
+    print("🔧 Webhook Configuration:")
+    print(f"   Endpoint: http://0.0.0.0:{port}{receiver.path}")
+    print("   Events: mention.created, mention.updated")
+    print("   Batching: 50 mentions or 2 seconds")
+    print("Press Ctrl+C to stop receiving")
     print()
     
-    # Example webhook handler (pseudo-code)
-    print("📝 Example webhook handler:")
-    print("""
-    @app.post("/webhooks/mentionlytics")
-    async def handle_mentionlytics_webhook(request):
-        # 1. Verify webhook signature
-        if not verify_webhook_signature(request):
-            return {"error": "Invalid signature"}, 401
-        
-        # 2. Parse mention data
-        mention_data = await request.json()
-        
-        # 3. Quick threat assessment
-        if is_high_priority_mention(mention_data):
-            # 4. Trigger immediate crisis detection
-            await run_crisis_detection(
-                mentions=[mention_data],
-                campaign_context=get_campaign_context()
+    try:
+        while True:
+            await asyncio.sleep(60)
+            stats = receiver.get_stats()
+            print(
+                f"📊 Received {stats['mentions_received']} mentions in "
+                f"{stats['batching']['batches_flushed']} batches"
             )
-        
-        return {"status": "processed"}
-    """)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\n🛑 Webhook receiver stopped by user")
+    finally:
+        await receiver.stop()
 
 
 if __name__ == "__main__":
@@ -328,7 +354,7 @@ if __name__ == "__main__":
         else:
             print("Usage: python basic_usage.py [continuous|webhook]")
             print("  continuous - Run continuous monitoring")
-            print("  webhook    - Show webhook integration example")
+            print("  webhook    - Receive webhook pushes for real-time alerts")
     else:
         # Run basic example
         asyncio.run(basic_crisis_detection_example())
\ No newline at end of file
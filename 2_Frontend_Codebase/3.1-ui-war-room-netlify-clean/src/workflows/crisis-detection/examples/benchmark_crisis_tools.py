@@ -0,0 +1,149 @@
+"""
+Crisis Tools Benchmark
+
+Compares the per-mention dict loops the sentiment, velocity and influencer
+tools used to run (one sort per tool, .get() per field) with the columnar
+path: one MentionBatch per batch, a single bucket sort with segment sums in
+the window aggregator and an argpartition top-k for influencers. The
+columnar path is timed both from dicts, as the LLM tools receive them, and
+on a prebuilt batch, as the triage path receives it.
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from ..agents.crisis_detection import MentionBatch
+from ..utils.sliding_window import MentionWindowAggregator
+from .benchmark_mention_batch import generate_records
+
+
+def sentiment_trend(mentions: List[Dict]) -> str:
+    """Sentiment trend from the first and last thirds by publish time"""
+    if len(mentions) < 2:
+        return "stable"
+    
+    sorted_mentions = sorted(mentions, key=lambda x: x.get('published_at', datetime.now()))
+    first_third = sorted_mentions[:len(sorted_mentions) // 3]
+    last_third = sorted_mentions[-len(sorted_mentions) // 3:]
+    
+    first_sentiment = sum(m.get('sentiment_score', 0) for m in first_third) / len(first_third)
+    last_sentiment = sum(m.get('sentiment_score', 0) for m in last_third) / len(last_third)
+    
+    if last_sentiment < first_sentiment - 0.2:
+        return "declining"
+    elif last_sentiment > first_sentiment + 0.2:
+        return "improving"
+    return "stable"
+
+
+def loop_path(mentions: List[Dict]) -> object:
+    """Sentiment, velocity and influencers as per-mention dict loops"""
+    positive = sum(1 for m in mentions if m.get('sentiment_score', 0) > 0.3)
+    negative = sum(1 for m in mentions if m.get('sentiment_score', 0) < -0.3)
+    weighted_sentiment = sum(
+        m.get('sentiment_score', 0) * m.get('reach_count', 1) for m in mentions
+    ) / sum(m.get('reach_count', 1) for m in mentions)
+    sentiment = {
+        'positive_ratio': positive / len(mentions),
+        'negative_ratio': negative / len(mentions),
+        'weighted_sentiment': weighted_sentiment,
+        'sentiment_trend': sentiment_trend(mentions),
+        'total_reach': sum(m.get('reach_count', 0) for m in mentions)
+    }
+    
+    sorted_mentions = sorted(mentions, key=lambda x: x.get('published_at', datetime.now()))
+    time_span = (
+        sorted_mentions[-1]['published_at'] - sorted_mentions[0]['published_at']
+    ).total_seconds() / 3600 or 1
+    mid_point = len(sorted_mentions) // 2
+    velocity = {
+        'velocity': len(mentions) / time_span,
+        'acceleration': (len(mentions) - 2 * mid_point) / (time_span / 2)
+    }
+    
+    influencers = sorted(
+        (
+            {
+                'author': m['author'],
+                'reach': m.get('reach_count', 0),
+                'source': m.get('source'),
+                'sentiment': m.get('sentiment_score', 0)
+            }
+            for m in mentions
+            if m.get('author') and m.get('reach_count', 0) > 5000
+        ),
+        key=lambda x: x['reach'],
+        reverse=True
+    )[:10]
+    
+    return sentiment, velocity, influencers
+
+
+def columnar_path(batch: MentionBatch) -> object:
+    """Segment-summed window stats and argpartition top-k over a batch"""
+    window = MentionWindowAggregator()
+    window.add_batch(batch)
+    stats = window.window_stats(3600)
+    
+    candidates = np.flatnonzero(batch.reach > 5000)
+    has_author = np.fromiter(
+        (bool(batch.authors[i]) for i in candidates), np.bool_, len(candidates)
+    )
+    candidates = candidates[has_author]
+    if len(candidates) > 10:
+        candidates = candidates[np.argpartition(-batch.reach[candidates], 9)[:10]]
+    top = candidates[np.argsort(-batch.reach[candidates], kind="stable")]
+    influencers = [
+        {
+            'author': batch.authors[i],
+            'reach': int(batch.reach[i]),
+            'source': batch.sources[i],
+            'sentiment': float(batch.sentiment[i])
+        }
+        for i in top
+    ]
+    
+    return stats, influencers
+
+
+def best_of(func: Callable[[], object], repeats: int) -> float:
+    """Fastest of several runs, in seconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    
+    return min(timings)
+
+
+def run_benchmark(sizes: Sequence[int] = (1000, 10000, 100000), repeats: int = 3) -> None:
+    """Benchmark both paths at each batch size"""
+    print(f"📊 Crisis tools benchmark - best of {repeats}")
+    print("=" * 60)
+    print(f"{'mentions':>10} {'dict loops':>12} {'from dicts':>12} {'batch':>12} {'speedup':>9}")
+    
+    for count in sizes:
+        mentions = generate_records(count)
+        batch = MentionBatch.from_records(mentions)
+        
+        loop_time = best_of(lambda: loop_path(mentions), repeats)
+        dicts_time = best_of(
+            lambda: columnar_path(MentionBatch.from_records(mentions)),
+            repeats
+        )
+        batch_time = best_of(lambda: columnar_path(batch), repeats)
+        
+        print(
+            f"{count:>10,} {loop_time * 1000:>9.1f} ms {dicts_time * 1000:>9.1f} ms "
+            f"{batch_time * 1000:>9.1f} ms {loop_time / batch_time:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    import sys
+    
+    run_benchmark([int(arg) for arg in sys.argv[1:]] or (1000, 10000, 100000))
@@ -0,0 +1,135 @@
+"""
+Mention Batch Benchmark
+
+Compares memory and CPU per batch of mentions between the per-model triage
+path (dict copies of every CrisisMention for the scoring tools) and the
+columnar MentionBatch view triage builds with from_mentions. Both start
+from CrisisMention models, as ingestion still parses each API payload into
+one; that parsing cost is shown separately since neither path avoids it.
+"""
+
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from ..agents.crisis_detection import CrisisMention, MentionBatch
+from ..utils.sliding_window import MentionWindowAggregator
+
+
+def generate_records(count: int, seed: int = 42) -> List[Dict]:
+    """Generate mention records shaped like CrisisMention"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    words = ["healthcare", "economy", "scandal", "rally", "debate", "policy", "vote", "leaked"]
+    
+    return [
+        {
+            "mention_id": f"bench-{i}",
+            "content": " ".join(rng.choice(words) for _ in range(30)),
+            "source": rng.choice(["twitter", "facebook", "news", "reddit"]),
+            "author": f"author_{rng.randint(0, 2000)}",
+            "url": f"https://example.com/mentions/{i}",
+            "sentiment_score": rng.uniform(-1, 1),
+            "reach_count": int(rng.paretovariate(1.2) * 100),
+            "engagement_count": rng.randint(0, 500),
+            "published_at": now - timedelta(seconds=rng.randint(0, 3600)),
+            "keywords": rng.sample(words, 3)
+        }
+        for i in range(count)
+    ]
+
+
+def measure(func: Callable[[], object]) -> Tuple[object, float, float]:
+    """Run func once, returning its result, seconds taken and peak MiB allocated"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def parse_path(records: List[Dict]) -> object:
+    """Validated models, as ingestion builds them for both paths"""
+    return [CrisisMention(**record) for record in records]
+
+
+def model_path(mentions: List[CrisisMention]) -> object:
+    """Dict copies for the tools, per-mention window folding"""
+    mention_dicts = [m.dict() for m in mentions]
+    
+    window = MentionWindowAggregator()
+    window.add_mentions(mention_dicts)
+    influencers = sorted(
+        (m for m in mention_dicts if m.get("author") and m.get("reach_count", 0) > 5000),
+        key=lambda m: m["reach_count"],
+        reverse=True
+    )[:10]
+    
+    return mention_dicts, window, influencers
+
+
+def batch_path(mentions: List[CrisisMention]) -> object:
+    """Columnar view over the models, vectorized window folding and influencer ranking"""
+    batch = MentionBatch.from_mentions(mentions)
+    
+    window = MentionWindowAggregator()
+    window.add_batch(batch)
+    has_author = np.fromiter((bool(a) for a in batch.authors), np.bool_, len(batch))
+    candidates = np.flatnonzero(has_author & (batch.reach > 5000))
+    influencers = candidates[np.argsort(-batch.reach[candidates], kind="stable")[:10]]
+    
+    return batch, window, influencers
+
+
+def best_of(func: Callable[[], object], repeats: int) -> Tuple[float, float]:
+    """Fastest time in seconds and smallest peak MiB over several runs"""
+    timings = []
+    peaks = []
+    for _ in range(repeats):
+        _, elapsed, peak = measure(func)
+        timings.append(elapsed)
+        peaks.append(peak)
+    
+    return min(timings), min(peaks)
+
+
+def run_benchmark(count: int = 10000, repeats: int = 3) -> None:
+    """Benchmark both triage paths on a batch of the given size"""
+    records = generate_records(count)
+    mentions = parse_path(records)
+    
+    print(f"📊 Mention batch benchmark - {count:,} mentions, best of {repeats}")
+    print("=" * 60)
+    
+    parse_time, parse_peak = best_of(lambda: parse_path(records), repeats)
+    print(f"{'parsing (both)':<18} {parse_time * 1000:9.1f} ms   {parse_peak:8.1f} MiB peak")
+    
+    results = {}
+    for name, path in [("model dicts", model_path), ("MentionBatch", batch_path)]:
+        results[name] = best_of(lambda: path(mentions), repeats)
+        elapsed, peak = results[name]
+        print(f"{name:<18} {elapsed * 1000:9.1f} ms   {peak:8.1f} MiB peak")
+    
+    model_time, model_peak = results["model dicts"]
+    batch_time, batch_peak = results["MentionBatch"]
+    print("-" * 60)
+    print(
+        f"Triage: {model_time / batch_time:.1f}x faster, "
+        f"{model_peak / batch_peak:.1f}x less memory"
+    )
+    print(
+        f"Including parsing: {(parse_time + model_time) / (parse_time + batch_time):.1f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    import sys
+    
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,186 @@
+"""
+Staged Pipeline - Ingestion and analysis decoupled by a bounded queue
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import logging
+
+from .agents.crisis_detection import CrisisMention
+from .tools.webhook_server import WebhookReceiver
+from .utils.stage_queue import MentionStageQueue
+from .workflow import CrisisDetectionWorkflow
+
+logger = logging.getLogger(__name__)
+
+
+class StagedPipeline:
+    """
+    Runs ingestion and analysis as separate stages
+    
+    Scans and webhook pushes only filter mentions and put them on a bounded
+    queue; a fixed pool of analysis workers takes coalesced batches off the
+    queue and runs them through the workflow's push graph. A burst therefore
+    never stalls scanning on the LLM, and memory stays bounded: under load
+    the queue sheds low-reach mentions and, when full, makes producers
+    wait.
+    """
+    
+    def __init__(
+        self,
+        workflow: CrisisDetectionWorkflow,
+        queue_capacity: int = 2000,
+        policy: str = "drop_low_reach",
+        shed_threshold: float = 0.8,
+        min_reach: int = 1000,
+        analysis_workers: int = 2,
+        max_batch_mentions: int = 200
+    ):
+        """
+        Initialize staged pipeline
+        
+        Args:
+            workflow: Workflow whose sources and push graph are used
+            queue_capacity: Mentions queued before producers have to wait
+            policy: Load shedding policy (see MentionStageQueue)
+            shed_threshold: Queue fill ratio at which shedding starts
+            min_reach: Mentions below this reach are shed under load
+            analysis_workers: Batches analyzed concurrently
+            max_batch_mentions: Mentions coalesced into one analysis run
+        """
+        self.workflow = workflow
+        self.analysis_workers = analysis_workers
+        self.max_batch_mentions = max_batch_mentions
+        
+        self.queue = MentionStageQueue(
+            max_mentions=queue_capacity,
+            policy=policy,
+            shed_threshold=shed_threshold,
+            min_reach=min_reach
+        )
+        
+        self._workers: List[asyncio.Task] = []
+        
+        # Stage statistics
+        self.scans = 0
+        self.scanned_mentions = 0
+        self.analysis_runs = 0
+        self.analysis_failures = 0
+        self.analyzed_mentions = 0
+        self.last_error: Optional[str] = None
+        self.last_analysis_at: Optional[datetime] = None
+    
+    async def start(self) -> None:
+        """Start the analysis workers"""
+        if self._workers:
+            return
+        
+        self._workers = [
+            asyncio.create_task(self._analysis_worker(index))
+            for index in range(self.analysis_workers)
+        ]
+        logger.info(f"Staged pipeline started with {self.analysis_workers} analysis workers")
+    
+    async def stop(self) -> None:
+        """Stop accepting mentions and wait for queued ones to be analyzed"""
+        await self.queue.close()
+        
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+        
+        logger.info("Staged pipeline stopped")
+    
+    async def submit(
+        self,
+        mentions: List[CrisisMention],
+        campaign_context: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Queue mentions for analysis, waiting while the queue is full
+        
+        Returns:
+            Number of mentions queued after load shedding
+        """
+        return await self.queue.put(mentions, campaign_context)
+    
+    async def ingest_scan(self, campaign_context: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Scan all sources and queue relevant mentions chunk by chunk
+        
+        Returns:
+            Number of mentions queued
+        """
+        campaign_context = campaign_context or {}
+        campaign_id = campaign_context.get("campaign_id", "default")
+        queued = 0
+        
+        async for chunk in self.workflow.source_registry.scan_stream(campaign_id):
+            relevant, _ = self.workflow.filter_relevant(chunk, campaign_context)
+            self.scanned_mentions += len(chunk)
+            if relevant:
+                queued += await self.submit(relevant, campaign_context)
+        
+        self.scans += 1
+        logger.info(f"Scan queued {queued} mentions for analysis (depth {len(self.queue)})")
+        
+        return queued
+    
+    def create_webhook_receiver(
+        self,
+        campaign_context: Optional[Dict[str, Any]] = None,
+        **receiver_options
+    ) -> WebhookReceiver:
+        """Create a webhook receiver that feeds the analysis queue"""
+        
+        async def process_batch(mentions: List[CrisisMention]) -> int:
+            return await self.submit(mentions, campaign_context)
+        
+        # A full queue holds back the HTTP handlers instead of piling up
+        # flush tasks
+        receiver_options.setdefault("max_inflight_batches", 2)
+        
+        return WebhookReceiver(
+            monitoring_agent=self.workflow.monitoring_agent,
+            process_batch=process_batch,
+            campaign_id=(campaign_context or {}).get("campaign_id", "default"),
+            **receiver_options
+        )
+    
+    async def _analysis_worker(self, index: int) -> None:
+        """Analyze queued batches until the queue is closed and drained"""
+        while True:
+            batch = await self.queue.get(self.max_batch_mentions)
+            if batch is None:
+                return
+            
+            try:
+                await self.workflow.process_mentions(batch.mentions, batch.campaign_context)
+                self.analysis_runs += 1
+                self.analyzed_mentions += len(batch.mentions)
+            except Exception as e:
+                self.analysis_failures += 1
+                self.last_error = str(e)
+                logger.error(f"Analysis worker {index} failed on {len(batch.mentions)} mentions: {e}")
+            finally:
+                self.last_analysis_at = datetime.now()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue and stage statistics"""
+        return {
+            "queue": self.queue.get_stats(),
+            "workers": len(self._workers),
+            "scans": self.scans,
+            "scanned_mentions": self.scanned_mentions,
+            "analysis_runs": self.analysis_runs,
+            "analysis_failures": self.analysis_failures,
+            "analyzed_mentions": self.analyzed_mentions,
+            "avg_batch_size": (
+                self.analyzed_mentions / self.analysis_runs if self.analysis_runs else 0
+            ),
+            "last_analysis_at": (
+                self.last_analysis_at.isoformat() if self.last_analysis_at else None
+            ),
+            "last_error": self.last_error
+        }
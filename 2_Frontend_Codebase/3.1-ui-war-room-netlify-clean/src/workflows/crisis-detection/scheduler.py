@@ -0,0 +1,304 @@
+"""
+Multi-Campaign Scheduler - Fair scheduling of many campaigns over one shared workflow
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+from datetime import datetime
+import logging
+
+from .agents.crisis_detection import CrisisMention
+from .workflow import CrisisDetectionWorkflow
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledCampaign:
+    """A campaign context registered with the scheduler"""
+    
+    def __init__(
+        self,
+        campaign_context: Dict[str, Any],
+        priority: float,
+        scan_interval: float,
+        max_concurrency: int
+    ):
+        self.campaign_id: str = campaign_context["campaign_id"]
+        self.campaign_context = campaign_context
+        self.priority = priority
+        self.scan_interval = scan_interval
+        self.max_concurrency = max_concurrency
+        
+        # Queued jobs: None is a scan, a list is a batch of pushed mentions
+        self.pending: Deque[Optional[List[CrisisMention]]] = deque()
+        self.scan_queued = False
+        self.next_scan_at = 0.0
+        self.running = 0
+        
+        # Weighted fair queuing: service received divided by priority
+        self.virtual_time = 0.0
+        
+        # Run statistics
+        self.runs = 0
+        self.failures = 0
+        self.busy_seconds = 0.0
+        self.latencies: Deque[float] = deque(maxlen=100)
+        self.last_error: Optional[str] = None
+        self.last_run_at: Optional[datetime] = None
+        self.last_severity = 0
+    
+    def estimated_cost(self) -> float:
+        """Expected seconds for the next run, from recent runs"""
+        if not self.latencies:
+            return 1.0
+        return sum(self.latencies) / len(self.latencies)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduling and latency statistics for this campaign"""
+        latencies = sorted(self.latencies)
+        
+        return {
+            "priority": self.priority,
+            "scan_interval": self.scan_interval,
+            "max_concurrency": self.max_concurrency,
+            "running": self.running,
+            "pending": len(self.pending),
+            "runs": self.runs,
+            "failures": self.failures,
+            "busy_seconds": self.busy_seconds,
+            "avg_latency_ms": (
+                sum(latencies) / len(latencies) * 1000 if latencies else 0.0
+            ),
+            "p95_latency_ms": (
+                latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1000
+                if latencies else 0.0
+            ),
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_severity": self.last_severity,
+            "last_error": self.last_error
+        }
+
+
+class MultiCampaignScheduler:
+    """
+    Runs many campaign contexts over one shared workflow
+    
+    All campaigns share the workflow's agents, LLM clients, HTTP pool and
+    rate limiters. Free run slots go to the queued campaign with the least
+    priority-weighted service so far (weighted fair queuing), so a busy or
+    slow campaign cannot starve the others, and no campaign exceeds its own
+    concurrency cap.
+    """
+    
+    def __init__(
+        self,
+        workflow: CrisisDetectionWorkflow,
+        max_concurrency: int = 4,
+        default_scan_interval: float = 900,
+        default_campaign_concurrency: int = 1
+    ):
+        """
+        Initialize multi-campaign scheduler
+        
+        Args:
+            workflow: Shared workflow all campaigns run on
+            max_concurrency: Runs in flight across all campaigns
+            default_scan_interval: Seconds between scans of a campaign
+            default_campaign_concurrency: Runs in flight per campaign
+        """
+        self.workflow = workflow
+        self.max_concurrency = max_concurrency
+        self.default_scan_interval = default_scan_interval
+        self.default_campaign_concurrency = default_campaign_concurrency
+        
+        self.campaigns: Dict[str, ScheduledCampaign] = {}
+        self.running = 0
+        
+        self._tasks: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+    
+    def add_campaign(
+        self,
+        campaign_context: Dict[str, Any],
+        priority: float = 1.0,
+        scan_interval: Optional[float] = None,
+        max_concurrency: Optional[int] = None
+    ) -> ScheduledCampaign:
+        """
+        Register a campaign; its first scan is due immediately
+        
+        Args:
+            campaign_context: Campaign context including a campaign_id
+            priority: Relative share of run slots (2.0 gets twice the share of 1.0)
+            scan_interval: Seconds between scans (default: scheduler default)
+            max_concurrency: Runs in flight for this campaign
+        """
+        if not campaign_context.get("campaign_id"):
+            raise ValueError("campaign_context must include a campaign_id")
+        if priority <= 0:
+            raise ValueError("priority must be positive")
+        
+        campaign = ScheduledCampaign(
+            campaign_context=campaign_context,
+            priority=priority,
+            scan_interval=scan_interval or self.default_scan_interval,
+            max_concurrency=max_concurrency or self.default_campaign_concurrency
+        )
+        
+        # Newcomers start level with the least-served campaign so they
+        # neither starve others nor get starved
+        campaign.virtual_time = min(
+            (c.virtual_time for c in self.campaigns.values()),
+            default=0.0
+        )
+        
+        self.campaigns[campaign.campaign_id] = campaign
+        logger.info(f"Scheduled campaign {campaign.campaign_id} (priority {priority})")
+        self._notify()
+        
+        return campaign
+    
+    def remove_campaign(self, campaign_id: str) -> None:
+        """Stop scheduling a campaign; runs in flight are left to finish"""
+        self.campaigns.pop(campaign_id, None)
+    
+    def submit_scan(self, campaign_id: str) -> None:
+        """Queue an immediate scan of a campaign"""
+        campaign = self.campaigns[campaign_id]
+        if not campaign.scan_queued:
+            campaign.scan_queued = True
+            campaign.pending.append(None)
+            self._notify()
+    
+    def submit_mentions(self, campaign_id: str, mentions: List[CrisisMention]) -> None:
+        """Queue pushed mentions for analysis under a campaign's fair share"""
+        if mentions:
+            self.campaigns[campaign_id].pending.append(mentions)
+            self._notify()
+    
+    def _notify(self) -> None:
+        """Wake the scheduling loop"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    async def run_forever(self) -> None:
+        """Schedule scans and dispatch queued runs until stop() is called"""
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        
+        try:
+            while not self._stopping:
+                now = time.monotonic()
+                
+                # Queue scans that are due
+                for campaign in list(self.campaigns.values()):
+                    if now >= campaign.next_scan_at:
+                        campaign.next_scan_at = now + campaign.scan_interval
+                        if not campaign.scan_queued:
+                            campaign.scan_queued = True
+                            campaign.pending.append(None)
+                
+                self._dispatch()
+                
+                next_due = min(
+                    (c.next_scan_at for c in self.campaigns.values()),
+                    default=now + self.default_scan_interval
+                )
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(),
+                        timeout=max(0.0, next_due - time.monotonic())
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+        finally:
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+    
+    async def stop(self) -> None:
+        """Stop scheduling; runs in flight are allowed to finish"""
+        self._stopping = True
+        self._notify()
+    
+    def _dispatch(self) -> None:
+        """Fill free run slots, least-served campaign first"""
+        while self.running < self.max_concurrency:
+            eligible = [
+                c for c in self.campaigns.values()
+                if c.pending and c.running < c.max_concurrency
+            ]
+            if not eligible:
+                return
+            
+            campaign = min(eligible, key=lambda c: c.virtual_time)
+            job = campaign.pending.popleft()
+            
+            # Charge the expected cost up front so one campaign's backlog
+            # cannot take every free slot; corrected when the run ends
+            estimate = campaign.estimated_cost()
+            campaign.virtual_time += estimate / campaign.priority
+            campaign.running += 1
+            self.running += 1
+            
+            task = asyncio.create_task(self._run_job(campaign, job, estimate))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run_job(
+        self,
+        campaign: ScheduledCampaign,
+        job: Optional[List[CrisisMention]],
+        estimate: float
+    ) -> None:
+        """Run one scan or pushed batch for a campaign"""
+        start = time.perf_counter()
+        
+        try:
+            if job is None:
+                result = await self.workflow.run({"campaign_context": campaign.campaign_context})
+            else:
+                result = await self.workflow.process_mentions(job, campaign.campaign_context)
+            
+            campaign.last_severity = result.get("severity", 0)
+        
+        except Exception as e:
+            campaign.failures += 1
+            campaign.last_error = str(e)
+            logger.error(f"Run for campaign {campaign.campaign_id} failed: {e}")
+        
+        finally:
+            duration = time.perf_counter() - start
+            
+            if job is None:
+                campaign.scan_queued = False
+            campaign.runs += 1
+            campaign.busy_seconds += duration
+            campaign.latencies.append(duration)
+            campaign.last_run_at = datetime.now()
+            campaign.virtual_time += (duration - estimate) / campaign.priority
+            
+            campaign.running -= 1
+            self.running -= 1
+            self._notify()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get global and per-campaign scheduling statistics"""
+        total_busy = sum(c.busy_seconds for c in self.campaigns.values())
+        
+        return {
+            "campaigns": len(self.campaigns),
+            "running": self.running,
+            "max_concurrency": self.max_concurrency,
+            "pending": sum(len(c.pending) for c in self.campaigns.values()),
+            "per_campaign": {
+                campaign_id: {
+                    **campaign.get_stats(),
+                    "share": campaign.busy_seconds / total_busy if total_busy else 0.0
+                }
+                for campaign_id, campaign in self.campaigns.items()
+            }
+        }
@@ -0,0 +1,226 @@
+"""
+Crisis Detection Service - Resident daemon that keeps the workflow warm
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from datetime import datetime
+import logging
+
+from .agents.monitoring import MentionlyticsConfig
+from .pipeline import StagedPipeline
+from .tools.webhook_server import WebhookReceiver
+from .workflow import CrisisDetectionWorkflow
+
+logger = logging.getLogger(__name__)
+
+
+class CrisisDetectionService:
+    """
+    Long-running crisis detection service
+    
+    The workflow, its agents, LLM clients, delivery manager and compiled
+    graph are built once and reused for every scheduled scan, so memory,
+    learned patterns, rate limiter state and pooled connections stay warm
+    between runs.
+    """
+    
+    def __init__(
+        self,
+        workflow: CrisisDetectionWorkflow,
+        campaign_context: Optional[Dict] = None,
+        scan_interval: float = 900,
+        webhook_options: Optional[Dict[str, Any]] = None,
+        pipeline_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize crisis detection service
+        
+        Args:
+            workflow: Workflow instance reused for every run
+            campaign_context: Campaign context passed to every run
+            scan_interval: Seconds between the starts of consecutive scans
+            webhook_options: Start a webhook receiver with these options
+                (see WebhookReceiver); no receiver when omitted
+            pipeline_options: Decouple ingestion from analysis with a
+                bounded queue (see StagedPipeline); scans and pushes run
+                the whole graph inline when omitted
+        """
+        self.workflow = workflow
+        self.campaign_context = campaign_context or {}
+        self.scan_interval = scan_interval
+        self.webhook_options = webhook_options
+        
+        self.pipeline: Optional[StagedPipeline] = None
+        if pipeline_options is not None:
+            self.pipeline = StagedPipeline(workflow, **pipeline_options)
+        
+        self.receiver: Optional[WebhookReceiver] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        
+        # Run statistics
+        self.started_at: Optional[datetime] = None
+        self.runs = 0
+        self.failures = 0
+        self.run_latencies: Deque[float] = deque(maxlen=500)
+        self.last_result: Optional[Dict] = None
+        self.last_run_at: Optional[datetime] = None
+    
+    @classmethod
+    def from_credentials(
+        cls,
+        openai_api_key: str,
+        mentionlytics_api_key: str,
+        mentionlytics_api_secret: str,
+        campaign_context: Optional[Dict] = None,
+        scan_interval: float = 900,
+        webhook_secret: Optional[str] = None,
+        webhook_options: Optional[Dict[str, Any]] = None,
+        pipeline_options: Optional[Dict[str, Any]] = None,
+        **workflow_options
+    ) -> "CrisisDetectionService":
+        """Build the workflow once from API credentials and wrap it in a service"""
+        workflow = CrisisDetectionWorkflow(
+            openai_api_key=openai_api_key,
+            mentionlytics_config=MentionlyticsConfig(
+                api_key=mentionlytics_api_key,
+                api_secret=mentionlytics_api_secret,
+                webhook_secret=webhook_secret
+            ),
+            **workflow_options
+        )
+        
+        return cls(
+            workflow=workflow,
+            campaign_context=campaign_context,
+            scan_interval=scan_interval,
+            webhook_options=webhook_options,
+            pipeline_options=pipeline_options
+        )
+    
+    async def start(self) -> None:
+        """Start background components such as the webhook receiver"""
+        self._stop_event = asyncio.Event()
+        self.started_at = datetime.now()
+        
+        if self.pipeline:
+            await self.pipeline.start()
+        
+        if self.webhook_options is not None and self.receiver is None:
+            source = self.pipeline or self.workflow
+            self.receiver = source.create_webhook_receiver(
+                campaign_context=self.campaign_context,
+                **self.webhook_options
+            )
+            await self.receiver.start()
+        
+        # Finish runs interrupted by a previous crash before scanning again
+        resumed = await self.workflow.resume_incomplete()
+        if resumed:
+            logger.info(f"Resumed {len(resumed)} interrupted runs")
+        
+        logger.info(f"Crisis detection service started (scan every {self.scan_interval}s)")
+    
+    async def stop(self) -> None:
+        """Stop scheduling scans and release pooled resources"""
+        if self._stop_event:
+            self._stop_event.set()
+        
+        if self.receiver:
+            await self.receiver.stop()
+            self.receiver = None
+        
+        # Queued mentions are analyzed before pooled connections close
+        if self.pipeline:
+            await self.pipeline.stop()
+        
+        await self.workflow.connection_pool.close()
+        logger.info("Crisis detection service stopped")
+    
+    async def run_once(self) -> Dict:
+        """Run one scan on the warm workflow and record its latency"""
+        start = time.perf_counter()
+        
+        try:
+            if self.pipeline:
+                # Scans only ingest; the analysis workers drain the queue
+                queued = await self.pipeline.ingest_scan(self.campaign_context)
+                result = {"queued_mentions": queued}
+            else:
+                result = await self.workflow.run({"campaign_context": self.campaign_context})
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            self.runs += 1
+            self.run_latencies.append(latency)
+            self.last_run_at = datetime.now()
+        
+        self.last_result = result
+        logger.info(f"Scan #{self.runs} completed in {latency * 1000:.0f}ms")
+        
+        return result
+    
+    async def run_forever(self) -> None:
+        """Run scans on a fixed schedule until stop() is called"""
+        if self._stop_event is None:
+            await self.start()
+        
+        try:
+            while not self._stop_event.is_set():
+                started = time.perf_counter()
+                
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logger.error(f"Scheduled scan failed: {e}")
+                
+                # Keep a fixed cadence regardless of how long the scan took
+                delay = max(0.0, self.scan_interval - (time.perf_counter() - started))
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.stop()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get service health and per-run latency statistics"""
+        latencies = sorted(self.run_latencies)
+        
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+        
+        return {
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "uptime_seconds": (
+                (datetime.now() - self.started_at).total_seconds()
+                if self.started_at else 0
+            ),
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_latency_ms": self.run_latencies[-1] * 1000 if self.run_latencies else 0.0,
+            "avg_latency_ms": (
+                sum(latencies) / len(latencies) * 1000 if latencies else 0.0
+            ),
+            "p50_latency_ms": percentile(0.5),
+            "p95_latency_ms": percentile(0.95),
+            "nodes": self.workflow.tracer.get_stats(),
+            "webhook": self.receiver.get_stats() if self.receiver else None,
+            "pipeline": self.pipeline.get_stats() if self.pipeline else None,
+            "sources": self.workflow.get_source_stats(),
+            "dedup": self.workflow.get_dedup_stats(),
+            "checkpoints": self.workflow.checkpoint_store.get_stats(),
+            "analysis_cache": self.workflow.crisis_agent.analysis_cache.get_stats(),
+            "history": self.workflow.crisis_agent.history.get_stats(),
+            "patterns": self.workflow.crisis_agent.pattern_store.get_stats(),
+            "prompt_packer": self.workflow.crisis_agent.prompt_packer.get_stats(),
+            "llm": self.workflow.llm_gateway.get_stats(),
+            "http_pool": self.workflow.get_pool_stats()
+        }
@@ -0,0 +1,195 @@
+"""
+Shared fixtures for Crisis Detection Workflow tests
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import pytest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = "crisis_detection"
+
+# Persisted state defaults to the working directory; keep test runs out of it
+os.environ.setdefault("CRISIS_DETECTION_STATE_DIR", tempfile.mkdtemp(prefix="crisis-state-"))
+
+
+def _load_package() -> None:
+    """Import the workflow package as crisis_detection, whatever its directory is called"""
+    if PACKAGE_NAME in sys.modules:
+        return
+    
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE_NAME,
+        os.path.join(PACKAGE_DIR, "__init__.py"),
+        submodule_search_locations=[PACKAGE_DIR]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE_NAME] = package
+    spec.loader.exec_module(package)
+    
+    # The directory name is not a valid module name, so pytest imports the
+    # package's __init__.py as a top-level "__init__" module, where its
+    # relative imports fail; hand it the package loaded above instead
+    sys.modules.setdefault("__init__", package)
+
+
+_load_package()
+
+
+def make_mention_data(
+    index: int,
+    content: Optional[str] = None,
+    source: str = "twitter",
+    url: Optional[str] = None,
+    minutes_ago: int = 0
+) -> Dict:
+    """Raw Mentionlytics payload for one mention"""
+    return {
+        "id": f"m{index}",
+        "content": content or f"Sarah Johnson healthcare scandal story {index}",
+        "source": source,
+        "url": url,
+        "author": {"name": f"author{index % 7}", "reach": index * 100},
+        "sentiment": {"score": -0.5},
+        "engagement": {"total": index},
+        "published_at": (datetime.now() - timedelta(minutes=minutes_ago)).isoformat()
+    }
+
+
+def make_pages(count: int, page_size: int) -> List[List[Dict]]:
+    """Split ``count`` mentions into pages, oldest first like the scan requests them"""
+    mentions = [make_mention_data(i, minutes_ago=count - i) for i in range(count)]
+    return [mentions[i:i + page_size] for i in range(0, count, page_size)]
+
+
+@pytest.fixture
+def checkpoint_store(tmp_path):
+    """Fetch checkpoint store in a throwaway database"""
+    from crisis_detection.utils.fetch_checkpoint import FetchCheckpointStore
+    
+    store = FetchCheckpointStore(db_path=str(tmp_path / "fetch_checkpoints.db"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def dedup_store():
+    """In-memory mention de-duplication store"""
+    from crisis_detection.utils.dedup import MentionDedupStore
+    
+    return MentionDedupStore()
+
+
+@pytest.fixture
+def mentionlytics_config():
+    """Mentionlytics configuration with small pages"""
+    from crisis_detection.agents.monitoring import MentionlyticsConfig
+    
+    return MentionlyticsConfig(
+        api_key="test-key",
+        api_secret="test-secret",
+        webhook_secret="webhook-secret",
+        page_size=100
+    )
+
+
+@pytest.fixture
+def mentionlytics_agent(mentionlytics_config, dedup_store, checkpoint_store):
+    """Mentionlytics agent wired to throwaway stores"""
+    from crisis_detection.agents.monitoring import MentionlyticsAgent
+    
+    return MentionlyticsAgent(
+        mentionlytics_config,
+        dedup_store=dedup_store,
+        checkpoint_store=checkpoint_store
+    )
+
+
+def serve_pages(agent, pages: List[List[Dict]], cursors: bool = False) -> List[Dict]:
+    """
+    Replace the agent's API call with canned pages
+    
+    Returns:
+        The parameters of every page request, in order
+    """
+    requests = []
+    
+    async def fetch_page(since, until, keywords=None, cursor=None, page=1):
+        requests.append({"since": since, "until": until, "cursor": cursor, "page": page})
+        index = int(cursor) if cursor else page - 1
+        response = {"mentions": pages[index] if index < len(pages) else []}
+        
+        if cursors:
+            response["next_cursor"] = str(index + 1) if index + 1 < len(pages) else None
+        else:
+            response["has_more"] = index + 1 < len(pages)
+        return response
+    
+    agent._fetch_mentions_page = fetch_page
+    return requests
+
+
+def serve_window(agent, mention_data: List[Dict]) -> List[Dict]:
+    """
+    Replace the agent's API call with a page-numbered, oldest-first view of
+    the canned mentions published within each requested window
+    
+    Returns:
+        The parameters of every page request, in order
+    """
+    requests = []
+    
+    async def fetch_page(since, until, keywords=None, cursor=None, page=1):
+        requests.append({"since": since, "until": until, "cursor": cursor, "page": page})
+        window = sorted(
+            (
+                data for data in mention_data
+                if since <= datetime.fromisoformat(data["published_at"]) <= until
+            ),
+            key=lambda data: data["published_at"]
+        )
+        size = agent.config.page_size
+        return {
+            "mentions": window[(page - 1) * size:page * size],
+            "has_more": page * size < len(window)
+        }
+    
+    agent._fetch_mentions_page = fetch_page
+    return requests
+
+
+@pytest.fixture
+def fake_llm():
+    """Chat model answering every prompt with a canned severe analysis"""
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    
+    return FakeListChatModel(responses=["Severity: 8 campaign_manager comms_director"] * 1000)
+
+
+@pytest.fixture
+def workflow(tmp_path, mentionlytics_config, dedup_store, checkpoint_store, fake_llm, monkeypatch):
+    """Workflow with throwaway stores whose model calls go to the canned chat model"""
+    from crisis_detection.utils.analysis_cache import AnalysisCache
+    from crisis_detection.utils.retrieval_store import RetrievalStore
+    from crisis_detection.utils.run_checkpoint import RunCheckpointStore
+    from crisis_detection.utils.similarity_index import MentionSimilarityIndex
+    from crisis_detection.workflow import CrisisDetectionWorkflow
+    
+    workflow = CrisisDetectionWorkflow(
+        "sk-test",
+        mentionlytics_config,
+        similarity_index=MentionSimilarityIndex(persist=False),
+        checkpoint_store=RunCheckpointStore(db_path=str(tmp_path / "run_checkpoints.db")),
+        analysis_cache=AnalysisCache(db_path=str(tmp_path / "analysis_cache.db")),
+        history_store=RetrievalStore(db_path=str(tmp_path / "analysis_history.db"))
+    )
+    workflow.monitoring_agent.dedup_store = dedup_store
+    workflow.monitoring_agent.checkpoint_store = checkpoint_store
+    monkeypatch.setattr(workflow.llm_gateway, "get_llm", lambda temperature=0.2: fake_llm)
+    
+    return workflow
@@ -0,0 +1,116 @@
+"""
+Tests for reusing crisis analyses across identical and near-identical mention sets
+"""
+
+from datetime import datetime
+
+import pytest
+
+from crisis_detection.agents.crisis_detection import CrisisMention
+from crisis_detection.utils.analysis_cache import AnalysisCache
+
+ANALYSIS = {"severity": 7, "threat_type": "scandal"}
+CONTEXT = {"campaign_id": "campaign-a", "candidate_name": "Sarah Johnson"}
+
+
+def mentions(count: int, prefix: str = "m", offset: int = 0):
+    return [
+        CrisisMention(
+            mention_id=f"{prefix}{i}",
+            content=f"Story {i} about the leaked healthcare memo",
+            source="twitter",
+            author=f"author{i}",
+            sentiment_score=-0.6,
+            published_at=datetime.now()
+        )
+        for i in range(offset, offset + count)
+    ]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = AnalysisCache(db_path=str(tmp_path / "analysis_cache.db"), similarity_threshold=0.8)
+    yield cache
+    cache.close()
+
+
+def test_exact_set_hits_regardless_of_order_and_ids(cache):
+    """Re-fetched copies of the same mentions reuse the analysis"""
+    cache.put(mentions(10), CONTEXT, ANALYSIS)
+    
+    refetched = list(reversed(mentions(10, prefix="copy")))
+    
+    assert cache.get(refetched, CONTEXT) == ANALYSIS
+    assert cache.hits == 1
+
+
+def test_near_identical_set_is_a_near_hit(cache):
+    """A set overlapping a cached one above the threshold reuses its analysis"""
+    cache.put(mentions(10), CONTEXT, ANALYSIS)
+    
+    # 9 shared of 11 distinct: Jaccard 0.82
+    assert cache.get(mentions(9) + mentions(1, offset=50), CONTEXT) == ANALYSIS
+    assert cache.near_hits == 1
+
+
+def test_set_below_threshold_misses(cache):
+    """Too little overlap is a miss"""
+    cache.put(mentions(10), CONTEXT, ANALYSIS)
+    
+    # 7 shared of 13 distinct: Jaccard 0.54
+    assert cache.get(mentions(7) + mentions(3, offset=50), CONTEXT) is None
+    assert cache.misses == 1
+
+
+def test_near_hits_never_cross_campaigns(cache):
+    """Another campaign's analysis is never reused, even for the same mentions"""
+    cache.put(mentions(10), CONTEXT, ANALYSIS)
+    
+    assert cache.get(mentions(10), {**CONTEXT, "campaign_id": "campaign-b"}) is None
+    assert cache.get(mentions(9) + mentions(1, offset=50), {"campaign_id": "campaign-b"}) is None
+
+
+def test_threshold_of_one_disables_near_hits(tmp_path):
+    """Only exact sets hit when near matches are disabled"""
+    cache = AnalysisCache(db_path=str(tmp_path / "exact.db"), similarity_threshold=1.0)
+    cache.put(mentions(10), CONTEXT, ANALYSIS)
+    
+    assert cache.get(mentions(9) + mentions(1, offset=50), CONTEXT) is None
+    assert cache.get(mentions(10), CONTEXT) == ANALYSIS
+
+
+def test_entries_persist_and_expire(tmp_path):
+    """Cached analyses survive a restart until their TTL runs out"""
+    path = str(tmp_path / "persisted.db")
+    AnalysisCache(db_path=path).put(mentions(5), CONTEXT, ANALYSIS)
+    
+    assert AnalysisCache(db_path=path).get(mentions(5), CONTEXT) == ANALYSIS
+    
+    expired = AnalysisCache(db_path=path, ttl_seconds=-1)
+    assert expired.get(mentions(5), CONTEXT) is None
+
+
+def test_mention_gaining_traction_is_reanalyzed(cache):
+    """A re-delivered mention whose reach jumped never reuses the stale analysis"""
+    cache.put(mentions(10), CONTEXT, ANALYSIS)
+    
+    viral = mentions(10)
+    viral[0].reach_count = 1_000_000
+    viral[0].engagement_count = 50_000
+    viral[0].is_update = True
+    
+    assert cache.get(viral, CONTEXT) is None
+    assert cache.near_hits == 0
+
+
+def test_small_metric_changes_still_hit(cache):
+    """Updates within the same traction bucket reuse the analysis"""
+    cached = mentions(10)
+    cached[0].reach_count = 1000
+    cache.put(cached, CONTEXT, ANALYSIS)
+    
+    updated = mentions(10)
+    updated[0].reach_count = 1200
+    updated[0].is_update = True
+    
+    assert cache.get(updated, CONTEXT) == ANALYSIS
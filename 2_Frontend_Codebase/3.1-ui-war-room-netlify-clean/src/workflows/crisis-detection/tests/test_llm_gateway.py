@@ -0,0 +1,73 @@
+"""
+Tests for the shared LLM gateway
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+from crisis_detection.utils.llm_gateway import LLMGateway
+
+PROMPT = ChatPromptTemplate.from_messages([("human", "Assess: {mention}")])
+
+
+class SlowModel:
+    """Chat model stand-in that counts calls and answers after a delay"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def ainvoke(self, messages):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return AIMessage(content=f"reply to {messages[-1].content}")
+
+
+@pytest.fixture
+def model():
+    return SlowModel()
+
+
+@pytest.fixture
+def gateway(model, monkeypatch):
+    """Gateway whose clients are all the slow stand-in model"""
+    gateway = LLMGateway("sk-test")
+    monkeypatch.setattr(gateway, "get_llm", lambda temperature=0.2: model)
+    return gateway
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_model_call(gateway, model):
+    """Identical prompts in flight at once are sent once"""
+    replies = await asyncio.gather(*(
+        gateway.invoke(PROMPT, {"mention": "leaked memo"}, caller=f"agent-{i}")
+        for i in range(5)
+    ))
+    
+    assert model.calls == 1
+    assert {reply.content for reply in replies} == {"reply to Assess: leaked memo"}
+    assert sum(gateway.get_stats()["callers"][f"agent-{i}"]["coalesced"] for i in range(5)) == 4
+
+
+@pytest.mark.asyncio
+async def test_different_prompts_are_not_coalesced(gateway, model):
+    """Only identical prompts and settings share a call"""
+    await asyncio.gather(
+        gateway.invoke(PROMPT, {"mention": "leaked memo"}, caller="a"),
+        gateway.invoke(PROMPT, {"mention": "debate gaffe"}, caller="a"),
+        gateway.invoke(PROMPT, {"mention": "leaked memo"}, caller="a", temperature=0.7)
+    )
+    
+    assert model.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_finished_calls_are_not_reused(gateway, model):
+    """Coalescing only covers calls in flight, not earlier replies"""
+    await gateway.invoke(PROMPT, {"mention": "leaked memo"}, caller="a")
+    await gateway.invoke(PROMPT, {"mention": "leaked memo"}, caller="a")
+    
+    assert model.calls == 2
+    assert gateway.get_stats()["inflight_prompts"] == 0
@@ -0,0 +1,111 @@
+"""
+Tests for Mentionlytics pagination and fetch checkpoints
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from .conftest import make_mention_data, make_pages, serve_pages, serve_window
+
+
+@pytest.mark.asyncio
+async def test_scan_drains_every_page(mentionlytics_agent):
+    """A spike larger than one page is fetched completely"""
+    requests = serve_pages(mentionlytics_agent, make_pages(250, 100))
+    
+    mentions = await mentionlytics_agent.scan("campaign-a")
+    
+    assert len(mentions) == 250
+    assert [r["page"] for r in requests] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_scan_follows_cursors(mentionlytics_agent):
+    """Cursor pagination is preferred over page numbers"""
+    requests = serve_pages(mentionlytics_agent, make_pages(250, 100), cursors=True)
+    
+    mentions = await mentionlytics_agent.scan("campaign-a")
+    
+    assert len(mentions) == 250
+    assert [r["cursor"] for r in requests] == [None, "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_scan_stream_yields_page_chunks(mentionlytics_agent):
+    """Mentions are streamed a page at a time"""
+    serve_pages(mentionlytics_agent, make_pages(250, 100))
+    
+    chunks = [chunk async for chunk in mentionlytics_agent.scan_stream("campaign-a")]
+    
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+
+
+@pytest.mark.asyncio
+async def test_drained_scan_advances_checkpoint(mentionlytics_agent, checkpoint_store):
+    """The next scan starts where a fully drained one ended"""
+    requests = serve_pages(mentionlytics_agent, make_pages(150, 100))
+    before = datetime.now()
+    
+    await mentionlytics_agent.scan("campaign-a")
+    
+    checkpoint = checkpoint_store.get("mentionlytics", "campaign-a")
+    assert checkpoint is not None and checkpoint >= before
+    assert mentionlytics_agent.get_last_fetch_time("campaign-a") == checkpoint
+    
+    await mentionlytics_agent.scan("campaign-a")
+    assert requests[-1]["since"] == checkpoint
+
+
+@pytest.mark.asyncio
+async def test_first_scan_uses_initial_lookback(mentionlytics_agent):
+    """A campaign without a checkpoint looks back the configured window"""
+    requests = serve_pages(mentionlytics_agent, [])
+    
+    await mentionlytics_agent.scan("campaign-a")
+    
+    lookback = timedelta(hours=mentionlytics_agent.config.initial_lookback_hours)
+    assert abs(requests[0]["until"] - requests[0]["since"] - lookback) < timedelta(seconds=5)
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_are_per_campaign(mentionlytics_agent, checkpoint_store):
+    """Scanning one campaign leaves the others' checkpoints alone"""
+    serve_pages(mentionlytics_agent, make_pages(10, 100))
+    
+    await mentionlytics_agent.scan("campaign-a")
+    
+    assert checkpoint_store.get("mentionlytics", "campaign-a") is not None
+    assert checkpoint_store.get("mentionlytics", "campaign-b") is None
+
+
+@pytest.mark.asyncio
+async def test_window_over_the_cap_drains_across_scans(
+    mentionlytics_config, dedup_store, checkpoint_store
+):
+    """Each capped scan resumes after the newest mention the previous one read"""
+    from crisis_detection.agents.monitoring import MentionlyticsAgent
+    
+    mentionlytics_config.max_pages = 2
+    mentionlytics_config.initial_lookback_hours = 12
+    agent = MentionlyticsAgent(
+        mentionlytics_config,
+        dedup_store=dedup_store,
+        checkpoint_store=checkpoint_store
+    )
+    backlog = [make_mention_data(i, minutes_ago=450 - i) for i in range(450)]
+    requests = serve_window(agent, backlog)
+    
+    scanned = []
+    for _ in range(3):
+        before = len(requests)
+        scanned.append({m.mention_id for m in await agent.scan("campaign-a")})
+        assert len(requests) - before <= mentionlytics_config.max_pages
+    
+    assert [len(ids) for ids in scanned] == [200, 199, 51]
+    assert set().union(*scanned) == {data["id"] for data in backlog}
+    
+    # Each scan started where the previous one stopped reading
+    assert requests[2]["since"] == datetime.fromisoformat(backlog[199]["published_at"])
+    assert requests[4]["since"] == datetime.fromisoformat(backlog[398]["published_at"])
+    assert checkpoint_store.get("mentionlytics", "campaign-a") >= requests[-1]["until"]
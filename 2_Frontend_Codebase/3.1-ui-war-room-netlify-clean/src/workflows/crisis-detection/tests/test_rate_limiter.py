@@ -0,0 +1,39 @@
+"""
+Tests for the token bucket rate limiter
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from crisis_detection.utils.rate_limiter import RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_concurrent_acquires_all_make_progress():
+    """Callers waiting for tokens do not hold the lock, so all of them get through"""
+    limiter = RateLimiter(max_requests=5, time_window=0.25)
+    
+    results = await asyncio.wait_for(
+        asyncio.gather(*(limiter.acquire() for _ in range(20))),
+        timeout=5
+    )
+    
+    assert results == [True] * 20
+
+
+@pytest.mark.asyncio
+async def test_waiting_caller_does_not_block_others():
+    """A caller sleeping for a large request leaves the lock to small ones"""
+    limiter = RateLimiter(max_requests=10, time_window=1)
+    limiter.tokens = 1
+    
+    large = asyncio.create_task(limiter.acquire(10))
+    await asyncio.sleep(0)
+    
+    start = time.monotonic()
+    assert await asyncio.wait_for(limiter.acquire(1), timeout=0.5) is True
+    assert time.monotonic() - start < 0.5
+    
+    large.cancel()
@@ -0,0 +1,114 @@
+"""
+Tests for the mention similarity index
+"""
+
+from datetime import datetime
+
+from crisis_detection.agents.crisis_detection import CrisisMention
+from crisis_detection.utils.similarity_index import MentionSimilarityIndex
+
+
+def mention(mention_id: str, content: str) -> CrisisMention:
+    return CrisisMention(
+        mention_id=mention_id,
+        content=content,
+        source="twitter",
+        sentiment_score=-0.5,
+        published_at=datetime.now()
+    )
+
+
+STORY = "Sarah Johnson healthcare plan leaked memo shows cuts"
+
+
+def test_queries_only_match_their_namespace():
+    """One campaign's past mentions never show up for another"""
+    index = MentionSimilarityIndex(persist=False)
+    index.add([mention("a1", STORY)], namespace="campaign-a")
+    
+    query = [mention("q1", STORY)]
+    
+    assert [m["mention_id"] for m in index.query(query, namespace="campaign-a")[0]] == ["a1"]
+    assert index.query(query, namespace="campaign-b") == [[]]
+
+
+def test_same_mention_is_indexed_once_per_namespace():
+    """A mention seen by two campaigns is indexed for each of them"""
+    index = MentionSimilarityIndex(persist=False)
+    
+    assert index.add([mention("m1", STORY)], namespace="campaign-a") == 1
+    assert index.add([mention("m1", STORY)], namespace="campaign-a") == 0
+    assert index.add([mention("m1", STORY)], namespace="campaign-b") == 1
+
+
+def test_oldest_mentions_are_evicted_at_capacity():
+    """The index never holds more than max_mentions rows"""
+    index = MentionSimilarityIndex(persist=False, initial_capacity=4, max_mentions=10)
+    
+    for batch in range(5):
+        index.add([
+            mention(f"m{batch}-{i}", f"story {batch} {i} {STORY}") for i in range(4)
+        ])
+    
+    assert len(index) == 10
+    assert index.get_stats()["capacity"] == 10
+    assert index.evictions == 10
+    
+    matches = index.query([mention("q", STORY)], top_k=20, min_similarity=0.0)[0]
+    assert {m["mention_id"] for m in matches} == {"m2-2", "m2-3"} | {
+        f"m{batch}-{i}" for batch in (3, 4) for i in range(4)
+    }
+
+
+def test_persisted_index_reloads_after_eviction(tmp_path):
+    """A reopened index keeps the live rows, their namespaces and eviction order"""
+    path = str(tmp_path / "mention_index")
+    index = MentionSimilarityIndex(path=path, initial_capacity=2, max_mentions=4)
+    index.add(
+        [mention(f"m{i}", f"story {i} {STORY}") for i in range(6)],
+        namespace="campaign-a"
+    )
+    index.add([mention("b1", STORY)], namespace="campaign-b")
+    
+    reopened = MentionSimilarityIndex(path=path, initial_capacity=2, max_mentions=4)
+    
+    query = [mention("q", STORY)]
+    
+    assert len(reopened) == 4
+    assert [m["mention_id"] for m in reopened.query(query, namespace="campaign-b")[0]] == ["b1"]
+    
+    # The next mention overwrites the oldest live row (m3)
+    reopened.add([mention("m9", STORY)], namespace="campaign-a")
+    live = reopened.query(query, top_k=10, min_similarity=0.0, namespace="campaign-a")[0]
+    assert {m["mention_id"] for m in live} == {"m4", "m5", "m9"}
+
+
+def test_namespace_query_is_not_crowded_out_by_other_namespaces():
+    """Closer matches from other campaigns never take a namespace's top-k slots"""
+    index = MentionSimilarityIndex(persist=False)
+    index.add([mention(f"b{i}", STORY) for i in range(10)], namespace="campaign-b")
+    index.add([mention("a1", f"{STORY} in the press")], namespace="campaign-a")
+    
+    matches = index.query([mention("q", STORY)], top_k=1, namespace="campaign-a")[0]
+    
+    assert [m["mention_id"] for m in matches] == ["a1"]
+
+
+def test_row_overwritten_while_scoring_is_not_reported(monkeypatch):
+    """A match whose row an add overwrote mid-query is dropped, not mislabelled"""
+    from crisis_detection.utils import similarity_index
+    
+    index = MentionSimilarityIndex(persist=False, initial_capacity=1, max_mentions=1)
+    index.add([mention("old", STORY)])
+    vectorize = similarity_index.hash_vectorize
+    
+    def vectorize_during_add(texts, n_features=512):
+        # Another run indexes a mention between the snapshot and the scoring
+        monkeypatch.setattr(similarity_index, "hash_vectorize", vectorize)
+        index.add([mention("new", STORY)])
+        return vectorize(texts, n_features)
+    
+    monkeypatch.setattr(similarity_index, "hash_vectorize", vectorize_during_add)
+    
+    assert index.query([mention("q", STORY)]) == [[]]
+    assert [m["mention_id"] for m in index.query([mention("q", STORY)])[0]] == ["new"]
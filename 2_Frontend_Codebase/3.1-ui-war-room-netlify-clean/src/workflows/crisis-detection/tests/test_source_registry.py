@@ -0,0 +1,81 @@
+"""
+Tests for merging mentions across monitoring sources
+"""
+
+from datetime import datetime
+from typing import List
+
+import pytest
+
+from crisis_detection.agents.crisis_detection import CrisisMention
+from crisis_detection.agents.source_registry import SourceRegistry
+
+
+class StaticSource:
+    """Monitoring agent returning a fixed list of mentions"""
+    
+    def __init__(self, mentions: List[CrisisMention]):
+        self.mentions = mentions
+    
+    async def scan(self, campaign_id: str = "default") -> List[CrisisMention]:
+        return list(self.mentions)
+
+
+def mention(mention_id: str, content: str, url=None, source: str = "twitter") -> CrisisMention:
+    return CrisisMention(
+        mention_id=mention_id,
+        content=content,
+        source=source,
+        url=url,
+        sentiment_score=-0.5,
+        published_at=datetime.now()
+    )
+
+
+@pytest.mark.asyncio
+async def test_copies_within_one_source_are_kept():
+    """Retweets of the same text are separate mentions and all count"""
+    registry = SourceRegistry()
+    registry.register("mentionlytics", StaticSource(
+        [mention(f"rt{i}", "Sarah Johnson lied about healthcare") for i in range(250)]
+    ))
+    
+    mentions = await registry.scan_all("campaign-a")
+    
+    assert len(mentions) == 250
+    assert registry.cross_source_duplicates == 0
+
+
+@pytest.mark.asyncio
+async def test_repeated_ids_within_one_source_are_dropped():
+    """The same mention ID reported twice by a source is kept once"""
+    registry = SourceRegistry()
+    registry.register("mentionlytics", StaticSource(
+        [mention("m1", "first post"), mention("m1", "first post"), mention("m2", "first post")]
+    ))
+    
+    mentions = await registry.scan_all("campaign-a")
+    
+    assert [m.mention_id for m in mentions] == ["m1", "m2"]
+    assert registry.cross_source_duplicates == 0
+
+
+@pytest.mark.asyncio
+async def test_same_mention_from_two_sources_is_merged():
+    """A story reported by two sources is analyzed once, by URL or by content"""
+    registry = SourceRegistry()
+    registry.register("mentionlytics", StaticSource([
+        mention("a1", "Campaign bus crash", url="https://news.example.com/story/"),
+        mention("a2", "Sarah Johnson  lied about healthcare")
+    ]))
+    registry.register("newswhip", StaticSource([
+        mention("b1", "Different headline", url="https://NEWS.example.com/story#top"),
+        mention("b2", "sarah johnson lied about healthcare"),
+        mention("b3", "Unrelated story")
+    ]))
+    
+    mentions = await registry.scan_all("campaign-a")
+    
+    assert len(mentions) == 3
+    assert registry.cross_source_duplicates == 2
+    assert "b3" in {m.mention_id for m in mentions}
@@ -0,0 +1,101 @@
+"""
+Tests for the bounded stage queue between ingestion and analysis
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from crisis_detection.agents.crisis_detection import CrisisMention
+from crisis_detection.utils.stage_queue import MentionStageQueue
+
+
+def make_batch(prefix: str, reaches):
+    return [
+        CrisisMention(
+            mention_id=f"{prefix}{i}",
+            content=f"mention {prefix}{i} about the healthcare vote",
+            source="twitter",
+            sentiment_score=-0.4,
+            reach_count=reach,
+            engagement_count=i,
+            published_at=datetime.now(),
+            keywords=["healthcare", "vote"]
+        )
+        for i, reach in enumerate(reaches)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_low_reach_mentions_are_dropped_under_load():
+    """Past the shed threshold only mentions reaching min_reach are queued"""
+    queue = MentionStageQueue(max_mentions=10, shed_threshold=0.5, min_reach=1000)
+    
+    assert await queue.put(make_batch("a", [10] * 4)) == 4
+    assert await queue.put(make_batch("b", [10, 5000, 20, 8000])) == 2
+    
+    assert len(queue) == 6
+    assert queue.dropped_mentions == 2
+
+
+@pytest.mark.asyncio
+async def test_summarize_policy_folds_low_reach_mentions_into_a_digest():
+    """Shed mentions survive as one digest carrying their combined reach"""
+    queue = MentionStageQueue(
+        max_mentions=10, policy="summarize", shed_threshold=0.5, min_reach=1000
+    )
+    await queue.put(make_batch("a", [10] * 4))
+    
+    assert await queue.put(make_batch("b", [100, 5000, 200, 300])) == 2
+    
+    await queue.get()
+    batch = await queue.get()
+    digest = batch.mentions[-1]
+    assert digest.source == "digest"
+    assert digest.reach_count == 600
+    assert queue.summarized_mentions == 3
+
+
+@pytest.mark.asyncio
+async def test_block_policy_never_sheds_and_waits_for_space():
+    """Without shedding, a producer waits until a consumer frees space"""
+    queue = MentionStageQueue(max_mentions=5, policy="block")
+    await queue.put(make_batch("a", [10] * 4))
+    
+    producer = asyncio.create_task(queue.put(make_batch("b", [10] * 3)))
+    await asyncio.sleep(0.01)
+    assert not producer.done()
+    
+    await queue.get()
+    assert await producer == 3
+    assert queue.dropped_mentions == 0
+    assert queue.producer_waits == 1
+
+
+@pytest.mark.asyncio
+async def test_batches_of_one_campaign_are_coalesced():
+    """A consumer takes consecutive batches of the same campaign together"""
+    queue = MentionStageQueue(max_mentions=100, policy="block")
+    await queue.put(make_batch("a", [10] * 3), {"campaign_id": "c1"})
+    await queue.put(make_batch("b", [10] * 3), {"campaign_id": "c1"})
+    await queue.put(make_batch("c", [10] * 3), {"campaign_id": "c2"})
+    
+    first = await queue.get(max_mentions=50)
+    second = await queue.get(max_mentions=50)
+    
+    assert len(first.mentions) == 6
+    assert second.campaign_context == {"campaign_id": "c2"}
+
+
+@pytest.mark.asyncio
+async def test_closed_queue_drains_then_ends():
+    """Consumers finish queued batches after close, then get None"""
+    queue = MentionStageQueue(max_mentions=10)
+    await queue.put(make_batch("a", [10] * 2))
+    await queue.close()
+    
+    assert len((await queue.get()).mentions) == 2
+    assert await queue.get() is None
+    with pytest.raises(RuntimeError):
+        await queue.put(make_batch("b", [10]))
@@ -0,0 +1,130 @@
+"""
+Tests for webhook micro-batching, backpressure and redelivery handling
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from crisis_detection.agents.monitoring import MentionlyticsAgent
+from crisis_detection.tools.webhook_server import MentionBatcher, WebhookReceiver
+from crisis_detection.utils.dedup import MentionDedupStore
+
+from .conftest import make_mention_data, serve_pages
+
+
+def make_mentions(agent, count):
+    """Parsed mentions for batching tests"""
+    return [agent._parse_mention(make_mention_data(i)) for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_batcher_flushes_full_batches(mentionlytics_agent):
+    """Full batches go out immediately, the remainder after the wait window"""
+    batches = []
+    
+    async def record(batch):
+        batches.append(len(batch))
+    
+    batcher = MentionBatcher(record, max_batch_size=10, max_wait_seconds=0.01)
+    await batcher.add(make_mentions(mentionlytics_agent, 25))
+    await asyncio.sleep(0.05)
+    await batcher.flush()
+    
+    assert batches == [10, 10, 5]
+
+
+@pytest.mark.asyncio
+async def test_batcher_bounds_inflight_batches_within_one_push(mentionlytics_agent):
+    """A single large push never has more than max_inflight batches running"""
+    running = 0
+    peak = 0
+    release = asyncio.Event()
+    
+    async def slow(batch):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await release.wait()
+        running -= 1
+    
+    batcher = MentionBatcher(slow, max_batch_size=10, max_wait_seconds=60, max_inflight=2)
+    push = asyncio.create_task(batcher.add(make_mentions(mentionlytics_agent, 100)))
+    await asyncio.sleep(0.01)
+    
+    assert not push.done()
+    assert len(batcher._inflight) == 2
+    
+    release.set()
+    await push
+    await batcher.flush()
+    
+    assert peak <= 2
+    assert batcher.mentions_flushed == 100
+    assert batcher.throttled > 0
+
+
+async def push(client, receiver, mention_data):
+    """Post a signed webhook push and return the accepted mention count"""
+    payload = json.dumps({"events": [{"data": data} for data in mention_data]}).encode()
+    signature = hmac.new(
+        receiver.monitoring_agent.config.webhook_secret.encode(),
+        payload,
+        hashlib.sha256
+    ).hexdigest()
+    
+    response = await client.post(
+        receiver.path,
+        data=payload,
+        headers={receiver.signature_header: signature}
+    )
+    assert response.status == 202
+    return (await response.json())["mentions"]
+
+
+@pytest.mark.asyncio
+async def test_redeliveries_are_dropped_across_restarts(
+    tmp_path, mentionlytics_config, checkpoint_store
+):
+    """A push-only receiver saves its seen IDs, so a restart still drops redeliveries"""
+    bloom_path = str(tmp_path / "seen.bloom")
+    
+    async def ignore(batch):
+        return None
+    
+    for expected in (1, 0):
+        agent = MentionlyticsAgent(
+            mentionlytics_config,
+            dedup_store=MentionDedupStore(bloom_path=bloom_path, bloom_capacity=1000),
+            checkpoint_store=checkpoint_store
+        )
+        receiver = WebhookReceiver(agent, ignore, max_wait_seconds=0.01)
+        
+        async with TestClient(TestServer(receiver.create_app())) as client:
+            assert await push(client, receiver, [make_mention_data(1)]) == expected
+        
+        await receiver.stop()
+
+
+@pytest.mark.asyncio
+async def test_pushed_mentions_are_not_rescanned(workflow):
+    """A mention pushed for a campaign is dropped when that campaign's scan returns it"""
+    receiver = workflow.create_webhook_receiver(
+        {"campaign_id": "campaign-a"},
+        max_wait_seconds=60
+    )
+    receiver.batcher.flush_callback = lambda batch: asyncio.sleep(0)
+    pushed = make_mention_data(1)
+    
+    async with TestClient(TestServer(receiver.create_app())) as client:
+        assert await push(client, receiver, [pushed]) == 1
+    
+    serve_pages(workflow.monitoring_agent, [[pushed, make_mention_data(2)]])
+    scanned = await workflow.monitoring_agent.scan("campaign-a")
+    
+    assert [m.mention_id for m in scanned] == ["m2"]
+    await receiver.stop()
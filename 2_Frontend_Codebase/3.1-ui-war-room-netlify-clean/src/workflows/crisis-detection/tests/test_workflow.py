@@ -0,0 +1,86 @@
+"""
+Tests for the crisis detection workflow graph
+"""
+
+import pytest
+
+from crisis_detection.utils.state import WorkflowState
+
+from .conftest import make_mention_data
+
+
+def triage_result(score):
+    """Triage output with only a score"""
+    async def triage(batch, campaign_id="default"):
+        return {
+            "score": score,
+            "sentiment": {},
+            "velocity": {},
+            "influencers": [],
+            "has_verified_accounts": False
+        }
+    return triage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("score,llm_required,threat_type", [
+    (2, False, "no_crisis_detected"),
+    (5, True, None),
+    (9, False, "deterministic_escalation"),
+    (10, False, "deterministic_escalation")
+])
+async def test_triage_band_routes_scores(workflow, monkeypatch, score, llm_required, threat_type):
+    """Low scores skip the LLM, mid scores need it, top scores escalate directly"""
+    monkeypatch.setattr(workflow.crisis_agent, "triage_mentions", triage_result(score))
+    mentions = [workflow.monitoring_agent._parse_mention(make_mention_data(i)) for i in range(5)]
+    state = WorkflowState(mentions=mentions, campaign_context={"campaign_id": "triage"})
+    
+    state = await workflow.triage_mentions(state)
+    
+    assert state.triage["llm_required"] is llm_required
+    if threat_type:
+        assert state.analysis.threat_type == threat_type
+    else:
+        assert state.analysis is None
+
+
+class WorkerKilled(BaseException):
+    """Process death mid-node, which no error handler catches"""
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_without_repeating_work(workflow, monkeypatch):
+    """A resumed run reuses checkpointed nodes and never re-alerts delivered recipients"""
+    triage_calls = []
+    sent = []
+    crashes = [WorkerKilled()]
+    
+    async def triage(batch, campaign_id="default"):
+        triage_calls.append(len(batch))
+        return await triage_result(9)(batch, campaign_id)
+    
+    async def deliver(route, crisis_analysis):
+        # The worker dies after the first recipient was alerted
+        if sent and crashes:
+            raise crashes.pop()
+        sent.append(route.recipient.id)
+        return {"route_id": route.recipient.id, "success": True}
+    
+    monkeypatch.setattr(workflow.crisis_agent, "triage_mentions", triage)
+    monkeypatch.setattr(workflow.delivery_manager, "deliver_multi_channel", deliver)
+    mentions = [workflow.monitoring_agent._parse_mention(make_mention_data(i)) for i in range(5)]
+    
+    with pytest.raises(WorkerKilled):
+        await workflow.process_mentions(mentions, {"campaign_id": "resume"})
+    
+    incomplete = workflow.checkpoint_store.get_incomplete_runs()
+    assert len(incomplete) == 1 and incomplete[0]["kind"] == "push"
+    assert len(sent) == 1 and triage_calls == [5]
+    
+    results = await workflow.resume_incomplete()
+    
+    assert len(results) == 1
+    assert results[0]["alerts_sent"] == len(sent) > 1
+    assert len(set(sent)) == len(sent)
+    assert triage_calls == [5]
+    assert workflow.checkpoint_store.get_incomplete_runs() == []
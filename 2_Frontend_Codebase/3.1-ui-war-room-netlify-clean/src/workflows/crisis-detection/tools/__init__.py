@@ -3,7 +3,10 @@ Crisis Detection Tools
 """
 
 from .delivery import DeliveryManager
+from .webhook_server import WebhookReceiver, MentionBatcher
 
 __all__ = [
-    "DeliveryManager"
+    "DeliveryManager",
+    "WebhookReceiver",
+    "MentionBatcher"
 ]
\ No newline at end of file
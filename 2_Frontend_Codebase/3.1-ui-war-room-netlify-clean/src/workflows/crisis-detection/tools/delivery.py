@@ -12,6 +12,7 @@ import json
 from ..agents.alert_routing import AlertRoute, AlertPriority
 from ..agents.crisis_detection import CrisisAnalysis
 from ..utils.rate_limiter import MultiServiceRateLimiter, create_default_rate_limiter
+from ..utils.http_pool import ConnectionPoolManager, get_connection_pool
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +20,18 @@ logger = logging.getLogger(__name__)
 class DeliveryChannel:
     """Base class for delivery channels"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        connection_pool: Optional[ConnectionPoolManager] = None
+    ):
         self.config = config
         self.enabled = config.get("enabled", True)
+        self.connection_pool = connection_pool or get_connection_pool()
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Borrow the pooled HTTP session for provider API calls"""
+        return await self.connection_pool.get_session()
     
     async def send(self, message: str, recipient: Dict, metadata: Dict = None) -> Dict:
         """Send message through this channel"""
@@ -177,17 +187,23 @@ class PushNotificationChannel(DeliveryChannel):
 class DeliveryManager:
     """Manages multi-channel alert delivery with retry and fallback"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        connection_pool: Optional[ConnectionPoolManager] = None
+    ):
         self.config = config
         self.rate_limiter = create_default_rate_limiter()
+        self.connection_pool = connection_pool or get_connection_pool()
         
-        # Initialize channels
+        # Initialize channels (all channels share one HTTP connection pool)
+        pool = self.connection_pool
         self.channels = {
-            "email": EmailChannel(config.get("email", {})),
-            "sms": SMSChannel(config.get("sms", {})),
-            "slack": SlackChannel(config.get("slack", {})),
-            "phone_call": PhoneCallChannel(config.get("phone_call", {})),
-            "push": PushNotificationChannel(config.get("push", {}))
+            "email": EmailChannel(config.get("email", {}), pool),
+            "sms": SMSChannel(config.get("sms", {}), pool),
+            "slack": SlackChannel(config.get("slack", {}), pool),
+            "phone_call": PhoneCallChannel(config.get("phone_call", {}), pool),
+            "push": PushNotificationChannel(config.get("push", {}), pool)
         }
         
         # Delivery tracking
@@ -0,0 +1,313 @@
+"""
+Webhook Receiver - Push ingestion of Mentionlytics events with micro-batching
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from datetime import datetime
+import logging
+
+from aiohttp import web
+
+from ..agents.crisis_detection import CrisisMention
+from ..agents.monitoring import MentionlyticsAgent
+
+logger = logging.getLogger(__name__)
+
+
+class MentionBatcher:
+    """
+    Collects pushed mentions and flushes them by count or elapsed time
+    """
+    
+    def __init__(
+        self,
+        flush_callback: Callable[[List[CrisisMention]], Awaitable[Any]],
+        max_batch_size: int = 50,
+        max_wait_seconds: float = 2.0,
+        max_inflight: Optional[int] = None
+    ):
+        """
+        Initialize mention batcher
+        
+        Args:
+            flush_callback: Coroutine called with each completed batch
+            max_batch_size: Flush as soon as this many mentions are buffered
+            max_wait_seconds: Flush a partial batch after this many seconds
+            max_inflight: Make add() wait while this many batches are still
+                being processed; unbounded when omitted
+        """
+        self.flush_callback = flush_callback
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.max_inflight = max_inflight
+        
+        self._buffer: List[CrisisMention] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+        
+        # Batch statistics
+        self.batches_flushed = 0
+        self.mentions_flushed = 0
+        self.throttled = 0
+    
+    async def add(self, mentions: List[CrisisMention]) -> None:
+        """Add mentions to the current batch"""
+        # Backpressure: hold the pusher while downstream is saturated
+        await self._wait_for_capacity()
+        
+        for mention in mentions:
+            self._buffer.append(mention)
+            
+            if len(self._buffer) >= self.max_batch_size:
+                # A large push fills several batches; each one waits its turn
+                await self._wait_for_capacity()
+                self._dispatch()
+        
+        # Start the wait timer when a partial batch is pending
+        if self._buffer and self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_wait())
+    
+    async def _wait_for_capacity(self) -> None:
+        """Wait until fewer than max_inflight batches are being processed"""
+        if not self.max_inflight or len(self._inflight) < self.max_inflight:
+            return
+        
+        self.throttled += 1
+        while len(self._inflight) >= self.max_inflight:
+            await asyncio.wait(self._inflight, return_when=asyncio.FIRST_COMPLETED)
+    
+    async def _flush_after_wait(self) -> None:
+        """Flush the pending partial batch once the wait window closes"""
+        await asyncio.sleep(self.max_wait_seconds)
+        await self._wait_for_capacity()
+        self._timer = None
+        self._dispatch()
+    
+    def _dispatch(self) -> None:
+        """Hand the buffered mentions to the flush callback"""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        
+        if not self._buffer:
+            return
+        
+        batch = self._buffer
+        self._buffer = []
+        
+        self.batches_flushed += 1
+        self.mentions_flushed += len(batch)
+        
+        # Run the callback in the background so the HTTP handler never waits
+        # on analysis
+        task = asyncio.create_task(self._run_callback(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+    
+    async def _run_callback(self, batch: List[CrisisMention]) -> None:
+        """Run the flush callback for a batch and log failures"""
+        try:
+            await self.flush_callback(batch)
+        except Exception as e:
+            logger.error(f"Error processing webhook batch of {len(batch)} mentions: {e}")
+    
+    async def flush(self) -> None:
+        """Flush any pending mentions and wait for in-flight batches"""
+        self._dispatch()
+        
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics"""
+        return {
+            "pending_mentions": len(self._buffer),
+            "inflight_batches": len(self._inflight),
+            "batches_flushed": self.batches_flushed,
+            "mentions_flushed": self.mentions_flushed,
+            "throttled": self.throttled,
+            "avg_batch_size": (
+                self.mentions_flushed / self.batches_flushed
+                if self.batches_flushed else 0
+            )
+        }
+
+
+class WebhookReceiver:
+    """
+    Asyncio HTTP receiver for Mentionlytics webhook pushes
+    
+    Verifies each request signature, parses the pushed mentions and
+    micro-batches them straight into the workflow's analyze stage.
+    """
+    
+    def __init__(
+        self,
+        monitoring_agent: MentionlyticsAgent,
+        process_batch: Callable[[List[CrisisMention]], Awaitable[Any]],
+        campaign_id: str = "default",
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        path: str = "/webhooks/mentionlytics",
+        signature_header: str = "X-Mentionlytics-Signature",
+        max_batch_size: int = 50,
+        max_wait_seconds: float = 2.0,
+        max_inflight_batches: Optional[int] = None,
+        dedup_save_interval: float = 60.0
+    ):
+        """
+        Initialize webhook receiver
+        
+        Args:
+            monitoring_agent: Agent used to verify signatures and parse mentions
+            process_batch: Coroutine called with each micro-batch of mentions
+            campaign_id: Campaign whose de-duplication scope pushes share with
+                its scans
+            host: Interface to listen on
+            port: Port to listen on
+            path: URL path Mentionlytics posts events to
+            signature_header: Header carrying the HMAC signature
+            max_batch_size: Flush a batch at this many mentions
+            max_wait_seconds: Flush a partial batch after this many seconds
+            max_inflight_batches: Hold new pushes while this many batches
+                are still being processed
+            dedup_save_interval: Seconds between saves of the de-duplication
+                state; it is also saved on stop
+        """
+        self.monitoring_agent = monitoring_agent
+        self.campaign_id = campaign_id
+        self.host = host
+        self.port = port
+        self.path = path
+        self.signature_header = signature_header
+        self.dedup_save_interval = dedup_save_interval
+        
+        self.batcher = MentionBatcher(
+            flush_callback=process_batch,
+            max_batch_size=max_batch_size,
+            max_wait_seconds=max_wait_seconds,
+            max_inflight=max_inflight_batches
+        )
+        
+        self._runner: Optional[web.AppRunner] = None
+        self._last_dedup_save = time.monotonic()
+        
+        # Request statistics
+        self.requests_received = 0
+        self.requests_rejected = 0
+        self.mentions_received = 0
+        self.last_received_at: Optional[datetime] = None
+    
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application serving the webhook endpoint"""
+        app = web.Application()
+        app.router.add_post(self.path, self.handle_webhook)
+        app.router.add_get("/health", self.handle_health)
+        return app
+    
+    async def start(self) -> None:
+        """Start listening for webhook pushes"""
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        
+        logger.info(f"Webhook receiver listening on {self.host}:{self.port}{self.path}")
+    
+    async def stop(self) -> None:
+        """Stop the receiver after flushing pending batches"""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        
+        await self.batcher.flush()
+        self._save_dedup_state()
+        logger.info("Webhook receiver stopped")
+    
+    async def handle_webhook(self, request: web.Request) -> web.Response:
+        """Verify, parse and batch a webhook push"""
+        self.requests_received += 1
+        payload = await request.read()
+        
+        signature = request.headers.get(self.signature_header, "")
+        if not self.monitoring_agent.verify_webhook_signature(payload, signature):
+            self.requests_rejected += 1
+            logger.warning("Rejected webhook push with invalid signature")
+            return web.json_response({"error": "Invalid signature"}, status=401)
+        
+        try:
+            body = json.loads(payload)
+        except ValueError:
+            self.requests_rejected += 1
+            return web.json_response({"error": "Invalid JSON payload"}, status=400)
+        
+        mentions = []
+        for data in self._extract_mention_data(body):
+            mention = self.monitoring_agent._parse_mention(data)
+            if mention:
+                mentions.append(mention)
+        
+        # Redeliveries, and mentions a scan already delivered, are dropped;
+        # mention.updated events pass as updates
+        mentions = self.monitoring_agent.dedup_store.filter(mentions, scope=self.campaign_id)
+        
+        # Push-only deployments never scan, so persist the seen IDs here
+        if time.monotonic() - self._last_dedup_save >= self.dedup_save_interval:
+            self._save_dedup_state()
+        
+        self.mentions_received += len(mentions)
+        self.last_received_at = datetime.now()
+        
+        await self.batcher.add(mentions)
+        
+        return web.json_response(
+            {"status": "accepted", "mentions": len(mentions)},
+            status=202
+        )
+    
+    def _save_dedup_state(self) -> None:
+        """Persist the de-duplication state so redeliveries survive restarts"""
+        self.monitoring_agent.dedup_store.save()
+        self._last_dedup_save = time.monotonic()
+    
+    async def handle_health(self, request: web.Request) -> web.Response:
+        """Report receiver health and batching statistics"""
+        return web.json_response(self.get_stats())
+    
+    def _extract_mention_data(self, body: Any) -> List[Dict]:
+        """Extract raw mention payloads from single or batched events"""
+        if isinstance(body, list):
+            events = body
+        elif not isinstance(body, dict):
+            return []
+        elif "events" in body:
+            events = body["events"]
+        elif "mentions" in body:
+            return body["mentions"]
+        else:
+            events = [body]
+        
+        mention_data = []
+        for event in events:
+            # Events wrap the mention in "data"; bare mentions are accepted too
+            data = event.get("data", event) if isinstance(event, dict) else None
+            if isinstance(data, dict):
+                mention_data.append(data)
+        
+        return mention_data
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get receiver statistics"""
+        return {
+            "requests_received": self.requests_received,
+            "requests_rejected": self.requests_rejected,
+            "mentions_received": self.mentions_received,
+            "last_received_at": (
+                self.last_received_at.isoformat() if self.last_received_at else None
+            ),
+            "batching": self.batcher.get_stats()
+        }
@@ -4,8 +4,37 @@ Crisis Detection Workflow Utilities
 
 from .state import WorkflowState
 from .rate_limiter import RateLimiter
+from .http_pool import ConnectionPoolManager, get_connection_pool
+from .dedup import MentionDedupStore
+from .fetch_checkpoint import FetchCheckpointStore
+from .similarity_index import MentionSimilarityIndex
+from .sliding_window import MentionWindowAggregator
+from .tracing import PipelineTracer
+from .run_checkpoint import RunCheckpointStore
+from .stage_queue import MentionStageQueue
+from .analysis_cache import AnalysisCache
+from .prompt_packer import PromptPacker
+from .narrative_clusters import NarrativeClusterer
+from .retrieval_store import RetrievalStore
+from .pattern_store import CrisisPatternStore
+from .llm_gateway import LLMGateway
 
 __all__ = [
     "WorkflowState",
-    "RateLimiter"
+    "RateLimiter",
+    "ConnectionPoolManager",
+    "get_connection_pool",
+    "MentionDedupStore",
+    "FetchCheckpointStore",
+    "MentionSimilarityIndex",
+    "MentionWindowAggregator",
+    "PipelineTracer",
+    "RunCheckpointStore",
+    "MentionStageQueue",
+    "AnalysisCache",
+    "PromptPacker",
+    "NarrativeClusterer",
+    "RetrievalStore",
+    "CrisisPatternStore",
+    "LLMGateway"
 ]
\ No newline at end of file
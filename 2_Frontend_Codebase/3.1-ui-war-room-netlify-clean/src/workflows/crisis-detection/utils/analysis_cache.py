@@ -0,0 +1,305 @@
+"""
+Analysis Cache - Reuse LLM crisis analyses for the same or a near-identical mention set
+"""
+
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+import logging
+
+from ..agents.crisis_detection import CrisisMention
+from .storage import get_state_path
+
+logger = logging.getLogger(__name__)
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _magnitude_bucket(count: int) -> int:
+    """Half-decade bucket of a reach or engagement count (1-3, 4-9, 10-31, ...)"""
+    return int(2 * math.log10(count + 1)) if count > 0 else 0
+
+
+class AnalysisCache:
+    """
+    Persisted cache of crisis analyses keyed on the analyzed mention set
+    
+    Each mention is reduced to a fingerprint of its normalized source,
+    author and text plus its bucketed reach, engagement and sentiment, so
+    re-fetched or re-posted copies of the same mention compare equal while
+    one gaining traction does not. A lookup first tries the exact set
+    fingerprint and then the most similar cached set for the same campaign
+    context, accepted when its Jaccard overlap reaches the threshold. Sets
+    holding updated mentions only reuse exact matches. Entries expire after a TTL and
+    the least recently used are evicted beyond the size limit.
+    """
+    
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl_seconds: int = 1800,
+        max_entries: int = 500,
+        similarity_threshold: float = 0.8
+    ):
+        """
+        Initialize analysis cache
+        
+        Args:
+            db_path: SQLite database file (default: state directory)
+            ttl_seconds: Seconds a cached analysis stays valid
+            max_entries: Analyses kept before the least recently used go
+            similarity_threshold: Minimum Jaccard overlap for reusing the
+                analysis of a different mention set; 1.0 disables near matches
+        """
+        self.db_path = db_path or get_state_path("analysis_cache.db")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                set_key TEXT PRIMARY KEY,
+                context_key TEXT NOT NULL,
+                members TEXT NOT NULL,
+                analysis TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        
+        # set_key -> (context_key, member fingerprints, created_at), in LRU order
+        self._index: "OrderedDict[str, Tuple[str, FrozenSet[str], float]]" = OrderedDict()
+        self._load_index()
+        
+        # Hit-rate statistics
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+    
+    def _load_index(self) -> None:
+        """Load unexpired entries into the in-memory lookup index"""
+        cutoff = time.time() - self.ttl_seconds
+        
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM analysis_cache WHERE created_at < ?", (cutoff,))
+            rows = self._conn.execute(
+                "SELECT set_key, context_key, members, created_at FROM analysis_cache "
+                "ORDER BY last_used"
+            ).fetchall()
+        
+        for set_key, context_key, members, created_at in rows:
+            self._index[set_key] = (context_key, frozenset(json.loads(members)), created_at)
+        
+        if rows:
+            logger.info(f"Loaded {len(rows)} cached analyses from {self.db_path}")
+    
+    def _mention_fingerprint(self, mention: CrisisMention) -> str:
+        """Fingerprint a mention's normalized source, author, text and traction"""
+        content = _WHITESPACE.sub(" ", mention.content.lower()).strip()
+        body = (
+            f"{mention.source}|{(mention.author or '').lower()}|{content}|"
+            f"{_magnitude_bucket(mention.reach_count)}|"
+            f"{_magnitude_bucket(mention.engagement_count)}|"
+            f"{round(mention.sentiment_score, 1)}"
+        )
+        return hashlib.blake2b(body.encode(), digest_size=8).hexdigest()
+    
+    def _context_key(self, campaign_context: Optional[Dict]) -> str:
+        """Fingerprint a campaign context independent of key order"""
+        body = json.dumps(campaign_context or {}, sort_keys=True, default=str)
+        return hashlib.blake2b(body.encode(), digest_size=8).hexdigest()
+    
+    def _keys(
+        self,
+        mentions: List[CrisisMention],
+        campaign_context: Optional[Dict]
+    ) -> Tuple[str, str, FrozenSet[str]]:
+        """Get the set key, context key and member fingerprints of a lookup"""
+        members = frozenset(self._mention_fingerprint(m) for m in mentions)
+        context_key = self._context_key(campaign_context)
+        set_key = hashlib.blake2b(
+            (context_key + "|" + ",".join(sorted(members))).encode(),
+            digest_size=16
+        ).hexdigest()
+        
+        return set_key, context_key, members
+    
+    def get(
+        self,
+        mentions: List[CrisisMention],
+        campaign_context: Optional[Dict] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up the analysis of this or a near-identical mention set
+        
+        Returns:
+            The cached analysis fields, or None on a miss
+        """
+        if not mentions:
+            return None
+        
+        now = time.time()
+        set_key, context_key, members = self._keys(mentions, campaign_context)
+        self._expire(now)
+        
+        if set_key in self._index:
+            match = set_key
+            self.hits += 1
+        elif any(m.is_update for m in mentions):
+            # Updates are re-delivered so a changed mention gets re-analyzed;
+            # a near match would hand back the analysis made before the change
+            self.misses += 1
+            return None
+        else:
+            match, overlap = self._nearest(context_key, members)
+            if match is None:
+                self.misses += 1
+                return None
+            
+            self.near_hits += 1
+            logger.debug(f"Near-identical mention set (Jaccard {overlap:.2f}) reuses cached analysis")
+        
+        self._index.move_to_end(match)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT analysis FROM analysis_cache WHERE set_key = ?",
+                (match,)
+            ).fetchone()
+            self._conn.execute(
+                "UPDATE analysis_cache SET last_used = ? WHERE set_key = ?",
+                (now, match)
+            )
+        
+        if row is None:
+            self._index.pop(match, None)
+            return None
+        
+        return json.loads(row[0])
+    
+    def _nearest(
+        self,
+        context_key: str,
+        members: FrozenSet[str]
+    ) -> Tuple[Optional[str], float]:
+        """Find the cached set of the same context with the highest Jaccard overlap"""
+        if self.similarity_threshold >= 1.0:
+            return None, 0.0
+        
+        best_key = None
+        best_overlap = self.similarity_threshold
+        
+        for set_key, (entry_context, entry_members, _) in self._index.items():
+            if entry_context != context_key:
+                continue
+            
+            # Jaccard can never exceed the ratio of the set sizes
+            smaller, larger = sorted((len(members), len(entry_members)))
+            if smaller < best_overlap * larger:
+                continue
+            
+            intersection = len(members & entry_members)
+            overlap = intersection / (len(members) + len(entry_members) - intersection)
+            if overlap >= best_overlap:
+                best_key = set_key
+                best_overlap = overlap
+        
+        return best_key, best_overlap
+    
+    def put(
+        self,
+        mentions: List[CrisisMention],
+        campaign_context: Optional[Dict],
+        analysis: Dict[str, Any]
+    ) -> None:
+        """Store the analysis of a mention set"""
+        if not mentions:
+            return
+        
+        now = time.time()
+        set_key, context_key, members = self._keys(mentions, campaign_context)
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache "
+                "(set_key, context_key, members, analysis, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    set_key, context_key, json.dumps(sorted(members)),
+                    json.dumps(analysis, default=str), now, now
+                )
+            )
+        
+        self._index[set_key] = (context_key, members, now)
+        self._index.move_to_end(set_key)
+        
+        evicted = []
+        while len(self._index) > self.max_entries:
+            evicted.append(self._index.popitem(last=False)[0])
+        if evicted:
+            self.evictions += len(evicted)
+            self._delete(evicted)
+    
+    def _expire(self, now: float) -> None:
+        """Drop entries older than the TTL"""
+        cutoff = now - self.ttl_seconds
+        expired = [
+            set_key for set_key, (_, _, created_at) in self._index.items()
+            if created_at < cutoff
+        ]
+        if not expired:
+            return
+        
+        for set_key in expired:
+            del self._index[set_key]
+        self.expired += len(expired)
+        self._delete(expired)
+    
+    def _delete(self, set_keys: List[str]) -> None:
+        """Delete entries from the database"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM analysis_cache WHERE set_key = ?",
+                [(set_key,) for set_key in set_keys]
+            )
+    
+    def clear(self) -> None:
+        """Drop every cached analysis"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM analysis_cache")
+        self._index.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit-rate statistics"""
+        lookups = self.hits + self.near_hits + self.misses
+        
+        return {
+            "entries": len(self._index),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "similarity_threshold": self.similarity_threshold,
+            "lookups": lookups,
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.near_hits) / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions
+        }
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self._conn.close()
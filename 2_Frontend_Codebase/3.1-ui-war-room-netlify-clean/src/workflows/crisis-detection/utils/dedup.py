@@ -0,0 +1,258 @@
+"""
+Mention De-duplication Store - Bounded seen-ID tracking across scans
+"""
+
+import hashlib
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from ..agents.crisis_detection import CrisisMention
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over mention IDs, optionally persisted to disk
+    """
+    
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.01,
+        path: Optional[str] = None
+    ):
+        """
+        Initialize Bloom filter
+        
+        Args:
+            capacity: Expected number of distinct IDs
+            error_rate: Target false positive rate at capacity
+            path: File the bit array is loaded from and saved to
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.path = path
+        
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        
+        if path:
+            self.load()
+    
+    def _positions(self, key: str) -> List[int]:
+        """Derive bit positions with double hashing"""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+    
+    def add(self, key: str) -> None:
+        """Add a key to the filter"""
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+    
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+    
+    def load(self) -> None:
+        """Load the bit array from disk if a compatible file exists"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        
+        with open(self.path, "rb") as f:
+            data = f.read()
+        
+        if len(data) != len(self.bits):
+            logger.warning(
+                f"Ignoring Bloom filter at {self.path}: size mismatch "
+                f"({len(data)} != {len(self.bits)} bytes)"
+            )
+            return
+        
+        self.bits = bytearray(data)
+        logger.info(f"Loaded Bloom filter from {self.path}")
+    
+    def save(self) -> None:
+        """Atomically persist the bit array to disk"""
+        if not self.path:
+            return
+        
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.bits)
+        os.replace(tmp_path, self.path)
+
+
+class MentionDedupStore:
+    """
+    Bounded store of already-analyzed mention IDs
+    
+    Recent IDs live in an LRU with TTL alongside a fingerprint of the
+    mention body, so a re-delivered mention is dropped while an edited one
+    is passed through as an update. IDs evicted from the LRU can still be
+    recognised by an optional Bloom filter.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 50000,
+        ttl_seconds: int = 86400,
+        bloom_path: Optional[str] = None,
+        bloom_capacity: int = 1_000_000,
+        bloom_error_rate: float = 0.01
+    ):
+        """
+        Initialize de-duplication store
+        
+        Args:
+            max_entries: Maximum IDs held in the LRU
+            ttl_seconds: Seconds an ID stays in the LRU after it was last seen
+            bloom_path: Enable a Bloom filter persisted at this path
+            bloom_capacity: Expected distinct IDs for the Bloom filter
+            bloom_error_rate: Target false positive rate for the Bloom filter
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        
+        # mention_id -> (content fingerprint, last seen)
+        self._seen: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        
+        self.bloom: Optional[BloomFilter] = None
+        if bloom_path:
+            self.bloom = BloomFilter(
+                capacity=bloom_capacity,
+                error_rate=bloom_error_rate,
+                path=bloom_path
+            )
+        
+        # Hit-rate statistics
+        self.lookups = 0
+        self.new_count = 0
+        self.duplicate_count = 0
+        self.update_count = 0
+        self.bloom_hits = 0
+        self.expired = 0
+        self.evictions = 0
+    
+    def _fingerprint(self, mention: CrisisMention) -> str:
+        """Fingerprint the parts of a mention that change on update"""
+        body = (
+            f"{mention.content}|{mention.sentiment_score}|"
+            f"{mention.reach_count}|{mention.engagement_count}"
+        )
+        return hashlib.blake2b(body.encode(), digest_size=8).hexdigest()
+    
+    def check(self, mention: CrisisMention, scope: Optional[str] = None) -> str:
+        """
+        Classify a mention against the store and record it
+        
+        Args:
+            mention: Mention to classify
+            scope: Track the mention separately per scope (e.g. campaign)
+        
+        Returns:
+            "new", "duplicate" or "updated"
+        """
+        self.lookups += 1
+        now = time.time()
+        mention_id = f"{scope}:{mention.mention_id}" if scope else mention.mention_id
+        fingerprint = self._fingerprint(mention)
+        
+        entry = self._seen.get(mention_id)
+        if entry is not None and now - entry[1] > self.ttl_seconds:
+            del self._seen[mention_id]
+            self.expired += 1
+            entry = None
+        
+        if entry is not None:
+            self._seen[mention_id] = (fingerprint, now)
+            self._seen.move_to_end(mention_id)
+            
+            if entry[0] == fingerprint:
+                self.duplicate_count += 1
+                return "duplicate"
+            
+            self.update_count += 1
+            return "updated"
+        
+        if self.bloom is not None and mention_id in self.bloom:
+            # Seen before but aged out of the LRU; the body is unknown
+            self.bloom_hits += 1
+            self.duplicate_count += 1
+            self._remember(mention_id, fingerprint, now)
+            return "duplicate"
+        
+        self.new_count += 1
+        self._remember(mention_id, fingerprint, now)
+        if self.bloom is not None:
+            self.bloom.add(mention_id)
+        
+        return "new"
+    
+    def _remember(self, mention_id: str, fingerprint: str, now: float) -> None:
+        """Insert an ID into the LRU, evicting the oldest when full"""
+        self._seen[mention_id] = (fingerprint, now)
+        self._seen.move_to_end(mention_id)
+        
+        while len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+            self.evictions += 1
+    
+    def filter(
+        self,
+        mentions: List[CrisisMention],
+        scope: Optional[str] = None
+    ) -> List[CrisisMention]:
+        """
+        Drop mentions that were already analyzed
+        
+        Edited mentions are kept and flagged with ``is_update`` so they are
+        treated as deltas rather than new mentions. Mentions are tracked
+        separately per scope, so campaigns sharing a store each see them.
+        """
+        fresh = []
+        for mention in mentions:
+            if not mention.mention_id:
+                fresh.append(mention)
+                continue
+            
+            status = self.check(mention, scope)
+            if status == "new":
+                fresh.append(mention)
+            elif status == "updated":
+                mention.is_update = True
+                fresh.append(mention)
+        
+        return fresh
+    
+    def save(self) -> None:
+        """Persist the Bloom filter, if enabled"""
+        if self.bloom is not None:
+            self.bloom.save()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get de-duplication hit-rate statistics"""
+        repeats = self.duplicate_count + self.update_count
+        
+        return {
+            "lookups": self.lookups,
+            "new": self.new_count,
+            "duplicates": self.duplicate_count,
+            "updates": self.update_count,
+            "hit_rate": repeats / self.lookups if self.lookups else 0.0,
+            "bloom_hits": self.bloom_hits,
+            "entries": len(self._seen),
+            "max_entries": self.max_entries,
+            "expired": self.expired,
+            "evictions": self.evictions
+        }
@@ -0,0 +1,113 @@
+"""
+Fetch Checkpoint Store - Durable high-water marks for source polling
+"""
+
+import sqlite3
+import threading
+from typing import Dict, Optional
+from datetime import datetime
+import logging
+
+from .storage import get_state_path
+
+logger = logging.getLogger(__name__)
+
+
+class FetchCheckpointStore:
+    """
+    Persisted per-source, per-campaign fetch high-water marks
+    
+    Each scan fetches only what was published after the last fully drained
+    window, even across agent rebuilds and process restarts.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize checkpoint store
+        
+        Args:
+            db_path: SQLite database file (default: state directory)
+        """
+        self.db_path = db_path or get_state_path("fetch_checkpoints.db")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fetch_checkpoints (
+                source TEXT NOT NULL,
+                campaign_id TEXT NOT NULL,
+                high_water_mark REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (source, campaign_id)
+            )
+            """
+        )
+        self._conn.commit()
+    
+    def get(self, source: str, campaign_id: str) -> Optional[datetime]:
+        """Get the high-water mark for a source and campaign"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT high_water_mark FROM fetch_checkpoints "
+                "WHERE source = ? AND campaign_id = ?",
+                (source, campaign_id)
+            ).fetchone()
+        
+        return datetime.fromtimestamp(row[0]) if row else None
+    
+    def advance(self, source: str, campaign_id: str, fetched_until: datetime) -> datetime:
+        """
+        Atomically move the high-water mark forward
+        
+        The mark never moves backwards, so a slow scan finishing after a
+        newer one cannot re-open an already drained window.
+        
+        Returns:
+            The stored high-water mark after the update
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO fetch_checkpoints (source, campaign_id, high_water_mark, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (source, campaign_id) DO UPDATE SET
+                    high_water_mark = MAX(high_water_mark, excluded.high_water_mark),
+                    updated_at = excluded.updated_at
+                """,
+                (source, campaign_id, fetched_until.timestamp(), datetime.now().timestamp())
+            )
+            row = self._conn.execute(
+                "SELECT high_water_mark FROM fetch_checkpoints "
+                "WHERE source = ? AND campaign_id = ?",
+                (source, campaign_id)
+            ).fetchone()
+        
+        logger.debug(f"Checkpoint {source}/{campaign_id} advanced to {fetched_until.isoformat()}")
+        return datetime.fromtimestamp(row[0])
+    
+    def get_all(self) -> Dict[str, Dict[str, str]]:
+        """Get every stored high-water mark, keyed by source then campaign"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, campaign_id, high_water_mark FROM fetch_checkpoints"
+            ).fetchall()
+        
+        checkpoints: Dict[str, Dict[str, str]] = {}
+        for source, campaign_id, mark in rows:
+            checkpoints.setdefault(source, {})[campaign_id] = (
+                datetime.fromtimestamp(mark).isoformat()
+            )
+        
+        return checkpoints
+    
+    def reset(self, source: str, campaign_id: str) -> None:
+        """Forget the high-water mark for a source and campaign"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM fetch_checkpoints WHERE source = ? AND campaign_id = ?",
+                (source, campaign_id)
+            )
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self._conn.close()
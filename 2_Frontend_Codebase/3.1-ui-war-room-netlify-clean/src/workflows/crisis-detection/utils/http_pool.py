@@ -0,0 +1,179 @@
+"""
+HTTP Connection Pool Manager for outbound API calls
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+import logging
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPoolManager:
+    """
+    Process-wide pool of keep-alive HTTP connections
+    
+    Agents and delivery channels borrow one shared ``aiohttp.ClientSession``
+    instead of building their own, so TCP and TLS setup is paid once per
+    host rather than once per scan.
+    """
+    
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 30.0,
+        connect_timeout: float = 10.0
+    ):
+        """
+        Initialize connection pool manager
+        
+        Args:
+            limit: Maximum open connections across all hosts
+            limit_per_host: Maximum open connections to a single host
+            keepalive_timeout: Seconds an idle connection is kept for reuse
+            connect_timeout: Seconds allowed to establish a new connection
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.connect_timeout = connect_timeout
+        
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Pool statistics
+        self._requests = 0
+        self._connections_created = 0
+        self._connections_reused = 0
+        self._queued = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Borrow the shared session, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        
+        if not self._session_usable(loop):
+            # A session is bound to the loop it was created on, so a new
+            # loop (e.g. a fresh asyncio.run) gets a fresh session
+            self._session = self._create_session()
+            self._loop = loop
+            logger.info(
+                f"Created pooled HTTP session (limit={self.limit}, "
+                f"per_host={self.limit_per_host})"
+            )
+        
+        return self._session
+    
+    def _session_usable(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Check whether the current session can serve the running loop"""
+        return (
+            self._session is not None
+            and not self._session.closed
+            and self._loop is loop
+        )
+    
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a session over a keep-alive connector with tracing hooks"""
+        self._connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True
+        )
+        
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace_config.on_connection_queued_start.append(self._on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_connection_queued_end)
+        
+        return aiohttp.ClientSession(
+            connector=self._connector,
+            timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout),
+            trace_configs=[trace_config]
+        )
+    
+    async def _on_request_start(self, session, context, params) -> None:
+        self._requests += 1
+    
+    async def _on_connection_create_end(self, session, context, params) -> None:
+        self._connections_created += 1
+    
+    async def _on_connection_reuseconn(self, session, context, params) -> None:
+        self._connections_reused += 1
+    
+    async def _on_connection_queued_start(self, session, context, params) -> None:
+        context.pool_queued_at = time.monotonic()
+    
+    async def _on_connection_queued_end(self, session, context, params) -> None:
+        queued_at = getattr(context, "pool_queued_at", None)
+        if queued_at is None:
+            return
+        
+        waited = time.monotonic() - queued_at
+        self._queued += 1
+        self._wait_time_total += waited
+        self._wait_time_max = max(self._wait_time_max, waited)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics"""
+        acquired = 0
+        idle = 0
+        if self._connector and not self._connector.closed:
+            acquired = len(getattr(self._connector, "_acquired", ()))
+            idle = sum(
+                len(conns)
+                for conns in getattr(self._connector, "_conns", {}).values()
+            )
+        
+        connections = self._connections_created + self._connections_reused
+        
+        return {
+            "open_connections": acquired + idle,
+            "active_connections": acquired,
+            "idle_connections": idle,
+            "requests": self._requests,
+            "connections_created": self._connections_created,
+            "connections_reused": self._connections_reused,
+            "reuse_ratio": self._connections_reused / connections if connections else 0.0,
+            "queued_requests": self._queued,
+            "avg_wait_time_ms": (
+                self._wait_time_total / self._queued * 1000 if self._queued else 0.0
+            ),
+            "max_wait_time_ms": self._wait_time_max * 1000
+        }
+    
+    async def close(self) -> None:
+        """Close the shared session and all pooled connections"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._connector = None
+        self._loop = None
+        logger.info("Closed pooled HTTP session")
+
+
+_default_pool: Optional[ConnectionPoolManager] = None
+
+
+def get_connection_pool() -> ConnectionPoolManager:
+    """Get the process-wide connection pool manager"""
+    global _default_pool
+    
+    if _default_pool is None:
+        _default_pool = ConnectionPoolManager()
+    
+    return _default_pool
+
+
+async def close_connection_pool() -> None:
+    """Close the process-wide connection pool, if it was ever opened"""
+    if _default_pool is not None:
+        await _default_pool.close()
@@ -0,0 +1,212 @@
+"""
+Keyword Matcher - Compiled multi-pattern matching over campaign keywords
+"""
+
+import hashlib
+import json
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Relevance weights per matched category (base score 0.5, capped at 1.0)
+RELEVANCE_BASE = 0.5
+RELEVANCE_WEIGHTS = {
+    "candidate": 0.3,
+    "issue": 0.1,
+    "opponent": 0.2
+}
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over categorized keywords
+    
+    All keywords are matched case-insensitively as substrings in a single
+    pass over the text, regardless of how many keywords are registered.
+    """
+    
+    def __init__(self, terms: Dict[str, Iterable[str]]):
+        """
+        Build the automaton
+        
+        Args:
+            terms: Keywords to match, grouped by category
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+        self.term_count = 0
+        
+        for category, category_terms in terms.items():
+            for term in category_terms:
+                if term:
+                    self._add_term(category, term)
+        
+        self._build_failure_links()
+    
+    def _add_term(self, category: str, term: str) -> None:
+        """Insert a keyword into the trie"""
+        state = 0
+        for char in term.lower():
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        
+        self._output[state].append((category, term))
+        self.term_count += 1
+    
+    def _build_failure_links(self) -> None:
+        """Compute failure links breadth-first and merge outputs"""
+        queue = deque(self._goto[0].values())
+        
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state].extend(self._output[self._fail[next_state]])
+    
+    def match(self, text: str) -> Dict[str, Set[str]]:
+        """
+        Find every keyword occurring in the text
+        
+        Returns:
+            Matched keywords grouped by category
+        """
+        matches: Dict[str, Set[str]] = {}
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            
+            if output[state]:
+                for category, term in output[state]:
+                    matches.setdefault(category, set()).add(term)
+        
+        return matches
+
+
+class CampaignMatcher:
+    """
+    Keyword matcher compiled from a campaign context and crisis patterns
+    """
+    
+    def __init__(
+        self,
+        campaign_context: Dict[str, Any],
+        crisis_patterns: Optional[List[Dict]] = None
+    ):
+        candidate = campaign_context.get("candidate_name")
+        
+        # Indicator -> crisis pattern types using it
+        self.indicator_patterns: Dict[str, List[str]] = {}
+        for pattern in crisis_patterns or []:
+            for indicator in pattern.get("indicators", []):
+                self.indicator_patterns.setdefault(indicator, []).append(pattern["type"])
+        
+        self.has_monitor_keywords = bool(campaign_context.get("monitor_keywords"))
+        self.matcher = KeywordMatcher({
+            "monitor": campaign_context.get("monitor_keywords") or [],
+            "candidate": [candidate] if candidate else [],
+            "issue": campaign_context.get("key_issues") or [],
+            "opponent": campaign_context.get("opponents") or [],
+            "indicator": list(self.indicator_patterns)
+        })
+    
+    def match(self, text: str) -> Dict[str, Set[str]]:
+        """Match all campaign keywords and crisis indicators in one pass"""
+        return self.matcher.match(text)
+    
+    def is_monitored(self, matches: Dict[str, Set[str]]) -> bool:
+        """Whether a mention passes the monitor_keywords filter"""
+        return not self.has_monitor_keywords or bool(matches.get("monitor"))
+    
+    def relevance(self, matches: Dict[str, Set[str]]) -> float:
+        """Campaign relevance score from matched candidate, issues and opponents"""
+        score = RELEVANCE_BASE
+        for category, weight in RELEVANCE_WEIGHTS.items():
+            score += weight * len(matches.get(category, ()))
+        
+        return min(score, 1.0)
+    
+    def crisis_indicators(self, matches: Dict[str, Set[str]]) -> Dict[str, List[str]]:
+        """Matched indicators grouped by the crisis pattern they belong to"""
+        indicators: Dict[str, List[str]] = {}
+        for indicator in sorted(matches.get("indicator", ())):
+            for pattern_type in self.indicator_patterns.get(indicator, []):
+                indicators.setdefault(pattern_type, []).append(indicator)
+        
+        return indicators
+
+
+class CampaignMatcherCache:
+    """
+    Caches compiled campaign matchers until their inputs change
+    """
+    
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._matchers: Dict[str, CampaignMatcher] = {}
+        self.builds = 0
+        self.hits = 0
+    
+    def get(
+        self,
+        campaign_context: Dict[str, Any],
+        crisis_patterns: Optional[List[Dict]] = None
+    ) -> CampaignMatcher:
+        """Get the compiled matcher for a campaign context and pattern set"""
+        key = self._cache_key(campaign_context, crisis_patterns)
+        
+        matcher = self._matchers.get(key)
+        if matcher is not None:
+            self.hits += 1
+            return matcher
+        
+        matcher = CampaignMatcher(campaign_context, crisis_patterns)
+        self.builds += 1
+        
+        if len(self._matchers) >= self.max_entries:
+            self._matchers.pop(next(iter(self._matchers)))
+        self._matchers[key] = matcher
+        
+        logger.debug(f"Compiled campaign matcher with {matcher.matcher.term_count} terms")
+        return matcher
+    
+    def _cache_key(
+        self,
+        campaign_context: Dict[str, Any],
+        crisis_patterns: Optional[List[Dict]]
+    ) -> str:
+        """Fingerprint only the inputs the automaton is built from"""
+        material = {
+            "monitor": campaign_context.get("monitor_keywords"),
+            "candidate": campaign_context.get("candidate_name"),
+            "issues": campaign_context.get("key_issues"),
+            "opponents": campaign_context.get("opponents"),
+            "patterns": [
+                (pattern.get("type"), pattern.get("indicators"))
+                for pattern in crisis_patterns or []
+            ]
+        }
+        encoded = json.dumps(material, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
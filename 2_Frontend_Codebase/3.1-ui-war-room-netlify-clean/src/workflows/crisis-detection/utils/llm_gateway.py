@@ -0,0 +1,211 @@
+"""
+LLM Gateway - Shared chat model clients with concurrency, rate limits and coalescing
+"""
+
+import asyncio
+import hashlib
+import math
+import time
+from typing import Any, Dict, List, Tuple
+import logging
+
+from langchain_core.messages import BaseMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_openai import ChatOpenAI
+
+from .rate_limiter import DEFAULT_RATE_LIMITS, RateLimiter
+from .tracing import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class CallerStats:
+    """Latency and token usage of one caller"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency = LatencyHistogram()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the caller's usage"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency": self.latency.to_dict()
+        }
+
+
+class LLMGateway:
+    """
+    Single path for every agent's chat model calls
+    
+    Clients are built once per model and temperature and shared. Each call
+    waits for the request and token rate limits, then for a slot under the
+    global concurrency cap. Identical prompts already in flight are not
+    sent again: later callers await the first call's result. Latency and
+    token usage are recorded per caller.
+    """
+    
+    def __init__(
+        self,
+        openai_api_key: str,
+        model: str = "gpt-4",
+        max_concurrency: int = 4,
+        requests_per_minute: int = DEFAULT_RATE_LIMITS["openai"]["max_requests"],
+        tokens_per_minute: int = 40000,
+        completion_token_reserve: int = 500
+    ):
+        """
+        Initialize LLM gateway
+        
+        Args:
+            openai_api_key: API key for the shared clients
+            model: Chat model used by every caller
+            max_concurrency: Calls in flight at once across all callers
+            requests_per_minute: Request rate limit
+            tokens_per_minute: Token rate limit
+            completion_token_reserve: Completion tokens budgeted per call on
+                top of the estimated prompt tokens
+        """
+        self.openai_api_key = openai_api_key
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.completion_token_reserve = completion_token_reserve
+        
+        self.request_limiter = RateLimiter(max_requests=requests_per_minute, time_window=60)
+        self.token_limiter = RateLimiter(max_requests=tokens_per_minute, time_window=60)
+        
+        self._clients: Dict[Tuple[str, float], ChatOpenAI] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._callers: Dict[str, CallerStats] = {}
+        
+        # Gateway statistics
+        self.active = 0
+        self.waiting = 0
+        self.max_waiting = 0
+    
+    def get_llm(self, temperature: float = 0.2) -> ChatOpenAI:
+        """Get the shared client for a temperature, creating it on first use"""
+        key = (self.model, temperature)
+        if key not in self._clients:
+            self._clients[key] = ChatOpenAI(
+                model=self.model,
+                temperature=temperature,
+                openai_api_key=self.openai_api_key
+            )
+        return self._clients[key]
+    
+    def _caller(self, caller: str) -> CallerStats:
+        """Statistics of a caller, created on first use"""
+        if caller not in self._callers:
+            self._callers[caller] = CallerStats()
+        return self._callers[caller]
+    
+    def _request_key(self, messages: List[BaseMessage], temperature: float) -> str:
+        """Fingerprint of a formatted prompt and its model settings"""
+        body = "\x1e".join(f"{m.type}\x1f{m.content}" for m in messages)
+        return hashlib.blake2b(
+            f"{self.model}|{temperature}|{body}".encode(),
+            digest_size=16
+        ).hexdigest()
+    
+    async def invoke(
+        self,
+        prompt: ChatPromptTemplate,
+        inputs: Dict[str, Any],
+        caller: str,
+        temperature: float = 0.2
+    ) -> BaseMessage:
+        """
+        Run a prompt through the shared model
+        
+        Args:
+            prompt: Chat prompt template
+            inputs: Template variables
+            caller: Name the call is reported under
+            temperature: Sampling temperature
+        
+        Returns:
+            The model's reply
+        """
+        messages = prompt.format_messages(**inputs)
+        key = self._request_key(messages, temperature)
+        stats = self._caller(caller)
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # Singleflight: share the reply of the identical call in flight
+            stats.coalesced += 1
+            logger.debug(f"{caller}: coalesced with an identical LLM call in flight")
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.ensure_future(self._call(messages, caller, temperature))
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        return await asyncio.shield(future)
+    
+    async def _call(
+        self,
+        messages: List[BaseMessage],
+        caller: str,
+        temperature: float
+    ) -> BaseMessage:
+        """Make one model call under the rate limits and concurrency cap"""
+        stats = self._caller(caller)
+        
+        # Prompt tokens estimated from length; a call never needs more than
+        # the whole bucket
+        estimate = sum(math.ceil(len(str(m.content)) / 4) for m in messages)
+        estimate = min(estimate + self.completion_token_reserve, self.token_limiter.max_requests)
+        
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self.request_limiter.wait_for_capacity()
+            await self.token_limiter.wait_for_capacity(estimate)
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        
+        self.active += 1
+        start = time.perf_counter()
+        try:
+            result = await self.get_llm(temperature).ainvoke(messages)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            stats.calls += 1
+            stats.latency.observe((time.perf_counter() - start) * 1000)
+        
+        usage = getattr(result, "usage_metadata", None) or {}
+        stats.prompt_tokens += usage.get("input_tokens", 0)
+        stats.completion_tokens += usage.get("output_tokens", 0)
+        
+        return result
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get concurrency, rate limit and per-caller statistics"""
+        return {
+            "model": self.model,
+            "clients": len(self._clients),
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "inflight_prompts": len(self._inflight),
+            "requests": self.request_limiter.get_current_usage(),
+            "tokens": self.token_limiter.get_current_usage(),
+            "callers": {name: stats.to_dict() for name, stats in self._callers.items()}
+        }
@@ -0,0 +1,196 @@
+"""
+Narrative Clustering - Incremental grouping of mentions into stories
+"""
+
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import logging
+
+import numpy as np
+
+from ..agents.crisis_detection import CrisisMention
+from .similarity_index import TOKEN_PATTERN, hash_vectorize
+
+logger = logging.getLogger(__name__)
+
+
+# Words too common to name a narrative
+LABEL_STOPWORDS = {
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "by", "with",
+    "is", "are", "was", "were", "be", "as", "at", "it", "this", "that", "from",
+    "about", "after", "over", "new", "says", "said", "has", "have", "his", "her"
+}
+
+
+class Narrative:
+    """A story tracked across scans as the centroid of its mentions"""
+    
+    def __init__(self, narrative_id: str, n_features: int):
+        self.narrative_id = narrative_id
+        self.vector_sum = np.zeros(n_features, dtype=np.float32)
+        self.centroid = np.zeros(n_features, dtype=np.float32)
+        self.mention_count = 0
+        self.total_reach = 0
+        self.terms: Counter = Counter()
+        self.first_seen = time.time()
+        self.last_seen = self.first_seen
+    
+    def add(self, mention: CrisisMention, vector: np.ndarray) -> None:
+        """Fold a mention into the narrative"""
+        self.vector_sum += vector
+        norm = np.linalg.norm(self.vector_sum)
+        self.centroid = self.vector_sum / norm if norm else self.vector_sum
+        
+        self.mention_count += 1
+        self.total_reach += mention.reach_count
+        self.terms.update(
+            token for token in TOKEN_PATTERN.findall(mention.content.lower())
+            if len(token) > 2 and token not in LABEL_STOPWORDS
+        )
+        self.last_seen = time.time()
+    
+    @property
+    def label(self) -> str:
+        """Most frequent terms of the narrative"""
+        return " / ".join(term for term, _ in self.terms.most_common(3)) or self.narrative_id
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the narrative"""
+        return {
+            "narrative_id": self.narrative_id,
+            "label": self.label,
+            "mention_count": self.mention_count,
+            "total_reach": self.total_reach,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen
+        }
+
+
+class NarrativeClusterer:
+    """
+    Online clustering of mentions into narratives
+    
+    Each mention's hashed vector joins the most similar active narrative
+    when the cosine similarity to its centroid reaches the threshold, and
+    starts a new narrative otherwise. Narratives persist across scans, so
+    a story keeps its ID while it develops, and expire once they have not
+    been seen for the TTL.
+    """
+    
+    def __init__(
+        self,
+        similarity_threshold: float = 0.25,
+        n_features: int = 512,
+        ttl_seconds: int = 21600,
+        max_narratives: int = 200
+    ):
+        """
+        Initialize narrative clusterer
+        
+        Args:
+            similarity_threshold: Minimum centroid similarity to join a narrative
+            n_features: Dimensionality of the hashed vectors
+            ttl_seconds: Seconds a narrative survives without new mentions
+            max_narratives: Narratives kept before the stalest are dropped
+        """
+        self.similarity_threshold = similarity_threshold
+        self.n_features = n_features
+        self.ttl_seconds = ttl_seconds
+        self.max_narratives = max_narratives
+        
+        self.narratives: Dict[str, Narrative] = {}
+        
+        # Clustering statistics
+        self.mentions_assigned = 0
+        self.narratives_created = 0
+        self.narratives_expired = 0
+    
+    def assign(self, mentions: List[CrisisMention]) -> Dict[str, List[CrisisMention]]:
+        """
+        Assign mentions to narratives, creating new ones as needed
+        
+        Returns:
+            Mentions of this batch grouped by narrative ID
+        """
+        self._expire()
+        if not mentions:
+            return {}
+        
+        vectors = hash_vectorize([m.content for m in mentions], self.n_features)
+        
+        # Centroid matrix with room for every narrative this batch may open
+        narratives = list(self.narratives.values())
+        centroids = np.zeros((len(narratives) + len(mentions), self.n_features), dtype=np.float32)
+        for row, narrative in enumerate(narratives):
+            centroids[row] = narrative.centroid
+        
+        groups: Dict[str, List[CrisisMention]] = {}
+        
+        for mention, vector in zip(mentions, vectors):
+            narrative = None
+            if narratives:
+                similarities = centroids[:len(narratives)] @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.similarity_threshold:
+                    narrative = narratives[best]
+                    row = best
+            
+            if narrative is None:
+                narrative = Narrative(uuid.uuid4().hex[:12], self.n_features)
+                self.narratives[narrative.narrative_id] = narrative
+                narratives.append(narrative)
+                row = len(narratives) - 1
+                self.narratives_created += 1
+            
+            narrative.add(mention, vector)
+            centroids[row] = narrative.centroid
+            groups.setdefault(narrative.narrative_id, []).append(mention)
+        
+        self.mentions_assigned += len(mentions)
+        self._evict()
+        
+        return groups
+    
+    def get(self, narrative_id: str) -> Optional[Narrative]:
+        """Get a tracked narrative"""
+        return self.narratives.get(narrative_id)
+    
+    def _expire(self) -> None:
+        """Drop narratives not seen within the TTL"""
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            narrative_id for narrative_id, narrative in self.narratives.items()
+            if narrative.last_seen < cutoff
+        ]
+        for narrative_id in expired:
+            del self.narratives[narrative_id]
+        self.narratives_expired += len(expired)
+    
+    def _evict(self) -> None:
+        """Drop the stalest narratives beyond the size limit"""
+        excess = len(self.narratives) - self.max_narratives
+        if excess <= 0:
+            return
+        
+        stalest = sorted(self.narratives.values(), key=lambda n: n.last_seen)[:excess]
+        for narrative in stalest:
+            del self.narratives[narrative.narrative_id]
+        self.narratives_expired += excess
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get clustering statistics and the largest active narratives"""
+        largest = sorted(
+            self.narratives.values(),
+            key=lambda n: n.total_reach,
+            reverse=True
+        )[:10]
+        
+        return {
+            "active_narratives": len(self.narratives),
+            "mentions_assigned": self.mentions_assigned,
+            "narratives_created": self.narratives_created,
+            "narratives_expired": self.narratives_expired,
+            "top_narratives": [narrative.to_dict() for narrative in largest]
+        }
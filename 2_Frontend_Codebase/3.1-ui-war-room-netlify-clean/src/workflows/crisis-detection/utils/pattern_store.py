@@ -0,0 +1,385 @@
+"""
+Pattern Store - Persistent, bounded crisis patterns with an indicator index
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+import logging
+
+from .storage import get_state_path
+
+logger = logging.getLogger(__name__)
+
+
+# Indicators may contain hyphens ("fact-check"), unlike search tokens
+INDICATOR_PATTERN = re.compile(r"[a-z0-9@#'][a-z0-9@#'-]*")
+
+
+def indicator_terms(text: str) -> Set[str]:
+    """Words and adjacent word pairs of a text, for matching indicators"""
+    tokens = INDICATOR_PATTERN.findall(text.lower())
+    return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+class CrisisPattern:
+    """A crisis pattern with its usage counters"""
+    
+    def __init__(
+        self,
+        pattern_type: str,
+        indicators: List[str],
+        typical_severity: int,
+        builtin: bool = False,
+        hits: int = 0,
+        observations: int = 1,
+        first_seen: Optional[float] = None,
+        last_used: Optional[float] = None
+    ):
+        self.pattern_type = pattern_type
+        self.indicators = indicators
+        self.typical_severity = typical_severity
+        self.builtin = builtin
+        self.hits = hits
+        self.observations = observations
+        self.first_seen = first_seen or time.time()
+        self.last_used = last_used or self.first_seen
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Pattern in the shape used by prompts and keyword matchers"""
+        return {
+            "type": self.pattern_type,
+            "indicators": list(self.indicators),
+            "typical_severity": self.typical_severity
+        }
+
+
+class CrisisPatternStore:
+    """
+    Persisted crisis patterns, deduplicated and bounded
+    
+    An inverted index maps each indicator to the patterns using it. A newly
+    learned pattern whose indicators overlap an existing one by at least the
+    merge threshold (Jaccard) is folded into it instead of being added.
+    Lookups rank patterns by matched indicators, so only the top few reach a
+    prompt. Learned patterns that have not been used within the TTL expire,
+    and beyond the size limit the least frequently used are evicted; the
+    built-in patterns are kept.
+    """
+    
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_patterns: int = 200,
+        ttl_seconds: int = 90 * 86400,
+        merge_threshold: float = 0.5,
+        max_indicators: int = 15
+    ):
+        """
+        Initialize pattern store
+        
+        Args:
+            db_path: SQLite database file (default: state directory)
+            max_patterns: Learned patterns kept before the least used go
+            ttl_seconds: Seconds a learned pattern survives without use
+            merge_threshold: Indicator overlap at which a learned pattern
+                merges into an existing one
+            max_indicators: Indicators kept per pattern
+        """
+        self.db_path = db_path or get_state_path("crisis_patterns.db")
+        self.max_patterns = max_patterns
+        self.ttl_seconds = ttl_seconds
+        self.merge_threshold = merge_threshold
+        self.max_indicators = max_indicators
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crisis_patterns (
+                pattern_type TEXT PRIMARY KEY,
+                indicators TEXT NOT NULL,
+                typical_severity INTEGER NOT NULL,
+                builtin INTEGER NOT NULL,
+                hits INTEGER NOT NULL,
+                observations INTEGER NOT NULL,
+                first_seen REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        
+        self._patterns: Dict[str, CrisisPattern] = {}
+        # indicator -> pattern types using it
+        self._index: Dict[str, Set[str]] = {}
+        # Pattern list handed to prompts and matchers, rebuilt after changes
+        self._snapshot: Optional[List[Dict]] = None
+        self._load()
+        
+        # Store statistics
+        self.learned = 0
+        self.merged = 0
+        self.lookups = 0
+        self.expired = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._patterns)
+    
+    def _load(self) -> None:
+        """Load persisted patterns into memory and the indicator index"""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT pattern_type, indicators, typical_severity, builtin, hits, "
+                "observations, first_seen, last_used FROM crisis_patterns"
+            ).fetchall()
+        
+        for row in rows:
+            pattern_type, indicators, severity, builtin, hits, observations, first_seen, last_used = row
+            self._add(CrisisPattern(
+                pattern_type, json.loads(indicators), severity,
+                builtin=bool(builtin),
+                hits=hits,
+                observations=observations,
+                first_seen=first_seen,
+                last_used=last_used
+            ))
+        
+        if rows:
+            logger.info(f"Loaded {len(rows)} crisis patterns from {self.db_path}")
+    
+    def _add(self, pattern: CrisisPattern) -> None:
+        """Add a pattern to memory and the indicator index"""
+        self._patterns[pattern.pattern_type] = pattern
+        self._snapshot = None
+        for indicator in pattern.indicators:
+            self._index.setdefault(indicator, set()).add(pattern.pattern_type)
+    
+    def _remove(self, pattern_type: str) -> None:
+        """Remove a pattern from memory and the indicator index"""
+        pattern = self._patterns.pop(pattern_type)
+        self._snapshot = None
+        for indicator in pattern.indicators:
+            types = self._index.get(indicator)
+            if types is None:
+                continue
+            types.discard(pattern_type)
+            if not types:
+                del self._index[indicator]
+    
+    def _save(self, pattern: CrisisPattern) -> None:
+        """Persist a pattern"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crisis_patterns (pattern_type, indicators, "
+                "typical_severity, builtin, hits, observations, first_seen, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    pattern.pattern_type, json.dumps(pattern.indicators),
+                    pattern.typical_severity, int(pattern.builtin), pattern.hits,
+                    pattern.observations, pattern.first_seen, pattern.last_used
+                )
+            )
+    
+    def _normalize(self, indicators: Iterable[str]) -> List[str]:
+        """Lowercase and deduplicate indicators, keeping their order"""
+        normalized = []
+        for indicator in indicators:
+            indicator = " ".join(indicator.lower().split())
+            if indicator and indicator not in normalized:
+                normalized.append(indicator)
+        return normalized
+    
+    def seed(self, patterns: List[Dict]) -> None:
+        """Add built-in patterns that are not stored yet"""
+        for pattern in patterns:
+            if pattern["type"] in self._patterns:
+                continue
+            
+            seeded = CrisisPattern(
+                pattern["type"],
+                self._normalize(pattern.get("indicators", [])),
+                pattern.get("typical_severity", 5),
+                builtin=True
+            )
+            self._add(seeded)
+            self._save(seeded)
+    
+    def learn(self, indicators: Iterable[str], severity: int) -> Optional[CrisisPattern]:
+        """
+        Record the indicators of a severe crisis
+        
+        Args:
+            indicators: Indicators, most characteristic first
+            severity: Severity of the analysis they came from
+        
+        Returns:
+            The new or merged pattern, or None without indicators
+        """
+        indicators = self._normalize(indicators)[:self.max_indicators]
+        if not indicators:
+            return None
+        
+        now = time.time()
+        self._expire(now)
+        
+        existing = self._most_similar(indicators)
+        if existing is not None:
+            # Fold into the existing pattern, keeping its indicators first
+            self._remove(existing.pattern_type)
+            existing.indicators = self._normalize(
+                existing.indicators + indicators
+            )[:self.max_indicators]
+            existing.typical_severity = round(
+                (existing.typical_severity * existing.observations + severity)
+                / (existing.observations + 1)
+            )
+            existing.observations += 1
+            existing.last_used = now
+            self._add(existing)
+            self._save(existing)
+            self.merged += 1
+            logger.info(f"Merged crisis indicators into pattern: {existing.pattern_type}")
+            return existing
+        
+        digest = hashlib.blake2b(" ".join(sorted(indicators)).encode(), digest_size=4).hexdigest()
+        pattern = CrisisPattern(
+            f"learned_{datetime.now().strftime('%Y%m%d')}_{digest}",
+            indicators,
+            severity
+        )
+        self._add(pattern)
+        self._save(pattern)
+        self.learned += 1
+        logger.info(f"Learned new crisis pattern: {pattern.pattern_type}")
+        
+        self._evict()
+        return pattern
+    
+    def _most_similar(self, indicators: List[str]) -> Optional[CrisisPattern]:
+        """Pattern sharing the most indicators, if the overlap reaches the threshold"""
+        shared: Dict[str, int] = {}
+        for indicator in indicators:
+            for pattern_type in self._index.get(indicator, ()):
+                shared[pattern_type] = shared.get(pattern_type, 0) + 1
+        
+        best = None
+        best_overlap = self.merge_threshold
+        for pattern_type, count in shared.items():
+            pattern = self._patterns[pattern_type]
+            overlap = count / (len(indicators) + len(pattern.indicators) - count)
+            if overlap >= best_overlap:
+                best = pattern
+                best_overlap = overlap
+        
+        return best
+    
+    def match(self, terms: Iterable[str], k: int = 5) -> List[Dict]:
+        """
+        Find the patterns whose indicators appear among the given terms
+        
+        Args:
+            terms: Normalized words and phrases of the analyzed mentions
+            k: Maximum number of patterns returned
+        
+        Returns:
+            Matching patterns, most matched indicators first
+        """
+        self.lookups += 1
+        
+        matched: Dict[str, int] = {}
+        for term in set(terms):
+            for pattern_type in self._index.get(term, ()):
+                matched[pattern_type] = matched.get(pattern_type, 0) + 1
+        
+        ranked = sorted(
+            matched,
+            key=lambda t: (matched[t], self._patterns[t].typical_severity),
+            reverse=True
+        )[:k]
+        
+        now = time.time()
+        for pattern_type in ranked:
+            pattern = self._patterns[pattern_type]
+            pattern.hits += 1
+            pattern.last_used = now
+        
+        if ranked:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "UPDATE crisis_patterns SET hits = ?, last_used = ? WHERE pattern_type = ?",
+                    [(self._patterns[t].hits, now, t) for t in ranked]
+                )
+        
+        return [self._patterns[t].to_dict() for t in ranked]
+    
+    def get_patterns(self) -> List[Dict]:
+        """All patterns, built-in first"""
+        if self._snapshot is None:
+            self._snapshot = [
+                pattern.to_dict()
+                for pattern in sorted(self._patterns.values(), key=lambda p: not p.builtin)
+            ]
+        return self._snapshot
+    
+    def _expire(self, now: float) -> None:
+        """Drop learned patterns unused within the TTL"""
+        cutoff = now - self.ttl_seconds
+        expired = [
+            pattern.pattern_type for pattern in self._patterns.values()
+            if not pattern.builtin and pattern.last_used < cutoff
+        ]
+        if not expired:
+            return
+        
+        self.expired += len(expired)
+        self._delete(expired)
+    
+    def _evict(self) -> None:
+        """Drop the least frequently used learned patterns beyond the size limit"""
+        learned = [p for p in self._patterns.values() if not p.builtin]
+        excess = len(learned) - self.max_patterns
+        if excess <= 0:
+            return
+        
+        coldest = sorted(learned, key=lambda p: (p.hits, p.last_used))[:excess]
+        self.evictions += excess
+        self._delete([pattern.pattern_type for pattern in coldest])
+    
+    def _delete(self, pattern_types: List[str]) -> None:
+        """Delete patterns from memory and the database"""
+        for pattern_type in pattern_types:
+            self._remove(pattern_type)
+        
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM crisis_patterns WHERE pattern_type = ?",
+                [(pattern_type,) for pattern_type in pattern_types]
+            )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store size and usage statistics"""
+        builtin = sum(1 for pattern in self._patterns.values() if pattern.builtin)
+        
+        return {
+            "patterns": len(self._patterns),
+            "builtin_patterns": builtin,
+            "learned_patterns": len(self._patterns) - builtin,
+            "max_patterns": self.max_patterns,
+            "indicators": len(self._index),
+            "learned": self.learned,
+            "merged": self.merged,
+            "lookups": self.lookups,
+            "expired": self.expired,
+            "evictions": self.evictions
+        }
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self._conn.close()
@@ -0,0 +1,222 @@
+"""
+Prompt Packer - Token-budgeted selection of mentions for LLM prompts
+"""
+
+import math
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import logging
+
+import numpy as np
+
+from ..agents.crisis_detection import CrisisMention
+from .similarity_index import hash_vectorize
+
+logger = logging.getLogger(__name__)
+
+
+class PromptPacker:
+    """
+    Packs the most informative mentions into a fixed token budget
+    
+    Mentions are ranked by reach and negativity; each pick discounts the
+    remaining candidates by their similarity to what is already selected,
+    so one narrative repeated many times cannot crowd out the others.
+    Selection continues greedily until no remaining mention fits the
+    budget. Token counts come from the model's tokenizer and are cached
+    per formatted line.
+    """
+    
+    def __init__(
+        self,
+        token_budget: int = 3000,
+        model: str = "gpt-4",
+        max_content_chars: int = 500,
+        reach_weight: float = 0.6,
+        negativity_weight: float = 0.4,
+        diversity_weight: float = 0.5,
+        max_candidates: int = 500,
+        cache_size: int = 20000
+    ):
+        """
+        Initialize prompt packer
+        
+        Args:
+            token_budget: Tokens available for the formatted mentions
+            model: Model whose tokenizer is used for counting
+            max_content_chars: Mention text is cut to this many characters
+            reach_weight: Weight of log-scaled reach in the score
+            negativity_weight: Weight of negative sentiment in the score
+            diversity_weight: Score discount per unit of similarity to an
+                already selected mention
+            max_candidates: Only the highest-scoring mentions are considered
+            cache_size: Formatted lines whose token counts are cached
+        """
+        self.token_budget = token_budget
+        self.model = model
+        self.max_content_chars = max_content_chars
+        self.reach_weight = reach_weight
+        self.negativity_weight = negativity_weight
+        self.diversity_weight = diversity_weight
+        self.max_candidates = max_candidates
+        self.cache_size = cache_size
+        
+        self._encoding: Any = None
+        self._encoding_loaded = False
+        self._token_cache: "OrderedDict[str, int]" = OrderedDict()
+        
+        # Packing statistics
+        self.packs = 0
+        self.mentions_considered = 0
+        self.mentions_packed = 0
+        self.tokens_packed = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def _get_encoding(self) -> Any:
+        """Load the model's tokenizer once; None if it is unavailable"""
+        if not self._encoding_loaded:
+            self._encoding_loaded = True
+            try:
+                import tiktoken
+                self._encoding = tiktoken.encoding_for_model(self.model)
+            except Exception as e:
+                logger.warning(
+                    f"Tokenizer for {self.model} unavailable ({e}); "
+                    f"estimating token counts from length"
+                )
+        
+        return self._encoding
+    
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens of a text, using the cache"""
+        count = self._token_cache.get(text)
+        if count is not None:
+            self.cache_hits += 1
+            self._token_cache.move_to_end(text)
+            return count
+        
+        self.cache_misses += 1
+        encoding = self._get_encoding()
+        if encoding is not None:
+            count = len(encoding.encode(text, disallowed_special=()))
+        else:
+            count = math.ceil(len(text) / 4)
+        
+        self._token_cache[text] = count
+        if len(self._token_cache) > self.cache_size:
+            self._token_cache.popitem(last=False)
+        
+        return count
+    
+    def format_mention(self, mention: CrisisMention) -> str:
+        """Format one mention as a prompt line"""
+        content = mention.content
+        if len(content) > self.max_content_chars:
+            content = content[:self.max_content_chars] + "..."
+        
+        return (
+            f"[{mention.source}] @{mention.author or 'unknown'} "
+            f"(reach: {mention.reach_count}, sentiment: {mention.sentiment_score:.2f}): "
+            f"{content}"
+        )
+    
+    def _base_scores(self, mentions: List[CrisisMention]) -> np.ndarray:
+        """Score mentions by log-scaled reach and negativity, both in 0..1"""
+        reach = np.log1p(np.array([max(m.reach_count, 0) for m in mentions], dtype=np.float64))
+        if reach.max() > 0:
+            reach /= reach.max()
+        
+        negativity = np.clip(-np.array([m.sentiment_score for m in mentions]), 0.0, 1.0)
+        
+        return self.reach_weight * reach + self.negativity_weight * negativity
+    
+    def select(
+        self,
+        mentions: List[CrisisMention],
+        token_budget: Optional[int] = None
+    ) -> List[CrisisMention]:
+        """
+        Choose mentions for the prompt in priority order
+        
+        Args:
+            mentions: Candidate mentions
+            token_budget: Override the packer's budget for this call
+        
+        Returns:
+            Selected mentions, most important first
+        """
+        budget = self.token_budget if token_budget is None else token_budget
+        if not mentions or budget <= 0:
+            return []
+        
+        scores = self._base_scores(mentions)
+        candidates = np.argsort(-scores, kind="stable")[:self.max_candidates]
+        candidate_mentions = [mentions[i] for i in candidates]
+        base = scores[candidates]
+        
+        lines = [self.format_mention(m) for m in candidate_mentions]
+        # One extra token for the newline joining the lines
+        costs = np.array([self.count_tokens(line) + 1 for line in lines])
+        vectors = hash_vectorize([m.content for m in candidate_mentions])
+        
+        # Highest similarity of each candidate to anything selected so far
+        max_similarity = np.zeros(len(candidate_mentions))
+        available = costs <= budget
+        selected: List[int] = []
+        remaining = budget
+        
+        while available.any():
+            adjusted = np.where(
+                available,
+                base - self.diversity_weight * max_similarity,
+                -np.inf
+            )
+            pick = int(np.argmax(adjusted))
+            
+            selected.append(pick)
+            remaining -= int(costs[pick])
+            available[pick] = False
+            available &= costs <= remaining
+            
+            np.maximum(max_similarity, vectors @ vectors[pick], out=max_similarity)
+        
+        self.packs += 1
+        self.mentions_considered += len(mentions)
+        self.mentions_packed += len(selected)
+        self.tokens_packed += budget - remaining
+        
+        return [candidate_mentions[i] for i in selected]
+    
+    def pack(
+        self,
+        mentions: List[CrisisMention],
+        token_budget: Optional[int] = None
+    ) -> str:
+        """Format the selected mentions, noting how many were left out"""
+        selected = self.select(mentions, token_budget)
+        lines = [self.format_mention(m) for m in selected]
+        
+        omitted = len(mentions) - len(selected)
+        if omitted:
+            lines.append(f"(+{omitted} lower-priority mentions omitted)")
+        
+        return "\n".join(lines)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get packing and token cache statistics"""
+        lookups = self.cache_hits + self.cache_misses
+        
+        return {
+            "token_budget": self.token_budget,
+            "exact_counts": self._encoding is not None,
+            "packs": self.packs,
+            "avg_mentions_packed": self.mentions_packed / self.packs if self.packs else 0.0,
+            "avg_tokens_packed": self.tokens_packed / self.packs if self.packs else 0.0,
+            "packed_ratio": (
+                self.mentions_packed / self.mentions_considered
+                if self.mentions_considered else 0.0
+            ),
+            "token_cache_entries": len(self._token_cache),
+            "token_cache_hit_rate": self.cache_hits / lookups if lookups else 0.0
+        }
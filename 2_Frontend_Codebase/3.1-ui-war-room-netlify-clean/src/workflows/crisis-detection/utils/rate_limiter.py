@@ -72,12 +72,13 @@ class RateLimiter:
                 # Calculate wait time
                 wait_time = self._calculate_wait_time(tokens)
                 logger.warning(f"Rate limited: need {tokens} tokens, have {self.tokens:.2f}. Wait {wait_time:.2f}s")
-                
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                    return await self.acquire(tokens)
-                
-                return False
+        
+        # Wait outside the lock; the lock is not reentrant
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+            return await self.acquire(tokens)
+        
+        return False
     
     async def wait_for_capacity(self, tokens: int = 1) -> None:
         """
@@ -0,0 +1,294 @@
+"""
+Retrieval Store - Persistent BM25 search over past crisis analyses
+"""
+
+import heapq
+import json
+import math
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from .similarity_index import TOKEN_PATTERN
+from .storage import get_state_path
+from .tracing import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms of a text, ignoring one- and two-letter tokens"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 2]
+
+
+class RetrievalStore:
+    """
+    Local keyword retrieval over documents describing past analyses
+    
+    Each document is indexed by its term counts in an in-memory inverted
+    index and ranked with Okapi BM25, so a lookup only touches the postings
+    of the query terms and never calls a model. Query terms are scored
+    rarest first and scoring stops once a postings budget is spent, which
+    bounds lookup time when a query is mostly common words. Documents are
+    persisted in
+    SQLite and re-indexed on startup; the oldest are evicted beyond the size
+    limit or once older than the retention period.
+    """
+    
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_documents: int = 2000,
+        retention_seconds: int = 30 * 86400,
+        k1: float = 1.5,
+        b: float = 0.75,
+        max_postings_per_search: int = 10000
+    ):
+        """
+        Initialize retrieval store
+        
+        Args:
+            db_path: SQLite database file (default: state directory)
+            max_documents: Documents kept before the oldest are evicted
+            retention_seconds: Seconds a document is kept
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+            max_postings_per_search: Postings scored per lookup before the
+                remaining, more common query terms are skipped
+        """
+        self.db_path = db_path or get_state_path("analysis_history.db")
+        self.max_documents = max_documents
+        self.retention_seconds = retention_seconds
+        self.k1 = k1
+        self.b = b
+        self.max_postings_per_search = max_postings_per_search
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                terms TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        
+        # doc_id -> (namespace, summary, term counts, created_at), oldest first
+        self._documents: "OrderedDict[str, Tuple[str, str, Counter, float]]" = OrderedDict()
+        # term -> {doc_id: term frequency}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._load()
+        
+        # Lookup statistics
+        self.added = 0
+        self.searches = 0
+        self.empty_results = 0
+        self.truncated_searches = 0
+        self.evictions = 0
+        self.search_histogram = LatencyHistogram(
+            bounds_ms=[0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50]
+        )
+    
+    def __len__(self) -> int:
+        return len(self._documents)
+    
+    def _load(self) -> None:
+        """Drop expired documents and index the rest"""
+        cutoff = time.time() - self.retention_seconds
+        
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents WHERE created_at < ?", (cutoff,))
+            rows = self._conn.execute(
+                "SELECT doc_id, namespace, summary, terms, created_at FROM documents "
+                "ORDER BY created_at"
+            ).fetchall()
+        
+        for doc_id, namespace, summary, terms, created_at in rows:
+            self._index(doc_id, namespace, summary, Counter(json.loads(terms)), created_at)
+        
+        if rows:
+            logger.info(f"Indexed {len(rows)} past analyses from {self.db_path}")
+    
+    def _index(
+        self,
+        doc_id: str,
+        namespace: str,
+        summary: str,
+        terms: Counter,
+        created_at: float
+    ) -> None:
+        """Add a document to the in-memory index"""
+        self._documents[doc_id] = (namespace, summary, terms, created_at)
+        self._lengths[doc_id] = sum(terms.values())
+        self._total_length += self._lengths[doc_id]
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+    
+    def _unindex(self, doc_id: str) -> None:
+        """Remove a document from the in-memory index"""
+        _, _, terms, _ = self._documents.pop(doc_id)
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+    
+    def add(self, text: str, summary: str, namespace: str = "default") -> str:
+        """
+        Store and index a document
+        
+        Args:
+            text: Text the document is found by
+            summary: Text returned for the document by searches
+            namespace: Searches can be restricted to one namespace
+        
+        Returns:
+            The new document ID
+        """
+        doc_id = uuid.uuid4().hex
+        terms = Counter(tokenize(text))
+        now = time.time()
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO documents (doc_id, namespace, summary, terms, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (doc_id, namespace, summary, json.dumps(terms), now)
+            )
+        
+        self._index(doc_id, namespace, summary, terms, now)
+        self.added += 1
+        self._evict(now)
+        
+        return doc_id
+    
+    def search(
+        self,
+        query: str,
+        k: int = 3,
+        namespace: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the documents that best match a query
+        
+        Args:
+            query: Free-text query
+            k: Maximum number of results
+            namespace: Only search this namespace
+        
+        Returns:
+            Matching documents with their summary and BM25 score, best first
+        """
+        start = time.perf_counter()
+        
+        scores: Dict[str, float] = {}
+        total = len(self._documents)
+        postings_lists = sorted(
+            (self._postings[term] for term in set(tokenize(query)) if term in self._postings),
+            key=len
+        )
+        
+        if postings_lists:
+            # Length normalization is k1 * (1 - b + b * length / average)
+            base_norm = self.k1 * (1 - self.b)
+            length_scale = (
+                self.k1 * self.b * total / self._total_length if self._total_length else 0.0
+            )
+            budget = self.max_postings_per_search
+            
+            for postings in postings_lists:
+                if budget <= 0:
+                    self.truncated_searches += 1
+                    break
+                budget -= len(postings)
+                
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    if namespace is not None and self._documents[doc_id][0] != namespace:
+                        continue
+                    
+                    norm = base_norm + length_scale * self._lengths[doc_id]
+                    scores[doc_id] = scores.get(doc_id, 0.0) + (
+                        idf * frequency * (self.k1 + 1) / (frequency + norm)
+                    )
+        
+        results = []
+        for doc_id, score in heapq.nlargest(k, scores.items(), key=lambda item: item[1]):
+            doc_namespace, summary, _, created_at = self._documents[doc_id]
+            results.append({
+                "doc_id": doc_id,
+                "namespace": doc_namespace,
+                "summary": summary,
+                "score": score,
+                "created_at": created_at
+            })
+        
+        self.searches += 1
+        if not results:
+            self.empty_results += 1
+        self.search_histogram.observe((time.perf_counter() - start) * 1000)
+        
+        return results
+    
+    def _evict(self, now: float) -> None:
+        """Drop expired documents and the oldest beyond the size limit"""
+        cutoff = now - self.retention_seconds
+        evicted = []
+        
+        while self._documents:
+            doc_id, (_, _, _, created_at) = next(iter(self._documents.items()))
+            if created_at >= cutoff and len(self._documents) <= self.max_documents:
+                break
+            self._unindex(doc_id)
+            evicted.append(doc_id)
+        
+        if not evicted:
+            return
+        
+        self.evictions += len(evicted)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM documents WHERE doc_id = ?",
+                [(doc_id,) for doc_id in evicted]
+            )
+    
+    def clear(self) -> None:
+        """Drop every document"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents")
+        self._documents.clear()
+        self._postings.clear()
+        self._lengths.clear()
+        self._total_length = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index size and lookup statistics"""
+        return {
+            "documents": len(self._documents),
+            "max_documents": self.max_documents,
+            "terms": len(self._postings),
+            "added": self.added,
+            "evictions": self.evictions,
+            "searches": self.searches,
+            "empty_results": self.empty_results,
+            "truncated_searches": self.truncated_searches,
+            "search": self.search_histogram.to_dict()
+        }
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self._conn.close()
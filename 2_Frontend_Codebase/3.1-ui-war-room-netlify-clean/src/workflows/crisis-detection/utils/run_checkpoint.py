@@ -0,0 +1,280 @@
+"""
+Run Checkpoint Store - Durable per-node outputs for resumable workflow runs
+"""
+
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import logging
+
+from .storage import get_state_path
+
+logger = logging.getLogger(__name__)
+
+
+class RunCheckpointStore:
+    """
+    Persisted node outputs keyed by workflow run ID
+    
+    Every node that completes stores the state update it returned, so a
+    run interrupted by a crash or an error can be replayed from its initial
+    state without recomputing (or re-sending) anything that already
+    succeeded. Nodes may also store partial progress under a key, e.g. one
+    entry per delivered recipient. Finished runs are deleted straight away
+    and abandoned ones once they exceed the retention period.
+    """
+    
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        retention_seconds: int = 86400,
+        max_resume_attempts: int = 3
+    ):
+        """
+        Initialize run checkpoint store
+        
+        Args:
+            db_path: SQLite database file (default: state directory)
+            retention_seconds: Seconds an unfinished run is kept for resuming
+            max_resume_attempts: Resumes tried before a run is left to expire
+        """
+        self.db_path = db_path or get_state_path("run_checkpoints.db")
+        self.retention_seconds = retention_seconds
+        self.max_resume_attempts = max_resume_attempts
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS workflow_runs (
+                run_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                initial_state BLOB NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS workflow_runs_updated
+                ON workflow_runs (updated_at);
+            CREATE TABLE IF NOT EXISTS node_checkpoints (
+                run_id TEXT NOT NULL,
+                node TEXT NOT NULL,
+                item_key TEXT NOT NULL DEFAULT '',
+                payload BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (run_id, node, item_key)
+            );
+            """
+        )
+        self._conn.commit()
+        
+        # Statistics
+        self.runs_started = 0
+        self.runs_finished = 0
+        self.runs_failed = 0
+        self.runs_resumed = 0
+        self.node_hits = 0
+        self.node_saves = 0
+        self.pruned = 0
+    
+    def start_run(self, run_id: str, kind: str, initial_state: Any) -> None:
+        """
+        Record a new run and its initial state
+        
+        Args:
+            run_id: Unique run ID
+            kind: Graph the run executes on ("scan" or "push")
+            initial_state: State the run is (re)started from
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO workflow_runs "
+                "(run_id, kind, initial_state, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'running', ?, ?)",
+                (run_id, kind, pickle.dumps(initial_state), now, now)
+            )
+        
+        self.runs_started += 1
+        self.prune()
+    
+    def resume_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Mark a stored run as resumed
+        
+        Returns:
+            The run's kind, initial state and attempt count, or None if the
+            run is unknown or already finished
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT kind, initial_state, attempts FROM workflow_runs WHERE run_id = ?",
+                (run_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            self._conn.execute(
+                "UPDATE workflow_runs SET status = 'running', attempts = attempts + 1, "
+                "updated_at = ? WHERE run_id = ?",
+                (time.time(), run_id)
+            )
+        
+        self.runs_resumed += 1
+        return {
+            "run_id": run_id,
+            "kind": row[0],
+            "initial_state": pickle.loads(row[1]),
+            "attempts": row[2] + 1
+        }
+    
+    def finish_run(self, run_id: str) -> None:
+        """Delete a completed run together with its node checkpoints"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM node_checkpoints WHERE run_id = ?", (run_id,))
+            self._conn.execute("DELETE FROM workflow_runs WHERE run_id = ?", (run_id,))
+        
+        self.runs_finished += 1
+    
+    def fail_run(self, run_id: str, error: str) -> None:
+        """Keep a failed run's checkpoints so it can be resumed"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE workflow_runs SET status = 'failed', last_error = ?, updated_at = ? "
+                "WHERE run_id = ?",
+                (error, time.time(), run_id)
+            )
+        
+        self.runs_failed += 1
+    
+    def load(self, run_id: str, node: str, key: str = "") -> Optional[Any]:
+        """Get a node's stored output (or one keyed progress entry)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM node_checkpoints "
+                "WHERE run_id = ? AND node = ? AND item_key = ?",
+                (run_id, node, key)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        self.node_hits += 1
+        return pickle.loads(row[0])
+    
+    def load_items(self, run_id: str, node: str) -> Dict[str, Any]:
+        """Get all keyed progress entries a node stored for a run"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item_key, payload FROM node_checkpoints "
+                "WHERE run_id = ? AND node = ? AND item_key != ''",
+                (run_id, node)
+            ).fetchall()
+        
+        return {key: pickle.loads(payload) for key, payload in rows}
+    
+    def save(self, run_id: str, node: str, output: Any, key: str = "") -> None:
+        """
+        Store a node's output for a run
+        
+        Args:
+            run_id: Run the node executed in
+            node: Node name
+            output: State update the node returned
+            key: Store partial progress under this key instead
+        """
+        now = time.time()
+        payload = pickle.dumps(output)
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO node_checkpoints "
+                "(run_id, node, item_key, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, node, key, payload, now)
+            )
+            self._conn.execute(
+                "UPDATE workflow_runs SET updated_at = ? WHERE run_id = ?",
+                (now, run_id)
+            )
+        
+        self.node_saves += 1
+    
+    def get_incomplete_runs(self) -> List[Dict[str, Any]]:
+        """Get unfinished runs that may still be resumed, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.run_id, r.kind, r.status, r.attempts, r.last_error, r.updated_at, "
+                "(SELECT COUNT(*) FROM node_checkpoints c WHERE c.run_id = r.run_id) "
+                "FROM workflow_runs r WHERE r.attempts < ? ORDER BY r.created_at",
+                (self.max_resume_attempts,)
+            ).fetchall()
+        
+        return [
+            {
+                "run_id": run_id,
+                "kind": kind,
+                "status": status,
+                "attempts": attempts,
+                "last_error": last_error,
+                "updated_at": updated_at,
+                "checkpoints": checkpoints
+            }
+            for run_id, kind, status, attempts, last_error, updated_at, checkpoints in rows
+        ]
+    
+    def prune(self) -> int:
+        """
+        Delete runs not updated within the retention period
+        
+        Returns:
+            Number of runs deleted
+        """
+        cutoff = time.time() - self.retention_seconds
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM node_checkpoints WHERE run_id IN "
+                "(SELECT run_id FROM workflow_runs WHERE updated_at < ?)",
+                (cutoff,)
+            )
+            deleted = self._conn.execute(
+                "DELETE FROM workflow_runs WHERE updated_at < ?",
+                (cutoff,)
+            ).rowcount
+        
+        if deleted:
+            self.pruned += deleted
+            logger.info(f"Pruned {deleted} expired workflow run checkpoints")
+        
+        return deleted
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get run, resume and checkpoint hit statistics"""
+        with self._lock:
+            stored_runs = self._conn.execute(
+                "SELECT COUNT(*) FROM workflow_runs"
+            ).fetchone()[0]
+            stored_nodes = self._conn.execute(
+                "SELECT COUNT(*) FROM node_checkpoints"
+            ).fetchone()[0]
+        
+        return {
+            "runs_started": self.runs_started,
+            "runs_finished": self.runs_finished,
+            "runs_failed": self.runs_failed,
+            "runs_resumed": self.runs_resumed,
+            "node_hits": self.node_hits,
+            "node_saves": self.node_saves,
+            "pruned": self.pruned,
+            "stored_runs": stored_runs,
+            "stored_checkpoints": stored_nodes
+        }
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self._conn.close()
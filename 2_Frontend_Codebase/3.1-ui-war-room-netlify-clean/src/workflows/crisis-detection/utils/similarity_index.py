@@ -0,0 +1,410 @@
+"""
+Mention Similarity Index - Local hashed-vector search over past mentions
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+import logging
+
+import numpy as np
+
+from ..agents.crisis_detection import CrisisMention
+from .storage import get_state_path
+
+logger = logging.getLogger(__name__)
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9@#']+")
+
+
+def hash_vectorize(texts: List[str], n_features: int = 512) -> np.ndarray:
+    """
+    Embed texts as L2-normalized signed feature-hashing vectors
+    
+    Unigrams and bigrams are hashed with CRC32, which is stable across
+    processes, so vectors written to disk stay comparable after a restart.
+    """
+    matrix = np.zeros((len(texts), n_features), dtype=np.float32)
+    
+    for row, text in enumerate(texts):
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        
+        for feature in features:
+            h = zlib.crc32(feature.encode())
+            matrix[row, h % n_features] += 1.0 if (h >> 31) & 1 else -1.0
+    
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    
+    return matrix
+
+
+class MentionSimilarityIndex:
+    """
+    In-process similarity index over previously seen mentions
+    
+    Vectors live in a NumPy matrix backed by a memory-mapped file that grows
+    by doubling up to max_mentions rows; once full, each new mention
+    overwrites the oldest row. Mention metadata is kept in an append-only
+    JSON lines sidecar, compacted when superseded records pile up. Every
+    mention belongs to a namespace (e.g. a campaign) and queries can be
+    restricted to one. Queries are batched into one matrix product with
+    top-k selection by argpartition.
+    
+    Adds are serialized by a lock. Queries only hold it to snapshot the
+    index and to re-check their matches, so they score in parallel
+    with each other and with adds.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        n_features: int = 512,
+        initial_capacity: int = 4096,
+        max_mentions: int = 100000,
+        persist: bool = True
+    ):
+        """
+        Initialize similarity index
+        
+        Args:
+            path: Base path for the vector and metadata files
+                (default: state directory)
+            n_features: Dimensionality of the hashed vectors
+            initial_capacity: Rows allocated before the first resize
+            max_mentions: Mentions kept before the oldest are overwritten
+            persist: Keep the index on disk; otherwise hold it in memory
+        """
+        self.n_features = n_features
+        self.max_mentions = max_mentions
+        self.persist = persist
+        self.path = path or (get_state_path("mention_index") if persist else None)
+        
+        initial_capacity = min(initial_capacity, max_mentions)
+        
+        self._size = 0
+        # Row overwritten next once the index is full
+        self._cursor = 0
+        self._seq = 0
+        self._metadata: List[Dict[str, Any]] = []
+        # (namespace, mention_id) -> row
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._namespace_codes: Dict[str, int] = {}
+        self._row_namespaces = np.full(initial_capacity, -1, dtype=np.int32)
+        self._log_records = 0
+        self._lock = threading.Lock()
+        
+        # Index statistics
+        self.evictions = 0
+        
+        if self.persist:
+            self._vectors_path = f"{self.path}.vectors"
+            self._metadata_path = f"{self.path}.meta.jsonl"
+            self._load(initial_capacity)
+        else:
+            self._vectors = np.zeros((initial_capacity, n_features), dtype=np.float32)
+    
+    def _load(self, initial_capacity: int) -> None:
+        """Open the memory-mapped vectors and load existing metadata"""
+        row_bytes = self.n_features * np.dtype(np.float32).itemsize
+        existing_rows = (
+            os.path.getsize(self._vectors_path) // row_bytes
+            if os.path.exists(self._vectors_path) else 0
+        )
+        usable_rows = min(existing_rows, self.max_mentions)
+        
+        # Later records for a row supersede earlier ones; records written
+        # before rows were tracked are in row order
+        by_row: Dict[int, Dict[str, Any]] = {}
+        if os.path.exists(self._metadata_path):
+            with open(self._metadata_path, "r") as f:
+                for line_number, line in enumerate(f):
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    record.setdefault("row", line_number)
+                    record.setdefault("seq", line_number)
+                    record.setdefault("namespace", "default")
+                    self._log_records += 1
+                    if record["row"] < usable_rows:
+                        by_row[record["row"]] = record
+        
+        # Only rows with metadata were fully written
+        while self._size in by_row:
+            self._size += 1
+        
+        self._vectors = self._open_memmap(
+            min(max(initial_capacity, existing_rows), self.max_mentions)
+        )
+        self._row_namespaces = np.full(self._vectors.shape[0], -1, dtype=np.int32)
+        
+        self._metadata = [by_row[row] for row in range(self._size)]
+        for row, record in enumerate(self._metadata):
+            self._rows[(record["namespace"], record["mention_id"])] = row
+            self._row_namespaces[row] = self._namespace_code(record["namespace"])
+        
+        if self._metadata:
+            newest = max(self._metadata, key=lambda record: record["seq"])
+            self._seq = newest["seq"] + 1
+            self._cursor = (newest["row"] + 1) % self.max_mentions
+        if self._size < self.max_mentions:
+            self._cursor = self._size
+        
+        if self._log_records != self._size:
+            self._rewrite_metadata()
+        
+        if self._size:
+            logger.info(f"Loaded similarity index with {self._size} mentions from {self.path}")
+    
+    def _rewrite_metadata(self) -> None:
+        """Atomically rewrite the metadata sidecar from memory"""
+        tmp_path = f"{self._metadata_path}.tmp"
+        with open(tmp_path, "w") as f:
+            for record in self._metadata:
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp_path, self._metadata_path)
+        self._log_records = len(self._metadata)
+    
+    def _open_memmap(self, capacity: int) -> np.memmap:
+        """Map the vector file, extending it to the requested capacity"""
+        row_bytes = self.n_features * np.dtype(np.float32).itemsize
+        required = capacity * row_bytes
+        
+        mode = "r+" if os.path.exists(self._vectors_path) else "w+"
+        if mode == "r+" and os.path.getsize(self._vectors_path) < required:
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(required)
+        
+        return np.memmap(
+            self._vectors_path,
+            dtype=np.float32,
+            mode=mode,
+            shape=(capacity, self.n_features)
+        )
+    
+    def _ensure_capacity(self, rows: int) -> None:
+        """Grow the vector matrix by doubling until rows fit, up to max_mentions"""
+        capacity = self._vectors.shape[0]
+        if rows <= capacity:
+            return
+        
+        while capacity < rows:
+            capacity *= 2
+        capacity = min(capacity, self.max_mentions)
+        
+        if self.persist:
+            self._vectors.flush()
+            del self._vectors
+            self._vectors = self._open_memmap(capacity)
+        else:
+            grown = np.zeros((capacity, self.n_features), dtype=np.float32)
+            grown[:self._size] = self._vectors[:self._size]
+            self._vectors = grown
+        
+        namespaces = np.full(capacity, -1, dtype=np.int32)
+        namespaces[:self._size] = self._row_namespaces[:self._size]
+        self._row_namespaces = namespaces
+    
+    def _namespace_code(self, namespace: str) -> int:
+        """Integer code of a namespace, assigned on first use"""
+        if namespace not in self._namespace_codes:
+            self._namespace_codes[namespace] = len(self._namespace_codes)
+        return self._namespace_codes[namespace]
+    
+    def _claim_rows(self, count: int) -> List[int]:
+        """Rows for new mentions: free rows first, then the oldest in use"""
+        free = min(count, self.max_mentions - self._size)
+        rows = list(range(self._size, self._size + free))
+        if free:
+            self._ensure_capacity(self._size + free)
+            self._size += free
+            self._cursor = self._size % self.max_mentions
+        
+        for _ in range(count - free):
+            row = self._cursor
+            evicted = self._metadata[row]
+            self._rows.pop((evicted["namespace"], evicted["mention_id"]), None)
+            self.evictions += 1
+            rows.append(row)
+            self._cursor = (row + 1) % self.max_mentions
+        
+        return rows
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def add(self, mentions: List[CrisisMention], namespace: str = "default") -> int:
+        """
+        Index mentions that are not yet indexed in a namespace
+        
+        Returns:
+            Number of mentions added
+        """
+        with self._lock:
+            return self._add(mentions, namespace)
+    
+    def _add(self, mentions: List[CrisisMention], namespace: str) -> int:
+        """Index new mentions; the caller holds the lock"""
+        new_mentions = []
+        batch_ids: Set[str] = set()
+        for mention in mentions:
+            if (
+                mention.mention_id
+                and (namespace, mention.mention_id) not in self._rows
+                and mention.mention_id not in batch_ids
+            ):
+                batch_ids.add(mention.mention_id)
+                new_mentions.append(mention)
+        
+        # A batch larger than the index only keeps its newest mentions
+        new_mentions = new_mentions[-self.max_mentions:]
+        if not new_mentions:
+            return 0
+        
+        vectors = hash_vectorize([m.content for m in new_mentions], self.n_features)
+        rows = self._claim_rows(len(new_mentions))
+        
+        self._vectors[rows] = vectors
+        self._row_namespaces[rows] = self._namespace_code(namespace)
+        
+        records = []
+        for row, m in zip(rows, new_mentions):
+            record = {
+                "mention_id": m.mention_id,
+                "namespace": namespace,
+                "row": row,
+                "seq": self._seq,
+                "source": m.source,
+                "author": m.author,
+                "url": m.url,
+                "content": m.content[:200],
+                "sentiment_score": m.sentiment_score,
+                "reach_count": m.reach_count,
+                "published_at": m.published_at.isoformat()
+            }
+            self._seq += 1
+            self._rows[(namespace, m.mention_id)] = row
+            if row < len(self._metadata):
+                self._metadata[row] = record
+            else:
+                self._metadata.append(record)
+            records.append(record)
+        
+        if self.persist:
+            # Vectors are flushed before metadata so a crash never leaves
+            # metadata pointing at unwritten rows
+            self._vectors.flush()
+            if self._log_records + len(records) > 2 * self._size:
+                # Mostly superseded records; rewrite the live ones
+                self._rewrite_metadata()
+            else:
+                with open(self._metadata_path, "a") as f:
+                    for record in records:
+                        f.write(json.dumps(record) + "\n")
+                self._log_records += len(records)
+        
+        return len(new_mentions)
+    
+    def query(
+        self,
+        mentions: List[CrisisMention],
+        top_k: int = 5,
+        min_similarity: float = 0.3,
+        namespace: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Find the most similar indexed mentions for a batch of mentions
+        
+        Args:
+            mentions: Query mentions
+            top_k: Maximum matches per mention
+            min_similarity: Cosine similarity a match must reach
+            namespace: Only match mentions indexed in this namespace
+        
+        Returns:
+            One list of matches per query mention, most similar first
+        """
+        if not mentions:
+            return []
+        
+        # Snapshot the rows in use and their metadata; an add running
+        # while the scores are computed may overwrite ring rows
+        with self._lock:
+            size = self._size
+            vectors = self._vectors[:size]
+            metadata = self._metadata[:size]
+            code = self._namespace_codes.get(namespace)
+            other_namespaces = (
+                self._row_namespaces[:size] != code
+                if namespace is not None else None
+            )
+        
+        if not size or (namespace is not None and code is None):
+            return [[] for _ in mentions]
+        
+        queries = hash_vectorize([m.content for m in mentions], self.n_features)
+        # Score every row in place rather than copying one namespace's rows
+        scores = queries @ vectors.T
+        if other_namespaces is not None:
+            scores[:, other_namespaces] = -np.inf
+        
+        k = min(top_k, size)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        
+        results = []
+        for row, mention in enumerate(mentions):
+            ranked = top[row][np.argsort(-scores[row, top[row]])]
+            
+            matches = []
+            for index in ranked:
+                similarity = float(scores[row, index])
+                if similarity < min_similarity:
+                    break
+                
+                record = metadata[index]
+                if record["mention_id"] == mention.mention_id:
+                    continue
+                matches.append((index, record, similarity))
+            
+            results.append(matches)
+        
+        # Drop matches whose row was overwritten while scoring: its score
+        # belongs to the new mention, not the snapshotted record
+        with self._lock:
+            results = [
+                [
+                    (record, similarity) for index, record, similarity in matches
+                    if self._metadata[index] is record
+                ]
+                for matches in results
+            ]
+        
+        return [
+            [
+                {
+                    **{key: value for key, value in record.items() if key not in ("row", "seq")},
+                    "similarity": similarity
+                }
+                for record, similarity in matches
+            ]
+            for matches in results
+        ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index size statistics"""
+        return {
+            "mentions": self._size,
+            "capacity": self._vectors.shape[0],
+            "max_mentions": self.max_mentions,
+            "namespaces": len(self._namespace_codes),
+            "evictions": self.evictions,
+            "n_features": self.n_features,
+            "persisted": self.persist,
+            "path": self.path
+        }
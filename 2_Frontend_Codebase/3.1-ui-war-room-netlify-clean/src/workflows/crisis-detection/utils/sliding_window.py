@@ -0,0 +1,313 @@
+"""
+Sliding Window Aggregates - Streaming mention velocity and sentiment per campaign
+"""
+
+import math
+from typing import Any, Dict, Iterable, Optional, Tuple
+from datetime import datetime
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MentionWindowAggregator:
+    """
+    Streaming mention aggregates over fixed time buckets
+    
+    Each bucket holds counts, reach and reach-weighted sentiment for one
+    time slice, stored in NumPy ring buffers that are reused in place once
+    they fall out of the horizon. Adding a mention is O(1), a batch is
+    folded with one sort and segment sums, and window queries are computed
+    over the buckets in the window, never the mentions.
+    """
+    
+    def __init__(
+        self,
+        bucket_seconds: int = 300,
+        horizon_seconds: int = 86400,
+        ewma_alpha: float = 0.3
+    ):
+        """
+        Initialize window aggregator
+        
+        Args:
+            bucket_seconds: Width of one time bucket
+            horizon_seconds: How much history the ring buffers retain
+            ewma_alpha: Smoothing factor for velocity (higher reacts faster)
+        """
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = max(1, math.ceil(horizon_seconds / bucket_seconds))
+        self.ewma_alpha = ewma_alpha
+        
+        n = self.num_buckets
+        self._bucket_ids = np.full(n, -1, dtype=np.int64)
+        self._counts = np.zeros(n, dtype=np.int64)
+        self._positive = np.zeros(n, dtype=np.int64)
+        self._negative = np.zeros(n, dtype=np.int64)
+        self._reach = np.zeros(n, dtype=np.int64)
+        self._weights = np.zeros(n, dtype=np.float64)
+        self._weighted_sentiment = np.zeros(n, dtype=np.float64)
+        
+        self._latest_bucket = -1
+        self.total_added = 0
+        self.dropped_late = 0
+    
+    def __len__(self) -> int:
+        return self.total_added
+    
+    def add(
+        self,
+        published_at: datetime,
+        sentiment_score: float,
+        reach_count: int = 0
+    ) -> bool:
+        """
+        Fold one mention into its time bucket
+        
+        Returns:
+            False if the mention is older than the retained horizon
+        """
+        bucket_id = int(published_at.timestamp() // self.bucket_seconds)
+        if bucket_id <= self._latest_bucket - self.num_buckets:
+            self.dropped_late += 1
+            return False
+        
+        if bucket_id > self._latest_bucket:
+            self._latest_bucket = bucket_id
+        
+        slot = self._claim_slot(bucket_id)
+        
+        # Zero-reach mentions still carry a minimal weight so sentiment is
+        # always defined
+        weight = max(reach_count, 1)
+        
+        self._counts[slot] += 1
+        self._reach[slot] += reach_count
+        self._weights[slot] += weight
+        self._weighted_sentiment[slot] += sentiment_score * weight
+        if sentiment_score > 0.3:
+            self._positive[slot] += 1
+        elif sentiment_score < -0.3:
+            self._negative[slot] += 1
+        
+        self.total_added += 1
+        return True
+    
+    def _claim_slot(self, bucket_id: int) -> int:
+        """Ring slot for a bucket, reclaiming one last used a horizon ago"""
+        slot = bucket_id % self.num_buckets
+        if self._bucket_ids[slot] != bucket_id:
+            self._bucket_ids[slot] = bucket_id
+            self._counts[slot] = 0
+            self._positive[slot] = 0
+            self._negative[slot] = 0
+            self._reach[slot] = 0
+            self._weights[slot] = 0.0
+            self._weighted_sentiment[slot] = 0.0
+        return slot
+    
+    def add_batch(self, batch: Any) -> int:
+        """
+        Fold a columnar MentionBatch, skipping updates to already-counted ones
+        
+        Rows are sorted by bucket once and every column is summed per bucket
+        in a single segmented reduction, so there is no per-mention or
+        per-bucket Python work.
+        
+        Returns:
+            Number of mentions added
+        """
+        fresh = ~batch.is_update
+        if not fresh.any():
+            return 0
+        
+        bucket_ids = (batch.published_ts[fresh] // self.bucket_seconds).astype(np.int64)
+        sentiment = batch.sentiment[fresh]
+        reach = batch.reach[fresh]
+        
+        latest = max(self._latest_bucket, int(bucket_ids.max()))
+        in_horizon = bucket_ids > latest - self.num_buckets
+        self.dropped_late += int((~in_horizon).sum())
+        if not in_horizon.any():
+            return 0
+        self._latest_bucket = latest
+        
+        order = np.argsort(bucket_ids[in_horizon], kind="stable")
+        bucket_ids = bucket_ids[in_horizon][order]
+        sentiment = sentiment[in_horizon][order]
+        reach = reach[in_horizon][order]
+        weights = np.maximum(reach, 1).astype(np.float64)
+        
+        # Segment boundaries of the sorted buckets; in-horizon buckets map
+        # to distinct ring slots
+        starts = np.flatnonzero(np.r_[True, bucket_ids[1:] != bucket_ids[:-1]])
+        buckets = bucket_ids[starts]
+        slots = buckets % self.num_buckets
+        
+        counts, positive, negative, reach_sums, weight_sums, weighted_sums = np.add.reduceat(
+            np.vstack([
+                np.ones(len(bucket_ids)),
+                sentiment > 0.3,
+                sentiment < -0.3,
+                reach,
+                weights,
+                sentiment * weights
+            ]),
+            starts,
+            axis=1
+        )
+        
+        # Reclaim slots last used a horizon ago
+        reclaimed = self._bucket_ids[slots] != buckets
+        stale = slots[reclaimed]
+        self._bucket_ids[stale] = buckets[reclaimed]
+        for column in (
+            self._counts, self._positive, self._negative,
+            self._reach, self._weights, self._weighted_sentiment
+        ):
+            column[stale] = 0
+        
+        self._counts[slots] += counts.astype(np.int64)
+        self._positive[slots] += positive.astype(np.int64)
+        self._negative[slots] += negative.astype(np.int64)
+        self._reach[slots] += reach_sums.astype(np.int64)
+        self._weights[slots] += weight_sums
+        self._weighted_sentiment[slots] += weighted_sums
+        
+        added = len(bucket_ids)
+        self.total_added += added
+        return added
+    
+    def add_mentions(self, mentions: Iterable[Any]) -> int:
+        """
+        Fold a batch of mentions, skipping updates to already-counted ones
+        
+        Accepts CrisisMention objects or their dict form.
+        
+        Returns:
+            Number of mentions added
+        """
+        added = 0
+        for mention in mentions:
+            if isinstance(mention, dict):
+                if mention.get("is_update", False) or not mention.get("published_at"):
+                    continue
+                fields = (
+                    mention["published_at"],
+                    mention.get("sentiment_score", 0),
+                    mention.get("reach_count", 0)
+                )
+            else:
+                if mention.is_update:
+                    continue
+                fields = (mention.published_at, mention.sentiment_score, mention.reach_count)
+            
+            if self.add(*fields):
+                added += 1
+        
+        return added
+    
+    def _window_buckets(
+        self,
+        window_seconds: float,
+        now: Optional[datetime]
+    ) -> Tuple[np.ndarray, np.ndarray, float]:
+        """Slots covering the window oldest first, which of them are live, and the elapsed part of the newest"""
+        now_ts = (now or datetime.now()).timestamp()
+        end_bucket = int(now_ts // self.bucket_seconds)
+        n = min(self.num_buckets, max(1, math.ceil(window_seconds / self.bucket_seconds)))
+        
+        bucket_ids = np.arange(end_bucket - n + 1, end_bucket + 1, dtype=np.int64)
+        slots = bucket_ids % self.num_buckets
+        live = self._bucket_ids[slots] == bucket_ids
+        
+        current_elapsed = now_ts - end_bucket * self.bucket_seconds
+        return slots, live, current_elapsed
+    
+    def window_stats(
+        self,
+        window_seconds: float = 3600,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Aggregate velocity and sentiment over the most recent window
+        
+        Velocity is an EWMA of per-bucket mention rates (mentions/hour);
+        acceleration is its change since the middle of the window.
+        """
+        slots, live, current_elapsed = self._window_buckets(window_seconds, now)
+        hours_per_bucket = self.bucket_seconds / 3600
+        
+        counts = np.where(live, self._counts[slots], 0)
+        weights = np.where(live, self._weights[slots], 0.0)
+        weighted_sentiment = np.where(live, self._weighted_sentiment[slots], 0.0)
+        count = int(counts.sum())
+        positive = int(self._positive[slots][live].sum())
+        negative = int(self._negative[slots][live].sum())
+        reach = int(self._reach[slots][live].sum())
+        total_weight = float(weights.sum())
+        
+        # The newest bucket is still filling; rate it over its elapsed time,
+        # but at least half a bucket so a single early mention does not read
+        # as a spike
+        rates = counts / hours_per_bucket
+        rates[-1] = counts[-1] / (max(current_elapsed, self.bucket_seconds / 2) / 3600)
+        
+        mid_index = len(slots) // 2 - 1
+        velocity = self._ewma(rates, len(rates) - 1)
+        
+        active = counts > 0
+        
+        return {
+            "window_seconds": window_seconds,
+            "mention_count": count,
+            "total_reach": reach,
+            "positive_ratio": positive / count if count else 0,
+            "negative_ratio": negative / count if count else 0,
+            "weighted_sentiment": (
+                float(weighted_sentiment.sum()) / total_weight if total_weight else 0.0
+            ),
+            "sentiment_trend": self._sentiment_trend(
+                weighted_sentiment[active],
+                weights[active]
+            ),
+            "velocity": velocity,
+            "window_velocity": count / (len(slots) * hours_per_bucket),
+            "acceleration": (
+                velocity - self._ewma(rates, mid_index) if mid_index >= 0 else 0.0
+            )
+        }
+    
+    def _ewma(self, rates: np.ndarray, index: int) -> float:
+        """EWMA of rates up to and including index, seeded with the first rate"""
+        decay = (1 - self.ewma_alpha) ** np.arange(index, -1, -1)
+        coefficients = self.ewma_alpha * decay
+        coefficients[0] = decay[0]
+        return float(coefficients @ rates[:index + 1])
+    
+    def _sentiment_trend(self, weighted_sentiment: np.ndarray, weights: np.ndarray) -> str:
+        """Compare reach-weighted sentiment of the earliest and latest active buckets"""
+        if len(weights) < 2:
+            return "stable"
+        
+        third = max(1, len(weights) // 3)
+        first = weighted_sentiment[:third].sum() / weights[:third].sum()
+        last = weighted_sentiment[-third:].sum() / weights[-third:].sum()
+        
+        if last < first - 0.2:
+            return "declining"
+        elif last > first + 0.2:
+            return "improving"
+        else:
+            return "stable"
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get aggregator configuration and volume statistics"""
+        return {
+            "bucket_seconds": self.bucket_seconds,
+            "buckets": self.num_buckets,
+            "total_added": self.total_added,
+            "dropped_late": self.dropped_late
+        }
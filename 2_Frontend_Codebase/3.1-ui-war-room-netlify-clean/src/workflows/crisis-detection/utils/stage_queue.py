@@ -0,0 +1,257 @@
+"""
+Stage Queue - Bounded mention queue with backpressure and load shedding
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+import logging
+
+from ..agents.crisis_detection import CrisisMention
+from .tracing import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+# What producers do when the queue fills up
+SHED_POLICIES = ("block", "drop_low_reach", "summarize")
+
+
+class QueuedBatch:
+    """Mentions waiting for a downstream stage, with their campaign context"""
+    
+    def __init__(
+        self,
+        mentions: List[CrisisMention],
+        campaign_context: Dict[str, Any],
+        enqueued_at: float
+    ):
+        self.mentions = mentions
+        self.campaign_context = campaign_context
+        self.enqueued_at = enqueued_at
+
+
+class MentionStageQueue:
+    """
+    Bounded queue of mention batches between two pipeline stages
+    
+    Capacity is counted in mentions rather than batches. Once the queue is
+    filled past the shedding threshold, low-reach mentions in new batches
+    are dropped or folded into a single digest mention, depending on the
+    policy; producers wait for space when a batch still does not fit.
+    """
+    
+    def __init__(
+        self,
+        max_mentions: int = 2000,
+        policy: str = "drop_low_reach",
+        shed_threshold: float = 0.8,
+        min_reach: int = 1000,
+        name: str = "analysis"
+    ):
+        """
+        Initialize stage queue
+        
+        Args:
+            max_mentions: Mentions held before producers have to wait
+            policy: "block" (only wait), "drop_low_reach" or "summarize"
+            shed_threshold: Fill ratio above which low-reach mentions are shed
+            min_reach: Mentions below this reach are shed under load
+            name: Stage name used in logs and statistics
+        """
+        if policy not in SHED_POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(SHED_POLICIES)}")
+        
+        self.max_mentions = max_mentions
+        self.policy = policy
+        self.shed_threshold = shed_threshold
+        self.min_reach = min_reach
+        self.name = name
+        
+        self._items: Deque[QueuedBatch] = deque()
+        self._depth = 0
+        self._condition = asyncio.Condition()
+        self._closed = False
+        
+        # Queue statistics
+        self.max_depth_seen = 0
+        self.enqueued_mentions = 0
+        self.dequeued_mentions = 0
+        self.dropped_mentions = 0
+        self.summarized_mentions = 0
+        self.digests_created = 0
+        self.producer_waits = 0
+        self.producer_wait_seconds = 0.0
+        self.wait_histogram = LatencyHistogram()
+    
+    def __len__(self) -> int:
+        return self._depth
+    
+    def _fits(self, count: int) -> bool:
+        """Whether a batch fits; an empty queue always takes one batch"""
+        return self._depth == 0 or self._depth + count <= self.max_mentions
+    
+    async def put(
+        self,
+        mentions: List[CrisisMention],
+        campaign_context: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Queue a batch of mentions, shedding or waiting as the policy says
+        
+        Returns:
+            Number of mentions queued after shedding
+        """
+        if self._closed:
+            raise RuntimeError(f"{self.name} queue is closed")
+        if not mentions:
+            return 0
+        
+        async with self._condition:
+            if (
+                self.policy != "block"
+                and self._depth + len(mentions) > self.shed_threshold * self.max_mentions
+            ):
+                mentions = self._shed(mentions)
+                if not mentions:
+                    return 0
+            
+            if not self._fits(len(mentions)):
+                # Backpressure: the producer waits for consumers to catch up
+                self.producer_waits += 1
+                start = time.perf_counter()
+                await self._condition.wait_for(
+                    lambda: self._closed or self._fits(len(mentions))
+                )
+                self.producer_wait_seconds += time.perf_counter() - start
+                
+                if self._closed:
+                    raise RuntimeError(f"{self.name} queue is closed")
+            
+            self._items.append(QueuedBatch(
+                mentions=mentions,
+                campaign_context=campaign_context or {},
+                enqueued_at=time.perf_counter()
+            ))
+            self._depth += len(mentions)
+            self.enqueued_mentions += len(mentions)
+            self.max_depth_seen = max(self.max_depth_seen, self._depth)
+            self._condition.notify_all()
+        
+        return len(mentions)
+    
+    async def get(self, max_mentions: Optional[int] = None) -> Optional[QueuedBatch]:
+        """
+        Take the oldest batch, coalescing queued batches of the same campaign
+        
+        Args:
+            max_mentions: Upper bound on mentions merged into one batch
+        
+        Returns:
+            The next batch, or None once the queue is closed and drained
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._items or self._closed)
+            if not self._items:
+                return None
+            
+            now = time.perf_counter()
+            first = self._items.popleft()
+            mentions = list(first.mentions)
+            self.wait_histogram.observe((now - first.enqueued_at) * 1000)
+            
+            while (
+                max_mentions
+                and self._items
+                and self._items[0].campaign_context == first.campaign_context
+                and len(mentions) + len(self._items[0].mentions) <= max_mentions
+            ):
+                queued = self._items.popleft()
+                mentions.extend(queued.mentions)
+                self.wait_histogram.observe((now - queued.enqueued_at) * 1000)
+            
+            self._depth -= len(mentions)
+            self.dequeued_mentions += len(mentions)
+            self._condition.notify_all()
+        
+        return QueuedBatch(
+            mentions=mentions,
+            campaign_context=first.campaign_context,
+            enqueued_at=first.enqueued_at
+        )
+    
+    async def close(self) -> None:
+        """Stop accepting mentions; consumers drain what is already queued"""
+        async with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+    
+    def _shed(self, mentions: List[CrisisMention]) -> List[CrisisMention]:
+        """Drop or summarize the low-reach mentions of a batch"""
+        kept = [m for m in mentions if m.reach_count >= self.min_reach]
+        shed = [m for m in mentions if m.reach_count < self.min_reach]
+        if not shed:
+            return mentions
+        
+        if self.policy == "drop_low_reach":
+            self.dropped_mentions += len(shed)
+            logger.debug(f"{self.name} queue under load: dropped {len(shed)} low-reach mentions")
+            return kept
+        
+        self.summarized_mentions += len(shed)
+        self.digests_created += 1
+        logger.debug(f"{self.name} queue under load: summarized {len(shed)} low-reach mentions")
+        return kept + [self._summarize(shed)]
+    
+    def _summarize(self, mentions: List[CrisisMention]) -> CrisisMention:
+        """Fold low-reach mentions into one digest mention"""
+        digest_id = hashlib.blake2b(
+            "|".join(m.mention_id for m in mentions).encode(),
+            digest_size=8
+        ).hexdigest()
+        
+        # Reach-weighted sentiment, falling back to a plain mean
+        total_reach = sum(m.reach_count for m in mentions)
+        if total_reach:
+            sentiment = sum(m.sentiment_score * m.reach_count for m in mentions) / total_reach
+        else:
+            sentiment = sum(m.sentiment_score for m in mentions) / len(mentions)
+        
+        samples = sorted(mentions, key=lambda m: m.engagement_count, reverse=True)[:5]
+        keywords = Counter(k for m in mentions for k in m.keywords)
+        
+        return CrisisMention(
+            mention_id=f"digest-{digest_id}",
+            content=(
+                f"[Digest of {len(mentions)} low-reach mentions] "
+                + " | ".join(m.content[:80] for m in samples)
+            ),
+            source="digest",
+            sentiment_score=max(-1.0, min(1.0, sentiment)),
+            reach_count=total_reach,
+            engagement_count=sum(m.engagement_count for m in mentions),
+            published_at=max(m.published_at for m in mentions),
+            keywords=[keyword for keyword, _ in keywords.most_common(10)]
+        )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get depth, shedding and wait-time statistics"""
+        return {
+            "name": self.name,
+            "policy": self.policy,
+            "depth": self._depth,
+            "batches": len(self._items),
+            "max_mentions": self.max_mentions,
+            "utilization": self._depth / self.max_mentions if self.max_mentions else 0.0,
+            "max_depth_seen": self.max_depth_seen,
+            "enqueued_mentions": self.enqueued_mentions,
+            "dequeued_mentions": self.dequeued_mentions,
+            "dropped_mentions": self.dropped_mentions,
+            "summarized_mentions": self.summarized_mentions,
+            "digests_created": self.digests_created,
+            "producer_waits": self.producer_waits,
+            "producer_wait_seconds": self.producer_wait_seconds,
+            "wait": self.wait_histogram.to_dict()
+        }
@@ -15,17 +15,24 @@ class WorkflowState(BaseModel):
     
     # Workflow timestamps
     timestamp: datetime = Field(default_factory=datetime.now)
+    run_id: Optional[str] = None
     
     # Input data
     mentions: List[CrisisMention] = []
     campaign_context: Dict[str, Any] = {}
     
     # Processing data
+    keyword_matches: Dict[str, Dict[str, List[str]]] = {}
     enriched_mentions: List[Dict] = []
     source_count: int = 0
     
+    # Deterministic pre-LLM triage
+    triage: Dict[str, Any] = {}
+    triage_score: Optional[int] = None
+    
     # Analysis results
     analysis: Optional[CrisisAnalysis] = None
+    narratives: List[Dict[str, Any]] = []
     severity: int = 0
     threat_detected: bool = False
     
@@ -40,6 +47,9 @@ class WorkflowState(BaseModel):
     # Learning data
     learning_data: Optional[Dict] = None
     
+    # Per-stage timings in milliseconds
+    stage_timings: Dict[str, float] = {}
+    
     # Error handling
     error: Optional[str] = None
     
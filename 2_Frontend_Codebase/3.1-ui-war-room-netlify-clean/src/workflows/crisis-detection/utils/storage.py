@@ -0,0 +1,14 @@
+"""
+Local storage locations for persisted workflow state
+"""
+
+import os
+
+# Directory holding checkpoints, caches and indexes that survive restarts
+DEFAULT_STATE_DIR = os.getenv("CRISIS_DETECTION_STATE_DIR", ".crisis_detection")
+
+
+def get_state_path(filename: str, state_dir: str = DEFAULT_STATE_DIR) -> str:
+    """Get the path of a persisted state file, creating its directory"""
+    os.makedirs(state_dir, exist_ok=True)
+    return os.path.join(state_dir, filename)
@@ -0,0 +1,307 @@
+"""
+Pipeline Tracing - Per-node latency spans and histograms for the workflow graph
+"""
+
+import bisect
+import contextvars
+import functools
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+from datetime import datetime
+import logging
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+from pydantic import BaseModel
+
+from .storage import get_state_path
+
+logger = logging.getLogger(__name__)
+
+
+# Histogram bucket upper bounds in milliseconds
+DEFAULT_LATENCY_BOUNDS_MS = [
+    5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000
+]
+
+# Span of the node currently executing in this task, for token attribution
+_current_span: contextvars.ContextVar[Optional["NodeSpan"]] = contextvars.ContextVar(
+    "crisis_detection_current_span",
+    default=None
+)
+
+
+class NodeSpan(BaseModel):
+    """Timing and volume of one graph node execution"""
+    run_id: Optional[str] = None
+    node: str
+    start_time: datetime
+    end_time: Optional[datetime] = None
+    duration_ms: float = 0.0
+    mention_count: int = 0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    error: Optional[str] = None
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with percentile estimates"""
+    
+    def __init__(self, bounds_ms: Optional[List[float]] = None):
+        self.bounds_ms = bounds_ms or DEFAULT_LATENCY_BOUNDS_MS
+        self.buckets = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def observe(self, duration_ms: float) -> None:
+        """Record one latency observation"""
+        self.buckets[bisect.bisect_left(self.bounds_ms, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+    
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile"""
+        if not self.count:
+            return 0.0
+        
+        target = p * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.buckets):
+            cumulative += bucket_count
+            if cumulative >= target:
+                if index < len(self.bounds_ms):
+                    return min(float(self.bounds_ms[index]), self.max_ms)
+                return self.max_ms
+        
+        return self.max_ms
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the histogram"""
+        return {
+            "count": self.count,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+            "bounds_ms": self.bounds_ms,
+            "buckets": list(self.buckets)
+        }
+
+
+class TokenUsageCallback(AsyncCallbackHandler):
+    """Attributes LLM token usage to the node span that made the call"""
+    
+    async def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        span = _current_span.get()
+        if span is None:
+            return
+        
+        span.llm_calls += 1
+        
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage:
+            span.prompt_tokens += usage.get("prompt_tokens", 0)
+            span.completion_tokens += usage.get("completion_tokens", 0)
+            return
+        
+        # Fall back to per-message usage metadata
+        for generations in response.generations:
+            for generation in generations:
+                metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if metadata:
+                    span.prompt_tokens += metadata.get("input_tokens", 0)
+                    span.completion_tokens += metadata.get("output_tokens", 0)
+
+
+class PipelineTracer:
+    """
+    Records a span for every workflow node execution
+    
+    Spans are kept in a bounded in-memory buffer and folded into per-node
+    latency histograms. Completed spans are also passed to registered
+    hooks, e.g. an OpenTelemetry exporter.
+    """
+    
+    def __init__(
+        self,
+        max_spans: int = 1000,
+        export_path: Optional[str] = None,
+        bounds_ms: Optional[List[float]] = None
+    ):
+        """
+        Initialize pipeline tracer
+        
+        Args:
+            max_spans: Number of recent spans kept in memory
+            export_path: Write spans and histograms to this JSON file after
+                every run; no automatic export when omitted
+            bounds_ms: Histogram bucket upper bounds in milliseconds
+        """
+        self.spans: Deque[NodeSpan] = deque(maxlen=max_spans)
+        self.export_path = export_path
+        self.bounds_ms = bounds_ms
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+        self.tokens: Dict[str, Dict[str, int]] = {}
+        self.callback_handler = TokenUsageCallback()
+        self._hooks: List[Callable[[NodeSpan], None]] = []
+    
+    def add_hook(self, hook: Callable[[NodeSpan], None]) -> None:
+        """Register a callable invoked with every completed span"""
+        self._hooks.append(hook)
+    
+    def wrap(
+        self,
+        node: str,
+        func: Callable[[Any], Awaitable[Any]]
+    ) -> Callable[[Any], Awaitable[Any]]:
+        """Wrap a graph node so each execution is recorded as a span"""
+        
+        @functools.wraps(func)
+        async def traced(state: Any) -> Any:
+            span = NodeSpan(
+                run_id=getattr(state, "run_id", None),
+                node=node,
+                start_time=datetime.now()
+            )
+            token = _current_span.set(span)
+            start = time.perf_counter()
+            result = None
+            
+            try:
+                result = await func(state)
+                return result
+            except Exception as e:
+                span.error = str(e)
+                raise
+            finally:
+                span.duration_ms = (time.perf_counter() - start) * 1000
+                span.end_time = datetime.now()
+                span.mention_count = self._count_mentions(result, state)
+                _current_span.reset(token)
+                self.record(span)
+        
+        return traced
+    
+    def _count_mentions(self, result: Any, state: Any) -> int:
+        """Mentions held after the node ran, falling back to its input"""
+        if isinstance(result, dict) and "mentions" in result:
+            return len(result["mentions"])
+        
+        mentions = getattr(result, "mentions", None)
+        if mentions is None:
+            mentions = getattr(state, "mentions", None) or []
+        return len(mentions)
+    
+    def record(self, span: NodeSpan) -> None:
+        """Fold a completed span into the buffer, histograms and hooks"""
+        self.spans.append(span)
+        
+        histogram = self.histograms.get(span.node)
+        if histogram is None:
+            histogram = LatencyHistogram(self.bounds_ms)
+            self.histograms[span.node] = histogram
+        histogram.observe(span.duration_ms)
+        
+        if span.error:
+            self.errors[span.node] = self.errors.get(span.node, 0) + 1
+        
+        tokens = self.tokens.setdefault(span.node, {"prompt": 0, "completion": 0})
+        tokens["prompt"] += span.prompt_tokens
+        tokens["completion"] += span.completion_tokens
+        
+        for hook in self._hooks:
+            try:
+                hook(span)
+            except Exception as e:
+                logger.warning(f"Span hook failed for {span.node}: {e}")
+    
+    def run_finished(self) -> None:
+        """Mark the end of a workflow run, exporting if configured"""
+        if self.export_path:
+            try:
+                self.export_json(self.export_path)
+            except OSError as e:
+                logger.error(f"Failed to export traces: {e}")
+    
+    def get_run_spans(self, run_id: str) -> List[NodeSpan]:
+        """Get the buffered spans of one run in execution order"""
+        return [span for span in self.spans if span.run_id == run_id]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-node latency, error and token statistics"""
+        return {
+            node: {
+                **histogram.to_dict(),
+                "errors": self.errors.get(node, 0),
+                "prompt_tokens": self.tokens.get(node, {}).get("prompt", 0),
+                "completion_tokens": self.tokens.get(node, {}).get("completion", 0)
+            }
+            for node, histogram in self.histograms.items()
+        }
+    
+    def export_json(self, path: Optional[str] = None) -> str:
+        """
+        Write buffered spans and histograms to a JSON file
+        
+        Returns:
+            Path of the written file
+        """
+        path = path or get_state_path("traces.json")
+        payload = {
+            "exported_at": datetime.now().isoformat(),
+            "nodes": self.get_stats(),
+            "spans": [json.loads(span.json()) for span in self.spans]
+        }
+        
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, path)
+        
+        return path
+
+
+def opentelemetry_hook(tracer_name: str = "crisis_detection") -> Callable[[NodeSpan], None]:
+    """
+    Build a span hook that re-emits node spans through OpenTelemetry
+    
+    Requires the opentelemetry-api package; spans go to whichever tracer
+    provider the application has configured.
+    """
+    try:
+        from opentelemetry import trace
+        from opentelemetry.trace import Status, StatusCode
+    except ImportError as e:
+        raise ImportError(
+            "opentelemetry-api is required for OpenTelemetry export "
+            "(pip install opentelemetry-api opentelemetry-sdk)"
+        ) from e
+    
+    otel_tracer = trace.get_tracer(tracer_name)
+    
+    def hook(span: NodeSpan) -> None:
+        otel_span = otel_tracer.start_span(
+            f"crisis_detection.{span.node}",
+            start_time=int(span.start_time.timestamp() * 1e9),
+            attributes={
+                "crisis_detection.run_id": span.run_id or "",
+                "crisis_detection.node": span.node,
+                "crisis_detection.mention_count": span.mention_count,
+                "llm.calls": span.llm_calls,
+                "llm.usage.prompt_tokens": span.prompt_tokens,
+                "llm.usage.completion_tokens": span.completion_tokens
+            }
+        )
+        if span.error:
+            otel_span.set_status(Status(StatusCode.ERROR, span.error))
+        otel_span.end(end_time=int(span.end_time.timestamp() * 1e9))
+    
+    return hook
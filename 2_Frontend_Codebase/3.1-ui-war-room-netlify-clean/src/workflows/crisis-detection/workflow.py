@@ -3,18 +3,40 @@ Crisis Detection Workflow - Main orchestration using LangGraph
 """
 
 import asyncio
-from typing import Dict, List, Optional, Any
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 import logging
 
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from langchain_core.messages import BaseMessage
 
-from .agents.crisis_detection import CrisisDetectionAgent, CrisisMention, CrisisAnalysis
-from .agents.monitoring import MentionlyticsAgent, MentionlyticsConfig
+from .agents.crisis_detection import (
+    CrisisDetectionAgent,
+    CrisisMention,
+    CrisisAnalysis,
+    MentionBatch
+)
+from .agents.monitoring import (
+    MentionlyticsAgent,
+    MentionlyticsConfig,
+    NewsWhipAgent,
+    SocialMediaAgent
+)
+from .agents.source_registry import SourceRegistry
 from .agents.alert_routing import AlertRoutingAgent, AlertRoute
 from .tools.delivery import DeliveryManager
+from .tools.webhook_server import WebhookReceiver
 from .utils.state import WorkflowState
+from .utils.analysis_cache import AnalysisCache
+from .utils.retrieval_store import RetrievalStore
+from .utils.http_pool import ConnectionPoolManager, get_connection_pool
+from .utils.llm_gateway import LLMGateway
+from .utils.keyword_matcher import CampaignMatcher, CampaignMatcherCache
+from .utils.similarity_index import MentionSimilarityIndex
+from .utils.run_checkpoint import RunCheckpointStore
+from .utils.tracing import PipelineTracer
 
 logger = logging.getLogger(__name__)
 
@@ -26,39 +48,129 @@ class CrisisDetectionWorkflow:
         self,
         openai_api_key: str,
         mentionlytics_config: MentionlyticsConfig,
-        delivery_config: Optional[Dict] = None
+        delivery_config: Optional[Dict] = None,
+        connection_pool: Optional[ConnectionPoolManager] = None,
+        enrich_concurrency: int = 4,
+        enrich_batch_size: int = 50,
+        similarity_index: Optional[MentionSimilarityIndex] = None,
+        tracer: Optional[PipelineTracer] = None,
+        triage_band: Tuple[int, int] = (3, 8),
+        checkpoint_store: Optional[RunCheckpointStore] = None,
+        analysis_cache: Optional[AnalysisCache] = None,
+        history_store: Optional[RetrievalStore] = None,
+        llm_gateway: Optional[LLMGateway] = None
     ):
+        # Shared keep-alive HTTP pool for monitoring and delivery
+        self.connection_pool = connection_pool or get_connection_pool()
+        
+        # Every agent's model calls share one gateway: one set of clients,
+        # one concurrency cap and one set of OpenAI rate limits
+        self.llm_gateway = llm_gateway or LLMGateway(openai_api_key)
+        
         # Initialize agents
-        self.crisis_agent = CrisisDetectionAgent(openai_api_key)
-        self.monitoring_agent = MentionlyticsAgent(mentionlytics_config)
-        self.routing_agent = AlertRoutingAgent(openai_api_key)
-        self.delivery_manager = DeliveryManager(delivery_config or {})
+        self.crisis_agent = CrisisDetectionAgent(
+            openai_api_key,
+            llm_gateway=self.llm_gateway,
+            history_store=history_store,
+            analysis_cache=analysis_cache or AnalysisCache()
+        )
+        self.monitoring_agent = MentionlyticsAgent(
+            mentionlytics_config,
+            connection_pool=self.connection_pool
+        )
+        self.routing_agent = AlertRoutingAgent(openai_api_key, llm_gateway=self.llm_gateway)
+        
+        # All monitoring sources are scanned concurrently, each with its own
+        # deadline
+        self.source_registry = SourceRegistry()
+        self.source_registry.register("mentionlytics", self.monitoring_agent, timeout=60)
+        self.source_registry.register("newswhip", NewsWhipAgent(), timeout=30)
+        self.source_registry.register("social_media", SocialMediaAgent(), timeout=30)
+        
+        self.delivery_manager = DeliveryManager(
+            delivery_config or {},
+            connection_pool=self.connection_pool
+        )
+        
+        # Compiled keyword automata, rebuilt only when the context changes
+        self.matcher_cache = CampaignMatcherCache()
+        
+        # Bounded parallelism for batched similarity lookups during enrichment
+        self.enrich_concurrency = enrich_concurrency
+        self.enrich_batch_size = enrich_batch_size
+        self.similarity_index = (
+            similarity_index if similarity_index is not None
+            else MentionSimilarityIndex()
+        )
+        
+        # Deterministic triage scores inside this band go to the LLM; lower
+        # scores get a cheap analysis, higher ones escalate directly. Scores
+        # are capped at 10, so the upper bound must stay below it.
+        self.triage_band = triage_band
+        
+        # Per-node latency spans and LLM token usage
+        self.tracer = tracer if tracer is not None else PipelineTracer()
+        
+        # Completed node outputs, so interrupted runs resume where they
+        # stopped instead of starting over
+        self.checkpoint_store = checkpoint_store or RunCheckpointStore()
+        self._active_runs: Set[str] = set()
         
         # Build workflow graph
         self.workflow = self._build_workflow()
         self.compiled_workflow = self.workflow.compile()
         
-    def _build_workflow(self) -> StateGraph:
+        # Pushed mentions (webhooks) skip monitoring
+        self.compiled_push_workflow = self._build_workflow(
+            include_monitor=False
+        ).compile()
+    
+    def _build_workflow(self, include_monitor: bool = True) -> StateGraph:
         """Build the crisis detection workflow graph"""
         
         # Create workflow with state
         workflow = StateGraph(WorkflowState)
         
-        # Add nodes
-        workflow.add_node("monitor", self.monitor_sources)
-        workflow.add_node("enrich", self.enrich_context)
-        workflow.add_node("analyze", self.analyze_crisis)
-        workflow.add_node("route", self.route_alerts)
-        workflow.add_node("deliver", self.deliver_alerts)
-        workflow.add_node("learn", self.learn_from_outcome)
-        
-        # Add edges
-        workflow.add_edge("monitor", "enrich")
-        workflow.add_edge("enrich", "analyze")
+        # Add nodes, each recorded as a tracing span. Nodes on parallel
+        # branches return only the state fields they own
+        if include_monitor:
+            workflow.add_node("monitor", self._traced("monitor", self.monitor_sources))
+        workflow.add_node("enrich", self._traced(
+            "enrich", self.enrich_context,
+            outputs=("enriched_mentions", "stage_timings")
+        ))
+        workflow.add_node("analyze", self._traced(
+            "analyze", self.analyze_crisis,
+            outputs=(
+                "triage", "triage_score", "analysis", "narratives", "severity",
+                "threat_detected", "error"
+            )
+        ))
+        workflow.add_node("join", self._traced("join", self.join_branches))
+        workflow.add_node("route", self._traced("route", self.route_alerts))
+        workflow.add_node("deliver", self._traced(
+            "deliver", self.deliver_alerts,
+            outputs=("delivery_results", "alerts_sent")
+        ))
+        workflow.add_node("learn", self._traced(
+            "learn", self.learn_from_outcome,
+            outputs=("learning_data",)
+        ))
+        workflow.add_node("finalize", self._traced("finalize", self.finalize_run))
+        
+        # Enrichment runs alongside analysis, which never reads it
+        if include_monitor:
+            workflow.set_entry_point("monitor")
+            workflow.add_edge("monitor", "enrich")
+            workflow.add_edge("monitor", "analyze")
+        else:
+            workflow.add_edge(START, "enrich")
+            workflow.add_edge(START, "analyze")
+        workflow.add_edge(["enrich", "analyze"], "join")
         
         # Conditional routing based on severity
         workflow.add_conditional_edges(
-            "analyze",
+            "join",
             self.should_alert,
             {
                 "alert": "route",
@@ -66,15 +178,68 @@ class CrisisDetectionWorkflow:
             }
         )
         
+        # The learning record does not wait for delivery; both are merged
+        # by finalize
         workflow.add_edge("route", "deliver")
-        workflow.add_edge("deliver", "learn")
-        workflow.add_edge("learn", END)
-        
-        # Set entry point
-        workflow.set_entry_point("monitor")
+        workflow.add_edge("route", "learn")
+        workflow.add_edge("deliver", "finalize")
+        workflow.add_edge("learn", "finalize")
+        workflow.add_edge("finalize", END)
         
         return workflow
     
+    def _traced(
+        self,
+        node: str,
+        func: Callable[[WorkflowState], Awaitable[Any]],
+        outputs: Optional[Tuple[str, ...]] = None
+    ) -> Callable[[WorkflowState], Awaitable[Any]]:
+        """
+        Wrap a node function with checkpointing and span recording
+        
+        Args:
+            node: Node name used for the span and checkpoint
+            func: Node function mutating and returning the state
+            outputs: Return only these state fields, so nodes running in
+                parallel never write the same channel
+        """
+        if outputs is not None:
+            node_func = func
+            
+            async def func(state: WorkflowState) -> Dict[str, Any]:
+                result = await node_func(state)
+                return {field: getattr(result, field) for field in outputs}
+        
+        return self.tracer.wrap(node, self._checkpointed(node, func))
+    
+    def _checkpointed(
+        self,
+        node: str,
+        func: Callable[[WorkflowState], Awaitable[Any]]
+    ) -> Callable[[WorkflowState], Awaitable[Any]]:
+        """Replay a node's stored output for its run, or store it once it succeeds"""
+        
+        async def checkpointed(state: WorkflowState) -> Any:
+            if not state.run_id:
+                return await func(state)
+            
+            # Node outputs can hold the whole state; pickle them and touch
+            # SQLite off the event loop
+            saved = await asyncio.to_thread(self.checkpoint_store.load, state.run_id, node)
+            if saved is not None:
+                logger.info(f"Run {state.run_id}: reusing checkpointed {node} output")
+                return saved
+            
+            result = await func(state)
+            await asyncio.to_thread(self.checkpoint_store.save, state.run_id, node, result)
+            return result
+        
+        return checkpointed
+    
+    def _run_config(self) -> Dict[str, Any]:
+        """Invocation config attributing LLM token usage to node spans"""
+        return {"callbacks": [self.tracer.callback_handler]}
+    
     async def run(self, initial_state: Optional[Dict] = None) -> Dict:
         """Run the workflow"""
         state = WorkflowState(
@@ -84,65 +249,261 @@ class CrisisDetectionWorkflow:
             routing_plan=[],
             delivery_results={},
             campaign_context=initial_state.get("campaign_context", {}) if initial_state else {},
-            timestamp=datetime.now()
+            timestamp=datetime.now(),
+            run_id=uuid.uuid4().hex
+        )
+        
+        self.checkpoint_store.start_run(state.run_id, "scan", state)
+        return await self._execute(state, "scan")
+    
+    async def process_mentions(
+        self,
+        mentions: List[CrisisMention],
+        campaign_context: Optional[Dict] = None
+    ) -> Dict:
+        """Run already-received mentions straight through the analyze stage"""
+        state = WorkflowState(
+            mentions=mentions,
+            source_count=len(mentions),
+            campaign_context=campaign_context or {},
+            timestamp=datetime.now(),
+            run_id=uuid.uuid4().hex
         )
         
+        self.checkpoint_store.start_run(state.run_id, "push", state)
+        return await self._execute(state, "push")
+    
+    async def resume(self, run_id: str) -> Optional[Dict]:
+        """
+        Resume an interrupted run from its last completed node
+        
+        Nodes that already succeeded return their checkpointed output
+        instead of running again.
+        
+        Returns:
+            The run's result, or None if no checkpoint exists for it
+        """
+        if run_id in self._active_runs:
+            raise RuntimeError(f"Run {run_id} is still in progress")
+        
+        stored = self.checkpoint_store.resume_run(run_id)
+        if stored is None:
+            logger.warning(f"No checkpoint found for run {run_id}")
+            return None
+        
+        logger.info(f"Resuming run {run_id} (attempt {stored['attempts']})")
+        return await self._execute(stored["initial_state"], stored["kind"])
+    
+    async def resume_incomplete(self) -> List[Dict]:
+        """
+        Resume every interrupted run left in the checkpoint store
+        
+        Runs that fail again stay stored until they run out of attempts or
+        expire.
+        
+        Returns:
+            Results of the runs that completed
+        """
+        results = []
+        
+        for run in self.checkpoint_store.get_incomplete_runs():
+            if run["run_id"] in self._active_runs:
+                continue
+            
+            try:
+                result = await self.resume(run["run_id"])
+            except Exception as e:
+                logger.error(f"Resuming run {run['run_id']} failed: {e}")
+                continue
+            
+            if result is not None:
+                results.append(result)
+        
+        return results
+    
+    async def _execute(self, state: WorkflowState, kind: str) -> Dict:
+        """Invoke the scan or push graph, keeping checkpoints until it succeeds"""
+        graph = self.compiled_workflow if kind == "scan" else self.compiled_push_workflow
+        self._active_runs.add(state.run_id)
+        
         try:
-            # Run workflow
-            result = await self.compiled_workflow.ainvoke(state)
-            return result
+            result = await graph.ainvoke(state, config=self._run_config())
         except Exception as e:
-            logger.error(f"Workflow error: {e}")
+            logger.error(f"{'Workflow' if kind == 'scan' else 'Push workflow'} error: {e}")
+            self.checkpoint_store.fail_run(state.run_id, str(e))
             raise
+        finally:
+            self._active_runs.discard(state.run_id)
+            self.tracer.run_finished()
+        
+        self.checkpoint_store.finish_run(state.run_id)
+        return result
+    
+    def create_webhook_receiver(
+        self,
+        campaign_context: Optional[Dict] = None,
+        **receiver_options
+    ) -> WebhookReceiver:
+        """Create a webhook receiver that micro-batches pushes into this workflow"""
+        
+        async def process_batch(mentions: List[CrisisMention]) -> Dict:
+            return await self.process_mentions(mentions, campaign_context)
+        
+        return WebhookReceiver(
+            monitoring_agent=self.monitoring_agent,
+            process_batch=process_batch,
+            campaign_id=(campaign_context or {}).get("campaign_id", "default"),
+            **receiver_options
+        )
     
     async def monitor_sources(self, state: WorkflowState) -> WorkflowState:
         """Monitor external sources for mentions"""
         logger.info("Starting source monitoring...")
         
+        campaign_id = state.campaign_context.get("campaign_id", "default")
+        mentions = []
+        keyword_matches = {}
+        
         try:
-            # Use monitoring agent to fetch mentions
-            async with self.monitoring_agent as agent:
-                mentions = await agent.scan()
-            
-            # Filter mentions if keywords provided in campaign context
-            if state.campaign_context.get("monitor_keywords"):
-                keywords = state.campaign_context["monitor_keywords"]
-                mentions = [
-                    m for m in mentions
-                    if any(kw.lower() in m.content.lower() for kw in keywords)
-                ]
+            # Consume the merged stream of all sources chunk by chunk so only
+            # relevant mentions are retained while later pages are in flight
+            async for chunk in self.source_registry.scan_stream(campaign_id):
+                relevant, matches = self.filter_relevant(chunk, state.campaign_context)
+                mentions.extend(relevant)
+                keyword_matches.update(matches)
             
             logger.info(f"Found {len(mentions)} relevant mentions")
             
             state.mentions = mentions
+            state.keyword_matches = keyword_matches
             state.source_count = len(mentions)
-            
+        
         except Exception as e:
             logger.error(f"Monitoring error: {e}")
             state.error = str(e)
         
         return state
     
+    def filter_relevant(
+        self,
+        mentions: List[CrisisMention],
+        campaign_context: Dict
+    ) -> Tuple[List[CrisisMention], Dict[str, Dict[str, List[str]]]]:
+        """
+        Keep the mentions a campaign monitors
+        
+        Returns:
+            Relevant mentions and their keyword matches by mention ID
+        """
+        matcher = self._get_campaign_matcher(campaign_context)
+        relevant = []
+        keyword_matches = {}
+        
+        for m in mentions:
+            # One automaton pass yields the keyword filter, relevance
+            # and crisis indicator hits
+            matches = matcher.match(m.content)
+            if matcher.is_monitored(matches):
+                relevant.append(m)
+                keyword_matches[m.mention_id] = {
+                    category: sorted(terms)
+                    for category, terms in matches.items()
+                }
+        
+        return relevant, keyword_matches
+    
     async def enrich_context(self, state: WorkflowState) -> WorkflowState:
         """Enrich mentions with additional context"""
         logger.info("Enriching mention context...")
         
-        enriched_mentions = []
+        start = time.perf_counter()
+        matcher = self._get_campaign_matcher(state.campaign_context)
+        campaign_id = state.campaign_context.get("campaign_id", "default")
+        mentions = state.mentions
+        
+        # Similarity lookups run as batched queries under a bounded semaphore
+        batches = [
+            mentions[i:i + self.enrich_batch_size]
+            for i in range(0, len(mentions), self.enrich_batch_size)
+        ]
+        semaphore = asyncio.Semaphore(self.enrich_concurrency)
+        
+        async def lookup(batch: List[CrisisMention]) -> List[List[Dict]]:
+            async with semaphore:
+                return await self._find_similar_past_mentions_batch(batch, campaign_id)
+        
+        batch_results = await asyncio.gather(*(lookup(batch) for batch in batches))
+        similar = [result for results in batch_results for result in results]
         
-        for mention in state.mentions:
-            # Add campaign-specific context
+        # Index this batch only after querying so mentions never match
+        # themselves or each other within a run
+        self.similarity_index.add(mentions, namespace=campaign_id)
+        
+        enriched_mentions = []
+        for mention, historical_similar in zip(mentions, similar):
+            matches = state.keyword_matches.get(mention.mention_id)
+            if matches is None:
+                matches = matcher.match(mention.content)
+            
+            # Add campaign-specific context, referencing the mention
+            # rather than copying it
             enriched = {
-                "mention": mention.dict(),
-                "campaign_relevance": self._calculate_relevance(
-                    mention,
-                    state.campaign_context
-                ),
-                "historical_similar": await self._find_similar_past_mentions(mention),
+                "mention": mention,
+                "campaign_relevance": matcher.relevance(matches),
+                "crisis_indicators": matcher.crisis_indicators(matches),
+                "historical_similar": historical_similar,
                 "author_influence_score": self._calculate_influence_score(mention)
             }
             enriched_mentions.append(enriched)
         
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"Enriched {len(enriched_mentions)} mentions in {elapsed_ms:.1f}ms "
+            f"({len(batches)} similarity batches)"
+        )
+        
         state.enriched_mentions = enriched_mentions
+        state.stage_timings["enrich"] = elapsed_ms
+        return state
+    
+    async def triage_mentions(self, state: WorkflowState) -> WorkflowState:
+        """Score mentions deterministically and decide whether the LLM is needed"""
+        if not state.mentions:
+            return state
+        
+        campaign_id = state.campaign_context.get("campaign_id", "default")
+        
+        # Score a columnar view of the mentions; models are not copied
+        batch = MentionBatch.from_mentions(state.mentions)
+        
+        # Keep velocity and sentiment history across scans and pushes
+        self.crisis_agent.record_mentions(batch, campaign_id)
+        
+        try:
+            triage = await self.crisis_agent.triage_mentions(batch, campaign_id)
+        except Exception as e:
+            # Fall through to full analysis if scoring fails
+            logger.error(f"Triage error: {e}")
+            return state
+        
+        low, high = self.triage_band
+        score = triage["score"]
+        triage["llm_required"] = low <= score <= high
+        
+        state.triage = triage
+        state.triage_score = score
+        
+        if not triage["llm_required"]:
+            analysis = await self.crisis_agent.triage_analysis(triage, escalate=score > high)
+            state.analysis = analysis
+            state.severity = analysis.severity
+            state.threat_detected = analysis.severity >= 4
+        
+        logger.info(
+            f"Triage score {score}/10 - "
+            f"{'LLM analysis required' if triage['llm_required'] else 'LLM analysis skipped'}"
+        )
+        
         return state
     
     async def analyze_crisis(self, state: WorkflowState) -> WorkflowState:
@@ -153,14 +514,23 @@ class CrisisDetectionWorkflow:
             logger.info("No mentions to analyze")
             return state
         
+        # Triage runs inside this node, as its own span, so the whole
+        # assessment is one branch that overlaps enrichment
+        state = await self.tracer.wrap("triage", self.triage_mentions)(state)
+        
+        if not state.triage.get("llm_required", True):
+            logger.info("Triage resolved the batch; skipping LLM analysis")
+            return state
+        
         try:
-            # Use crisis detection agent
-            analysis = await self.crisis_agent.analyze_mentions(
+            # Each narrative in the batch is analyzed on its own, concurrently
+            analysis, narratives = await self.crisis_agent.analyze_narratives(
                 mentions=state.mentions,
                 campaign_context=state.campaign_context
             )
             
             state.analysis = analysis
+            state.narratives = narratives
             state.severity = analysis.severity
             state.threat_detected = analysis.severity >= 4
             
@@ -168,7 +538,7 @@ class CrisisDetectionWorkflow:
                 f"Crisis analysis complete - Severity: {analysis.severity}/10, "
                 f"Confidence: {analysis.confidence:.2f}"
             )
-            
+        
         except Exception as e:
             logger.error(f"Analysis error: {e}")
             state.error = str(e)
@@ -176,6 +546,14 @@ class CrisisDetectionWorkflow:
         
         return state
     
+    async def join_branches(self, state: WorkflowState) -> Dict[str, Any]:
+        """Wait for enrichment and analysis; their updates are already merged"""
+        logger.debug(
+            f"Joined {len(state.enriched_mentions)} enriched mentions "
+            f"with analysis (severity {state.severity})"
+        )
+        return {}
+    
     def should_alert(self, state: WorkflowState) -> str:
         """Determine if alert should be sent"""
         if state.analysis and state.analysis.severity >= 4:
@@ -204,7 +582,7 @@ class CrisisDetectionWorkflow:
             state.alert_count = len(routing_plan)
             
             logger.info(f"Created routing plan for {len(routing_plan)} recipients")
-            
+        
         except Exception as e:
             logger.error(f"Routing error: {e}")
             state.error = str(e)
@@ -215,9 +593,18 @@ class CrisisDetectionWorkflow:
         """Deliver alerts through multiple channels"""
         logger.info("Delivering alerts...")
         
+        # Recipients already alerted before this run was interrupted
+        delivered = (
+            self.checkpoint_store.load_items(state.run_id, "deliver")
+            if state.run_id else {}
+        )
         delivery_results = {}
         
         for route in state.routing_plan:
+            if route.recipient.id in delivered:
+                delivery_results[route.recipient.id] = delivered[route.recipient.id]
+                continue
+            
             try:
                 # Deliver through each channel
                 results = await self.delivery_manager.deliver_multi_channel(
@@ -226,7 +613,11 @@ class CrisisDetectionWorkflow:
                 )
                 
                 delivery_results[route.recipient.id] = results
-                
+                if state.run_id:
+                    self.checkpoint_store.save(
+                        state.run_id, "deliver", results, key=route.recipient.id
+                    )
+            
             except Exception as e:
                 logger.error(f"Delivery error for {route.recipient.id}: {e}")
                 delivery_results[route.recipient.id] = {
@@ -253,25 +644,28 @@ class CrisisDetectionWorkflow:
             "timestamp": state.timestamp,
             "mentions_count": len(state.mentions),
             "severity": state.analysis.severity if state.analysis else 0,
-            "threat_detected": state.threat_detected,
+            "threat_detected": state.threat_detected
+        }
+        
+        # Crisis patterns are learned by the agent as each severe analysis
+        # is made, so they are not updated again here
+        state.learning_data = learning_data
+        return state
+    
+    async def finalize_run(self, state: WorkflowState) -> Dict[str, Any]:
+        """Merge delivery outcomes into the learning record"""
+        learning_data = {
+            **(state.learning_data or {}),
             "alerts_sent": state.alerts_sent,
             "delivery_success_rate": self._calculate_delivery_success_rate(
                 state.delivery_results
             )
         }
         
-        # Update agent patterns if crisis was significant
-        if state.analysis and state.analysis.severity >= 7:
-            await self.crisis_agent._update_crisis_patterns(
-                state.mentions,
-                state.analysis
-            )
-        
         # Log learning data
         logger.info(f"Workflow learning data: {learning_data}")
         
-        state.learning_data = learning_data
-        return state
+        return {"learning_data": learning_data}
     
     def _calculate_relevance(
         self,
@@ -279,26 +673,15 @@ class CrisisDetectionWorkflow:
         campaign_context: Dict
     ) -> float:
         """Calculate how relevant a mention is to the campaign"""
-        relevance_score = 0.5  # Base score
-        
-        # Check for candidate name
-        if campaign_context.get("candidate_name"):
-            if campaign_context["candidate_name"].lower() in mention.content.lower():
-                relevance_score += 0.3
-        
-        # Check for key issues
-        if campaign_context.get("key_issues"):
-            for issue in campaign_context["key_issues"]:
-                if issue.lower() in mention.content.lower():
-                    relevance_score += 0.1
-        
-        # Check for opponent names
-        if campaign_context.get("opponents"):
-            for opponent in campaign_context["opponents"]:
-                if opponent.lower() in mention.content.lower():
-                    relevance_score += 0.2
-        
-        return min(relevance_score, 1.0)
+        matcher = self._get_campaign_matcher(campaign_context)
+        return matcher.relevance(matcher.match(mention.content))
+    
+    def _get_campaign_matcher(self, campaign_context: Dict) -> CampaignMatcher:
+        """Get the compiled keyword matcher for a campaign context"""
+        return self.matcher_cache.get(
+            campaign_context,
+            self.crisis_agent.crisis_patterns
+        )
     
     def _calculate_influence_score(self, mention: CrisisMention) -> float:
         """Calculate influence score of mention author"""
@@ -316,12 +699,35 @@ class CrisisDetectionWorkflow:
     
     async def _find_similar_past_mentions(
         self,
-        mention: CrisisMention
+        mention: CrisisMention,
+        campaign_id: str = "default"
     ) -> List[Dict]:
-        """Find similar mentions from history"""
-        # In production, query vector database for similar mentions
-        # For now, return empty list
-        return []
+        """Find similar mentions from a campaign's history"""
+        results = await self._find_similar_past_mentions_batch([mention], campaign_id)
+        return results[0]
+    
+    async def _find_similar_past_mentions_batch(
+        self,
+        mentions: List[CrisisMention],
+        campaign_id: str = "default"
+    ) -> List[List[Dict]]:
+        """Find similar mentions from a campaign's history for a batch in one query"""
+        # The matrix product releases the GIL, so batches run in parallel
+        return await asyncio.to_thread(
+            self.similarity_index.query, mentions, namespace=campaign_id
+        )
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get shared HTTP connection pool statistics"""
+        return self.connection_pool.get_stats()
+    
+    def get_source_stats(self) -> Dict[str, Any]:
+        """Get per-source scan latency and yield statistics"""
+        return self.source_registry.get_source_stats()
+    
+    def get_dedup_stats(self) -> Dict[str, Any]:
+        """Get cross-scan mention de-duplication statistics"""
+        return self.monitoring_agent.dedup_store.get_stats()
     
     def _create_mention_summary(self, mentions: List[CrisisMention]) -> str:
         """Create summary of mentions for alert"""